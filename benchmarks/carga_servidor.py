@@ -0,0 +1,114 @@
+"""
+Gerador de Carga do Servidor HTTP
+Abre centenas de clientes simultâneos (conexões keep-alive) contra o servidor
+da biblioteca e mede requisições por segundo e latências (p50/p99)
+
+Uso: python benchmarks/carga_servidor.py [--clientes 200] [--requisicoes 50]
+     (sem --porta, sobe um servidor local temporário no próprio processo)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+# adiciona a raiz do projeto ao path para o Python encontrar o pacote "sistema"
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema.biblioteca_poo import Biblioteca
+from sistema.servidor import ServidorBiblioteca
+
+
+async def requisitar(leitor, escritor, metodo, caminho, dados=None):
+    """Envia uma requisição HTTP/1.1 e retorna (status, corpo)."""
+    corpo = json.dumps(dados).encode('utf-8') if dados is not None else b''
+    escritor.write(
+        f"{metodo} {caminho} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Length: {len(corpo)}\r\n\r\n".encode('latin-1') + corpo
+    )
+    await escritor.drain()
+
+    cabecalho = await leitor.readuntil(b'\r\n\r\n')
+    linhas = cabecalho.decode('latin-1').split('\r\n')
+    status = int(linhas[0].split(' ')[1])
+    tamanho = next(int(linha.split(':')[1]) for linha in linhas if linha.lower().startswith('content-length'))
+    return status, await leitor.readexactly(tamanho)
+
+
+async def cliente(host, porta, indice, requisicoes, livros, latencias):
+    """Um cliente: mistura consultas, empréstimos e devoluções."""
+    aleatorio = random.Random(indice)
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    usuario_id = indice + 1
+    try:
+        for _ in range(requisicoes):
+            sorteio = aleatorio.random()
+            inicio = time.perf_counter()
+            if sorteio < 0.7:
+                await requisitar(leitor, escritor, 'GET', f'/livros/{aleatorio.randint(1, livros)}')
+            elif sorteio < 0.85:
+                await requisitar(leitor, escritor, 'GET', '/livros/busca?q=livro&limite=5')
+            else:
+                status, corpo = await requisitar(leitor, escritor, 'POST', '/emprestimos',
+                                                 {'usuario_id': usuario_id, 'livro_id': aleatorio.randint(1, livros)})
+                if status == 201:
+                    emprestimo_id = json.loads(corpo)['id']
+                    await requisitar(leitor, escritor, 'POST', f'/emprestimos/{emprestimo_id}/devolucao')
+            latencias.append(time.perf_counter() - inicio)
+    finally:
+        escritor.close()
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+async def executar(argumentos):
+    servidor = None
+    host, porta = argumentos.host, argumentos.porta
+    if porta is None:
+        pasta = tempfile.mkdtemp()
+        biblioteca = Biblioteca(os.path.join(pasta, 'carga.db'), concorrente=True, confirmacao_em_grupo=True)
+        with biblioteca.lote():
+            for n in range(argumentos.livros):
+                biblioteca.adicionar_livro(f"Livro {n}", f"Autor {n % 100}", f"{n:013d}", 2000)
+            for n in range(argumentos.clientes):
+                biblioteca.cadastrar_usuario(f"Usuário {n}", f"u{n}@example.com", "1")
+        servidor = ServidorBiblioteca(biblioteca, host, 0)
+        await servidor.iniciar()
+        porta = servidor.porta
+
+    latencias = []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        cliente(host, porta, indice, argumentos.requisicoes, argumentos.livros, latencias)
+        for indice in range(argumentos.clientes)
+    ))
+    duracao = time.perf_counter() - inicio
+
+    if servidor is not None:
+        await servidor.encerrar()
+
+    print(f"=== Carga: {argumentos.clientes} clientes x {argumentos.requisicoes} requisições ===")
+    print(f"Requisições/s: {len(latencias) / duracao:,.0f}")
+    print(f"Latência p50:  {percentil(latencias, 0.50) * 1000:.2f} ms")
+    print(f"Latência p99:  {percentil(latencias, 0.99) * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerador de carga do servidor da biblioteca")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=None)
+    parser.add_argument('--clientes', type=int, default=200)
+    parser.add_argument('--requisicoes', type=int, default=50)
+    parser.add_argument('--livros', type=int, default=1000)
+    asyncio.run(executar(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark de Carga do Instantâneo
+Compara o tempo de carregamento e o tamanho do arquivo nos formatos JSON,
+JSON Lines e binário para o mesmo acervo sintético
+
+O tempo medido inclui a reconstrução dos índices, que domina a carga: a
+diferença entre os formatos se limita à leitura do arquivo
+
+Uso: python benchmarks/carga_snapshot.py [quantidade_livros]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# adiciona a raiz do projeto ao path para o Python encontrar o pacote "sistema"
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema.armazenamento import ArmazenamentoNulo, criar_armazenamento
+from sistema.biblioteca_poo import Biblioteca
+
+FORMATOS = ('.json', '.jsonl', '.bin')
+REPETICOES = 3
+
+
+def montar_acervo(quantidade: int) -> Biblioteca:
+    """Acervo com `quantidade` livros (autores repetidos), um décimo disso em usuários e metade em empréstimos."""
+    biblioteca = Biblioteca(armazenamento=ArmazenamentoNulo())
+    with biblioteca.lote():
+        for i in range(quantidade):
+            biblioteca.adicionar_livro(f"Livro {i}", f"Autor {i % 500}", f"978{i:010d}", 1950 + i % 70)
+        for i in range(max(1, quantidade // 10)):
+            biblioteca.cadastrar_usuario(f"Usuário {i}", f"usuario{i}@exemplo.com", f"11 9{i:08d}")
+        usuarios = len(biblioteca._usuarios_obj)
+        for i in range(quantidade // 2):
+            biblioteca.realizar_emprestimo(i % usuarios + 1, i + 1)
+            if i % 3 == 0:
+                biblioteca.devolver_livro(i + 1)
+    return biblioteca
+
+
+def medir_carga(arquivo: str) -> float:
+    """Melhor tempo, em segundos, de carregar o arquivo em uma biblioteca nova."""
+    melhor = float('inf')
+    for _ in range(REPETICOES):
+        biblioteca = Biblioteca(arquivo)
+        inicio = time.perf_counter()
+        biblioteca.carregar_dados()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"Montando acervo com {quantidade} livros...")
+    biblioteca = montar_acervo(quantidade)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        resultados = []
+        for extensao in FORMATOS:
+            arquivo = os.path.join(diretorio, f'acervo{extensao}')
+            criar_armazenamento(arquivo).salvar(biblioteca)
+            resultados.append((extensao, os.path.getsize(arquivo), medir_carga(arquivo)))
+
+    base = resultados[0][2]
+    print(f"\n{'Formato':<10}{'Tamanho (KiB)':>16}{'Carga (s)':>12}{'Relativo':>10}")
+    for extensao, tamanho, segundos in resultados:
+        print(f"{extensao:<10}{tamanho / 1024:>16.0f}{segundos:>12.3f}{segundos / base:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Dados Sintéticos
+Gerador determinístico de livros, usuários e empréstimos para os benchmarks:
+a mesma semente e a mesma quantidade produzem sempre os mesmos dados
+"""
+
+import random
+from typing import Iterator, Tuple
+
+SEMENTE_PADRAO = 2024
+
+_PALAVRAS = (
+    "amor", "guerra", "noite", "sombra", "mar", "cidade", "jardim", "segredo",
+    "viagem", "memória", "tempo", "sertão", "rio", "estrela", "casa", "silêncio",
+    "caminho", "ilha", "fogo", "vento", "livro", "sonho", "inverno", "coração",
+)
+_NOMES = ("Ana", "Bruno", "Carla", "Diego", "Elisa", "Fábio", "Gabriela", "Heitor",
+          "Íris", "João", "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael")
+_SOBRENOMES = ("Silva", "Souza", "Oliveira", "Santos", "Pereira", "Lima", "Araújo",
+               "Costa", "Ribeiro", "Almeida", "Carvalho", "Gomes", "Martins", "Rocha")
+
+
+def gerar_livros(quantidade: int, semente: int = SEMENTE_PADRAO) -> Iterator[Tuple[str, str, str, int]]:
+    """
+    Gera (titulo, autor, isbn, ano). Os ISBNs (13 dígitos) são únicos; os
+    autores se repetem, cerca de um para cada 20 livros, como num acervo real.
+    """
+    aleatorio = random.Random(semente)
+    autores = max(1, quantidade // 20)
+    for indice in range(quantidade):
+        palavras = aleatorio.sample(_PALAVRAS, aleatorio.randint(1, 4))
+        titulo = ' '.join(palavras).capitalize()
+        numero_autor = aleatorio.randrange(autores)
+        autor = f"{_NOMES[numero_autor % len(_NOMES)]} {_SOBRENOMES[numero_autor % len(_SOBRENOMES)]} {numero_autor}"
+        yield titulo, autor, f"978{indice:010d}", aleatorio.randint(1850, 2024)
+
+
+def gerar_usuarios(quantidade: int, semente: int = SEMENTE_PADRAO) -> Iterator[Tuple[str, str, str]]:
+    """Gera (nome, email, telefone) com emails únicos."""
+    aleatorio = random.Random(semente + 1)
+    for indice in range(quantidade):
+        nome = f"{aleatorio.choice(_NOMES)} {aleatorio.choice(_SOBRENOMES)}"
+        yield nome, f"usuario{indice}@exemplo.com", f"11 9{aleatorio.randrange(10 ** 8):08d}"
+
+
+def gerar_emprestimos(quantidade: int, usuarios: int, livros: int,
+                      semente: int = SEMENTE_PADRAO) -> Iterator[Tuple[int, int]]:
+    """
+    Gera (usuario_id, livro_id) para `quantidade` empréstimos. Cada livro é
+    emprestado no máximo uma vez, então todos os pedidos são válidos.
+    """
+    aleatorio = random.Random(semente + 2)
+    livros_ids = list(range(1, livros + 1))
+    aleatorio.shuffle(livros_ids)
+    for livro_id in livros_ids[:quantidade]:
+        yield aleatorio.randint(1, usuarios), livro_id
@@ -0,0 +1,94 @@
+"""
+Benchmark de Memória das Entidades
+Compara os bytes por registro das entidades compactas (__slots__, autores
+internados e datas inteiras) com a representação anterior (__dict__ e datas ISO)
+
+Uso: python benchmarks/memoria_entidades.py [quantidade]
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+from datetime import datetime
+
+# adiciona a raiz do projeto ao path para o Python encontrar o pacote "sistema"
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema.biblioteca_poo import Emprestimo, Livro, Usuario
+
+
+# ==================== REPRESENTAÇÃO ANTERIOR ====================
+
+class LivroAnterior:
+    def __init__(self, titulo, autor, isbn, ano, id):
+        self.id = id
+        self.titulo = titulo
+        self.autor = autor
+        self.isbn = isbn
+        self.ano = ano
+        self.disponivel = True
+
+
+class UsuarioAnterior:
+    def __init__(self, nome, email, telefone, id):
+        self.id = id
+        self.nome = nome
+        self.email = email
+        self.telefone = telefone
+
+
+class EmprestimoAnterior:
+    def __init__(self, usuario_id, livro_id, id):
+        self.id = id
+        self.usuario_id = usuario_id
+        self.livro_id = livro_id
+        self.devolvido = False
+        self.data_emprestimo = datetime.now().isoformat()
+        self.data_devolucao = None
+
+
+# ==================== MEDIÇÃO ====================
+
+def _autor(i):
+    # 500 autores distintos; cada registro recebe uma string nova,
+    # como aconteceria ao ler os dados de um arquivo
+    return f"Autor {i % 500:03d}"
+
+
+def medir(fabrica, quantidade):
+    """Retorna os bytes alocados por registro ao criar `quantidade` objetos."""
+    gc.collect()
+    tracemalloc.start()
+    objetos = [fabrica(i) for i in range(quantidade)]
+    alocados, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objetos
+    return alocados / quantidade
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    casos = [
+        ("Livro",
+         lambda i: LivroAnterior(f"Titulo {i}", _autor(i), f"{i:013d}", 2000, i + 1),
+         lambda i: Livro(f"Titulo {i}", _autor(i), f"{i:013d}", 2000, id=i + 1)),
+        ("Usuario",
+         lambda i: UsuarioAnterior(f"Usuario {i}", f"u{i}@example.com", "11999999999", i + 1),
+         lambda i: Usuario(f"Usuario {i}", f"u{i}@example.com", "11999999999", id=i + 1)),
+        ("Emprestimo",
+         lambda i: EmprestimoAnterior(i + 1, i + 1, i + 1),
+         lambda i: Emprestimo(i + 1, i + 1, id=i + 1)),
+    ]
+
+    print(f"=== Memória por registro ({quantidade} registros) ===")
+    print(f"{'Entidade':<12}{'Antes (B)':>12}{'Depois (B)':>12}{'Redução':>10}")
+    for nome, anterior, atual in casos:
+        antes = medir(anterior, quantidade)
+        depois = medir(atual, quantidade)
+        print(f"{nome:<12}{antes:>12.1f}{depois:>12.1f}{1 - depois / antes:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
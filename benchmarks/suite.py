@@ -0,0 +1,216 @@
+"""
+Suíte de Benchmarks da Biblioteca
+Mede cada operação da Biblioteca conforme o acervo cresce (10^3 a 10^6
+livros, usuários e empréstimos gerados de forma determinística): vazão,
+latências (p50/p90/p99/máx) e pico de memória, com saída em JSON para
+comparar duas execuções
+
+Uso: python benchmarks/suite.py [--tamanhos 1000 10000] [--formato .json]
+                                [--saida resultados.json]
+     python benchmarks/suite.py --comparar anterior.json atual.json
+
+As operações rodam sem persistência (para medir só as estruturas em
+memória); _salvar_dados e carregar_dados usam um arquivo no --formato
+escolhido. O pico de memória vem de uma segunda execução idêntica sob
+tracemalloc, para que o rastreamento não distorça os tempos.
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+# adiciona a raiz do projeto ao path para o Python encontrar o pacote "sistema"
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema.armazenamento import ArmazenamentoNulo, criar_armazenamento
+from sistema.biblioteca_poo import Biblioteca
+
+from dados_sinteticos import SEMENTE_PADRAO, gerar_emprestimos, gerar_livros, gerar_usuarios
+
+PERCENTIS = (0.50, 0.90, 0.99)
+
+
+def percentil(ordenados: List[float], p: float) -> float:
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+class Medidor:
+    """Executa as fases do cenário, medindo tempo ou memória de cada uma."""
+
+    def __init__(self, rastrear_memoria: bool):
+        self.rastrear_memoria = rastrear_memoria
+        self.resultados: Dict[str, dict] = {}
+
+    def medir(self, operacao: str, chamadas: Iterable[Callable[[], object]]) -> None:
+        """Executa cada chamada da fase e registra latências ou pico de memória."""
+        gc.collect()
+        if self.rastrear_memoria:
+            tracemalloc.start()
+            base = tracemalloc.get_traced_memory()[0]
+            for chamada in chamadas:
+                chamada()
+            pico = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self.resultados[operacao] = {'memoria_pico_kib': round((pico - base) / 1024, 1)}
+            return
+
+        latencias = []
+        relogio = time.perf_counter
+        inicio_fase = relogio()
+        for chamada in chamadas:
+            inicio = relogio()
+            chamada()
+            latencias.append(relogio() - inicio)
+        duracao = relogio() - inicio_fase
+
+        latencias.sort()
+        self.resultados[operacao] = {
+            'operacoes': len(latencias),
+            'segundos': round(duracao, 6),
+            'vazao_por_segundo': round(len(latencias) / duracao, 1) if duracao else None,
+            'latencia_us': {
+                **{f'p{int(p * 100)}': round(percentil(latencias, p) * 1e6, 2) for p in PERCENTIS},
+                'max': round(latencias[-1] * 1e6, 2),
+            },
+        }
+
+
+def executar_cenario(tamanho: int, formato: str, repeticoes: int, semente: int,
+                     rastrear_memoria: bool) -> Dict[str, dict]:
+    """Roda todas as operações sobre um acervo de `tamanho` livros, usuários e empréstimos."""
+    medidor = Medidor(rastrear_memoria)
+    # Sem persistência: isola o custo das estruturas em memória
+    biblioteca = Biblioteca(armazenamento=ArmazenamentoNulo())
+
+    livros = list(gerar_livros(tamanho, semente))
+    usuarios = list(gerar_usuarios(tamanho, semente))
+    emprestimos = list(gerar_emprestimos(tamanho, tamanho, tamanho, semente))
+
+    medidor.medir('adicionar_livro', (
+        lambda dados=dados: biblioteca.adicionar_livro(*dados) for dados in livros
+    ))
+    medidor.medir('cadastrar_usuario', (
+        lambda dados=dados: biblioteca.cadastrar_usuario(*dados) for dados in usuarios
+    ))
+    medidor.medir('realizar_emprestimo', (
+        lambda dados=dados: biblioteca.realizar_emprestimo(*dados) for dados in emprestimos
+    ))
+    # Devolve metade, alternando, para que sobrem empréstimos ativos e devolvidos
+    medidor.medir('devolver_livro', (
+        lambda emprestimo_id=emprestimo_id: biblioteca.devolver_livro(emprestimo_id)
+        for emprestimo_id in range(1, tamanho + 1, 2)
+    ))
+    # As listagens imprimem: a saída vai para o nulo, mas a formatação é medida
+    with open(os.devnull, 'w', encoding='utf-8') as nulo, contextlib.redirect_stdout(nulo):
+        for operacao in ('listar_livros', 'listar_usuarios', 'listar_emprestimos'):
+            medidor.medir(operacao, (getattr(biblioteca, operacao) for _ in range(repeticoes)))
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        arquivo = os.path.join(diretorio, f'suite{formato}')
+        biblioteca._armazenamento = criar_armazenamento(arquivo)
+        medidor.medir('_salvar_dados', (biblioteca._salvar_dados for _ in range(repeticoes)))
+        biblioteca._armazenamento.fechar()
+
+        def carregar():
+            nova = Biblioteca(arquivo)
+            nova.carregar_dados()
+            nova._armazenamento.fechar()
+
+        medidor.medir('carregar_dados', (carregar for _ in range(repeticoes)))
+
+    return medidor.resultados
+
+
+def executar(tamanhos: List[int], formato: str, repeticoes: int, semente: int,
+             com_memoria: bool) -> dict:
+    resultados = {}
+    for tamanho in tamanhos:
+        print(f"Acervo de {tamanho}...", file=sys.stderr)
+        operacoes = executar_cenario(tamanho, formato, repeticoes, semente, rastrear_memoria=False)
+        if com_memoria:
+            memoria = executar_cenario(tamanho, formato, repeticoes, semente, rastrear_memoria=True)
+            for operacao, medida in memoria.items():
+                operacoes[operacao].update(medida)
+        resultados[str(tamanho)] = operacoes
+
+    return {
+        'meta': {
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'formato': formato,
+            'repeticoes': repeticoes,
+            'semente': semente,
+        },
+        'resultados': resultados,
+    }
+
+
+def imprimir(relatorio: dict) -> None:
+    print(f"{'Tamanho':>9} {'Operação':<22}{'ops/s':>13}{'p50 µs':>11}{'p99 µs':>11}{'máx µs':>12}{'pico KiB':>11}")
+    for tamanho, operacoes in relatorio['resultados'].items():
+        for operacao, medida in operacoes.items():
+            latencia = medida['latencia_us']
+            memoria = medida.get('memoria_pico_kib')
+            print(f"{tamanho:>9} {operacao:<22}{medida['vazao_por_segundo'] or 0:>13,.0f}"
+                  f"{latencia['p50']:>11.1f}{latencia['p99']:>11.1f}{latencia['max']:>12.1f}"
+                  f"{'-' if memoria is None else f'{memoria:,.0f}':>11}")
+
+
+def comparar(anterior: dict, atual: dict) -> None:
+    """Mostra a razão atual/anterior da vazão, do p99 e da memória de cada operação."""
+    print(f"{'Tamanho':>9} {'Operação':<22}{'vazão':>10}{'p99':>10}{'memória':>10}")
+
+    def razao(novo: Optional[float], velho: Optional[float]) -> str:
+        return f"{novo / velho:.2f}x" if novo is not None and velho else '-'
+
+    for tamanho, operacoes in atual['resultados'].items():
+        for operacao, medida in operacoes.items():
+            base = anterior['resultados'].get(tamanho, {}).get(operacao)
+            if base is None:
+                continue
+            print(f"{tamanho:>9} {operacao:<22}"
+                  f"{razao(medida['vazao_por_segundo'], base['vazao_por_segundo']):>10}"
+                  f"{razao(medida['latencia_us']['p99'], base['latencia_us']['p99']):>10}"
+                  f"{razao(medida.get('memoria_pico_kib'), base.get('memoria_pico_kib')):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks da biblioteca")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--formato', default='.json', help="extensão do arquivo de _salvar_dados/carregar_dados")
+    parser.add_argument('--repeticoes', type=int, default=5, help="chamadas de listar_*, salvar e carregar")
+    parser.add_argument('--semente', type=int, default=SEMENTE_PADRAO)
+    parser.add_argument('--sem-memoria', action='store_true', help="não mede o pico de memória")
+    parser.add_argument('--saida', help="grava os resultados neste arquivo JSON")
+    parser.add_argument('--comparar', nargs=2, metavar=('ANTERIOR', 'ATUAL'),
+                        help="compara dois arquivos de resultados e sai")
+    argumentos = parser.parse_args()
+
+    if argumentos.comparar:
+        with open(argumentos.comparar[0], encoding='utf-8') as f:
+            anterior = json.load(f)
+        with open(argumentos.comparar[1], encoding='utf-8') as f:
+            atual = json.load(f)
+        comparar(anterior, atual)
+        return
+
+    relatorio = executar(argumentos.tamanhos, argumentos.formato, argumentos.repeticoes,
+                         argumentos.semente, not argumentos.sem_memoria)
+    imprimir(relatorio)
+    if argumentos.saida:
+        with open(argumentos.saida, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Análise de Empréstimos
+Estatísticas do histórico de empréstimos sobre colunas NumPy (usuário, livro,
+início, fim, devolvido), atualizadas incrementalmente
+
+Requer numpy (opcional para o restante do sistema).
+"""
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional: só esta análise depende dele
+    np = None
+
+if TYPE_CHECKING:
+    from sistema.biblioteca_poo import Biblioteca, Emprestimo
+
+# Marca de data ausente nas colunas de datas
+_SEM_DATA = -(2 ** 63)
+_MICROSSEGUNDOS_POR_DIA = 86400 * 10 ** 6
+_CAPACIDADE_INICIAL = 1024
+
+
+class AnaliseEmprestimos:
+    """
+    Colunas do histórico de empréstimos de uma biblioteca e as agregações
+    pedidas pela gestão, calculadas de forma vetorizada.
+
+    atualizar() (chamado por todas as consultas) acrescenta só os empréstimos
+    novos e marca as devoluções dos que estavam em aberto; as colunas crescem
+    por duplicação, como uma lista. Se a biblioteca desfizer um lote ou
+    carregar outro estado (o que pode reabrir um empréstimo já marcado como
+    devolvido), as colunas são refeitas do zero.
+    """
+
+    def __init__(self, biblioteca: 'Biblioteca'):
+        if np is None:
+            raise ImportError("A análise de empréstimos requer o numpy (pip install numpy).")
+        self.biblioteca = biblioteca
+        self._quantidade = 0
+        self._ultimo: Optional['Emprestimo'] = None
+        self._abertos: Dict[int, 'Emprestimo'] = {}   # linha -> empréstimo em aberto
+        self._geracao = biblioteca._geracao
+        self._alocar(_CAPACIDADE_INICIAL)
+
+    def _alocar(self, capacidade: int) -> None:
+        """Cria (ou amplia, preservando as linhas) as colunas."""
+        antigas = getattr(self, '_usuario', None)
+        colunas = {
+            '_usuario': np.zeros(capacidade, dtype=np.int64),
+            '_livro': np.zeros(capacidade, dtype=np.int64),
+            '_inicio': np.full(capacidade, _SEM_DATA, dtype=np.int64),
+            '_fim': np.full(capacidade, _SEM_DATA, dtype=np.int64),
+            '_devolvido': np.zeros(capacidade, dtype=bool),
+        }
+        for nome, coluna in colunas.items():
+            if antigas is not None:
+                coluna[:self._quantidade] = getattr(self, nome)[:self._quantidade]
+            setattr(self, nome, coluna)
+
+    def _reiniciar(self) -> None:
+        self._quantidade = 0
+        self._ultimo = None
+        self._abertos.clear()
+
+    # ==================== ATUALIZAÇÃO ====================
+
+    def atualizar(self) -> None:
+        """Sincroniza as colunas com o histórico atual da biblioteca."""
+        trava = self.biblioteca._trava
+        if trava is not None:
+            trava.adquirir_leitura()
+        try:
+            self._atualizar()
+        finally:
+            if trava is not None:
+                trava.liberar_leitura()
+
+    def _atualizar(self) -> None:
+        historico = self.biblioteca._emprestimos_obj
+        n = self._quantidade
+        if (self.biblioteca._geracao != self._geracao or len(historico) < n
+                or (n and historico[n - 1] is not self._ultimo)):
+            self._reiniciar()
+            self._geracao = self.biblioteca._geracao
+            n = 0
+
+        # Devoluções dos empréstimos que estavam em aberto
+        for linha, emprestimo in list(self._abertos.items()):
+            if emprestimo.devolvido:
+                self._devolvido[linha] = True
+                self._fim[linha] = _inteiro_ou_ausente(emprestimo._data_devolucao)
+                del self._abertos[linha]
+
+        novos = historico[n:]
+        if not novos:
+            return
+        total = n + len(novos)
+        if total > len(self._usuario):
+            capacidade = len(self._usuario)
+            while capacidade < total:
+                capacidade *= 2
+            self._alocar(capacidade)
+
+        self._usuario[n:total] = [emprestimo.usuario_id for emprestimo in novos]
+        self._livro[n:total] = [emprestimo.livro_id for emprestimo in novos]
+        self._inicio[n:total] = [_inteiro_ou_ausente(emprestimo._data_emprestimo) for emprestimo in novos]
+        self._fim[n:total] = [_inteiro_ou_ausente(emprestimo._data_devolucao) for emprestimo in novos]
+        self._devolvido[n:total] = [emprestimo.devolvido for emprestimo in novos]
+        for linha, emprestimo in enumerate(novos, start=n):
+            if not emprestimo.devolvido:
+                self._abertos[linha] = emprestimo
+
+        self._quantidade = total
+        self._ultimo = historico[total - 1]
+
+    def colunas(self) -> Dict[str, 'np.ndarray']:
+        """Visões (sem cópia) das colunas preenchidas, após atualizar."""
+        self.atualizar()
+        n = self._quantidade
+        return {
+            'usuario_id': self._usuario[:n],
+            'livro_id': self._livro[:n],
+            'inicio': self._inicio[:n],
+            'fim': self._fim[:n],
+            'devolvido': self._devolvido[:n],
+        }
+
+    # ==================== AGREGAÇÕES ====================
+
+    def livros_mais_emprestados(self, limite: int = 10) -> List[Tuple[int, int]]:
+        """[(livro_id, empréstimos)] dos livros mais emprestados."""
+        return _mais_frequentes(self.colunas()['livro_id'], limite)
+
+    def usuarios_mais_ativos(self, limite: int = 10) -> List[Tuple[int, int]]:
+        """[(usuario_id, empréstimos)] dos usuários que mais pegaram livros."""
+        return _mais_frequentes(self.colunas()['usuario_id'], limite)
+
+    def emprestimos_por_mes(self) -> List[Tuple[str, int]]:
+        """[('AAAA-MM', empréstimos)] em ordem cronológica."""
+        inicio = self.colunas()['inicio']
+        inicio = inicio[inicio != _SEM_DATA]
+        meses, contagens = np.unique(inicio.astype('datetime64[us]').astype('datetime64[M]'), return_counts=True)
+        return [(str(mes), int(contagem)) for mes, contagem in zip(meses, contagens)]
+
+    def duracao_media_dias(self) -> Optional[float]:
+        """Duração média, em dias, dos empréstimos já devolvidos (None se não houver)."""
+        colunas = self.colunas()
+        validos = colunas['devolvido'] & (colunas['inicio'] != _SEM_DATA) & (colunas['fim'] != _SEM_DATA)
+        if not validos.any():
+            return None
+        duracoes = colunas['fim'][validos] - colunas['inicio'][validos]
+        return float(duracoes.mean() / _MICROSSEGUNDOS_POR_DIA)
+
+
+def _inteiro_ou_ausente(valor) -> int:
+    """Datas guardadas como inteiro passam direto; None ou texto viram _SEM_DATA."""
+    return valor if isinstance(valor, int) else _SEM_DATA
+
+
+def _mais_frequentes(ids: 'np.ndarray', limite: int) -> List[Tuple[int, int]]:
+    """Os `limite` IDs mais frequentes (desempate pelo menor ID)."""
+    if not len(ids) or limite <= 0:
+        return []
+    contagens = np.bincount(ids)
+    candidatos = np.flatnonzero(contagens)
+    if len(candidatos) > limite:
+        # Seleção parcial O(n), depois ordenação só dos escolhidos
+        limiar = np.partition(contagens[candidatos], -limite)[-limite]
+        candidatos = candidatos[contagens[candidatos] >= limiar]
+    ordem = np.lexsort((candidatos, -contagens[candidatos]))[:limite]
+    return [(int(candidatos[i]), int(contagens[candidatos[i]])) for i in ordem]
@@ -0,0 +1,398 @@
+"""
+Armazenamento da Biblioteca
+Interface de persistência e suas implementações (JSON, JSON Lines, binário,
+diário e SQLite)
+"""
+
+import json
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Callable, List, Optional
+
+from sistema import formato_binario
+from sistema.gravacao import gravar_atomicamente
+
+if TYPE_CHECKING:
+    from sistema.biblioteca_poo import Biblioteca
+
+# Recebe (processados, total): bytes lidos do arquivo, ou linhas lidas no SQLite
+Progresso = Callable[[int, int], None]
+
+# Extensões que selecionam o instantâneo binário
+EXTENSOES_BINARIAS = ('.bin', '.bib')
+
+# Intervalo, em registros, entre duas chamadas do callback de progresso
+INTERVALO_PROGRESSO = 10000
+
+
+class Armazenamento(ABC):
+    """
+    Interface dos mecanismos de persistência da biblioteca.
+
+    Cada alteração chega como um registro {'tipo': ..., 'dados': ...}, onde
+    tipo é 'livro', 'usuario', 'emprestimo' ou 'reserva' e dados é o to_dict()
+    da entidade.
+    """
+
+    # True se gravar() usa os registros recebidos; False se regrava tudo (e
+    # os registros só indicam que houve alteração)
+    incremental = False
+
+    @abstractmethod
+    def salvar(self, biblioteca: 'Biblioteca') -> None:
+        """Grava o estado completo da biblioteca."""
+
+    @abstractmethod
+    def carregar(self, biblioteca: 'Biblioteca', progresso: Optional[Progresso] = None) -> None:
+        """Carrega o estado gravado para dentro da biblioteca."""
+
+    def gravar(self, biblioteca: 'Biblioteca', registros: List[dict]) -> None:
+        """Persiste um conjunto de alterações (por padrão, regrava tudo)."""
+        self.salvar(biblioteca)
+
+    def compactar(self, biblioteca: 'Biblioteca') -> None:
+        """Reorganiza o armazenamento (nada a fazer por padrão)."""
+
+    def fechar(self) -> None:
+        """Libera os recursos abertos (nada a fazer por padrão)."""
+
+
+class ArmazenamentoNulo(Armazenamento):
+    """Descarta as gravações: biblioteca só em memória (testes e benchmarks)."""
+
+    def salvar(self, biblioteca: 'Biblioteca') -> None:
+        pass
+
+    def carregar(self, biblioteca: 'Biblioteca', progresso: Optional[Progresso] = None) -> None:
+        pass
+
+    def gravar(self, biblioteca: 'Biblioteca', registros: List[dict]) -> None:
+        pass
+
+
+class ArmazenamentoJSON(Armazenamento):
+    """Documento JSON único, regravado por inteiro (e atomicamente) a cada alteração."""
+
+    def __init__(self, arquivo: str):
+        self.arquivo = arquivo
+
+    def salvar(self, biblioteca: 'Biblioteca') -> None:
+        estado = biblioteca._exportar_estado()
+        gravar_atomicamente(self.arquivo, lambda f: json.dump(estado, f, indent=2, ensure_ascii=False))
+
+    def carregar(self, biblioteca: 'Biblioteca', progresso: Optional[Progresso] = None) -> None:
+        if not os.path.exists(self.arquivo):
+            return
+
+        try:
+            with open(self.arquivo, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+            biblioteca._carregar_estado(dados)
+        except (json.JSONDecodeError, KeyError) as e:
+            print(f"Erro ao carregar dados: {e}")
+
+        if progresso:
+            tamanho = os.path.getsize(self.arquivo)
+            progresso(tamanho, tamanho)
+
+
+def _linha_json(registro: dict) -> str:
+    """Serializa um registro em uma linha JSON compacta."""
+    return json.dumps(registro, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+def _reaplicar_linhas(biblioteca: 'Biblioteca', arquivo: str,
+                      progresso: Optional[Progresso] = None) -> int:
+    """
+    Aplica cada linha {'tipo': ..., 'dados': ...} do arquivo à biblioteca.
+
+    O arquivo é lido em fluxo: só a linha atual fica em memória. Retorna a
+    quantidade de registros aplicados.
+    """
+    total = os.path.getsize(arquivo)
+    lidos = 0
+    aplicados = 0
+
+    with open(arquivo, 'rb') as f:
+        for numero, linha in enumerate(f, start=1):
+            lidos += len(linha)
+            if not linha.strip():
+                continue
+            try:
+                registro = json.loads(linha)
+                biblioteca._aplicar_registro(registro['tipo'], registro['dados'])
+            except (json.JSONDecodeError, KeyError) as e:
+                # Uma linha incompleta no fim indica gravação interrompida
+                print(f"Erro ao ler {arquivo} (linha {numero}): {e}")
+                break
+            aplicados += 1
+            if progresso and aplicados % INTERVALO_PROGRESSO == 0:
+                progresso(lidos, total)
+
+    if progresso:
+        progresso(lidos, total)
+    return aplicados
+
+
+class ArmazenamentoJSONL(Armazenamento):
+    """
+    JSON Lines: um registro {'tipo': ..., 'dados': ...} por linha.
+
+    A primeira linha traz os contadores. A gravação e a leitura acontecem em
+    fluxo, registro a registro, sem montar o documento inteiro em memória.
+    """
+
+    def __init__(self, arquivo: str):
+        self.arquivo = arquivo
+
+    def salvar(self, biblioteca: 'Biblioteca') -> None:
+        gravar_atomicamente(self.arquivo, lambda f: f.writelines(
+            _linha_json(registro) for registro in biblioteca._exportar_registros()
+        ))
+
+    def carregar(self, biblioteca: 'Biblioteca', progresso: Optional[Progresso] = None) -> None:
+        if os.path.exists(self.arquivo):
+            _reaplicar_linhas(biblioteca, self.arquivo, progresso)
+
+
+class ArmazenamentoBinario(Armazenamento):
+    """
+    Instantâneo binário compacto (ver sistema.formato_binario).
+
+    Registros de tamanho fixo e uma tabela de strings sem repetição tornam a
+    leitura bem mais rápida que a do JSON. Regravado por inteiro, como o JSON.
+    """
+
+    def __init__(self, arquivo: str):
+        self.arquivo = arquivo
+
+    def salvar(self, biblioteca: 'Biblioteca') -> None:
+        formato_binario.gravar(self.arquivo, biblioteca._exportar_estado())
+
+    def carregar(self, biblioteca: 'Biblioteca', progresso: Optional[Progresso] = None) -> None:
+        if not os.path.exists(self.arquivo):
+            return
+
+        try:
+            biblioteca._carregar_tabelas(*formato_binario.ler(self.arquivo))
+        except formato_binario.ErroFormatoBinario as e:
+            print(f"Erro ao carregar dados: {e}")
+
+        if progresso:
+            tamanho = os.path.getsize(self.arquivo)
+            progresso(tamanho, tamanho)
+
+
+class ArmazenamentoDiario(Armazenamento):
+    """
+    Diário de alterações sobre um instantâneo (JSON, JSON Lines ou binário).
+
+    Cada alteração acrescenta uma linha ao arquivo '<arquivo>.diario'. Ao passar
+    de `limite` registros, o diário é incorporado a um novo instantâneo. Com
+    `sincronizar`, cada acréscimo só retorna depois do fsync.
+    """
+
+    incremental = True
+
+    def __init__(self, instantaneo: Armazenamento, arquivo: str, limite: int = 1000,
+                 sincronizar: bool = True):
+        self.instantaneo = instantaneo
+        self.arquivo_diario = f'{arquivo}.diario'
+        self.limite = limite
+        self.sincronizar = sincronizar
+        self.registros_no_diario = 0
+
+    def salvar(self, biblioteca: 'Biblioteca') -> None:
+        self.compactar(biblioteca)
+
+    def gravar(self, biblioteca: 'Biblioteca', registros: List[dict]) -> None:
+        with open(self.arquivo_diario, 'a', encoding='utf-8') as f:
+            f.writelines(_linha_json(registro) for registro in registros)
+            if self.sincronizar:
+                f.flush()
+                os.fsync(f.fileno())
+
+        self.registros_no_diario += len(registros)
+        if self.registros_no_diario >= self.limite:
+            self.compactar(biblioteca)
+
+    def compactar(self, biblioteca: 'Biblioteca') -> None:
+        """Incorpora o diário em um novo instantâneo e o esvazia."""
+        self.instantaneo.salvar(biblioteca)
+        if os.path.exists(self.arquivo_diario):
+            os.remove(self.arquivo_diario)
+        self.registros_no_diario = 0
+
+    def carregar(self, biblioteca: 'Biblioteca', progresso: Optional[Progresso] = None) -> None:
+        self.instantaneo.carregar(biblioteca, progresso)
+        self.registros_no_diario = 0
+        if os.path.exists(self.arquivo_diario):
+            self.registros_no_diario = _reaplicar_linhas(biblioteca, self.arquivo_diario)
+
+
+class ArmazenamentoSQLite(Armazenamento):
+    """
+    Banco SQLite indexado (modo WAL).
+
+    Cada alteração vira um UPSERT de uma linha, então o custo de gravação não
+    depende do tamanho do acervo.
+    """
+
+    incremental = True
+
+    _ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS livros (
+            id INTEGER PRIMARY KEY,
+            titulo TEXT NOT NULL,
+            autor TEXT NOT NULL,
+            isbn TEXT NOT NULL UNIQUE,
+            ano INTEGER,
+            disponivel INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS usuarios (
+            id INTEGER PRIMARY KEY,
+            nome TEXT NOT NULL,
+            email TEXT NOT NULL UNIQUE,
+            telefone TEXT
+        );
+        CREATE TABLE IF NOT EXISTS emprestimos (
+            id INTEGER PRIMARY KEY,
+            usuario_id INTEGER NOT NULL,
+            livro_id INTEGER NOT NULL,
+            devolvido INTEGER NOT NULL,
+            data_emprestimo TEXT,
+            data_devolucao TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_emprestimos_usuario ON emprestimos (usuario_id);
+        CREATE INDEX IF NOT EXISTS idx_emprestimos_livro ON emprestimos (livro_id);
+        CREATE TABLE IF NOT EXISTS reservas (
+            id INTEGER PRIMARY KEY,
+            usuario_id INTEGER NOT NULL,
+            livro_id INTEGER NOT NULL,
+            situacao TEXT NOT NULL,
+            data_reserva TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_reservas_usuario ON reservas (usuario_id);
+        CREATE TABLE IF NOT EXISTS contadores (
+            nome TEXT PRIMARY KEY,
+            valor INTEGER NOT NULL
+        );
+    """
+
+    # Comandos fixos: o sqlite3 reaproveita a instrução já preparada
+    _UPSERT = {
+        'livro': (
+            "INSERT INTO livros (id, titulo, autor, isbn, ano, disponivel) "
+            "VALUES (:id, :titulo, :autor, :isbn, :ano, :disponivel) "
+            "ON CONFLICT(id) DO UPDATE SET disponivel = excluded.disponivel"
+        ),
+        'usuario': (
+            "INSERT INTO usuarios (id, nome, email, telefone) "
+            "VALUES (:id, :nome, :email, :telefone) "
+            "ON CONFLICT(id) DO NOTHING"
+        ),
+        'emprestimo': (
+            "INSERT INTO emprestimos (id, usuario_id, livro_id, devolvido, data_emprestimo, data_devolucao) "
+            "VALUES (:id, :usuario_id, :livro_id, :devolvido, :data_emprestimo, :data_devolucao) "
+            "ON CONFLICT(id) DO UPDATE SET devolvido = excluded.devolvido, "
+            "data_devolucao = excluded.data_devolucao"
+        ),
+        'reserva': (
+            "INSERT INTO reservas (id, usuario_id, livro_id, situacao, data_reserva) "
+            "VALUES (:id, :usuario_id, :livro_id, :situacao, :data_reserva) "
+            "ON CONFLICT(id) DO UPDATE SET situacao = excluded.situacao"
+        ),
+    }
+    # A disponibilidade do livro acompanha o último empréstimo
+    _ATUALIZAR_DISPONIBILIDADE = (
+        "UPDATE livros SET disponivel = :devolvido WHERE id = :livro_id"
+    )
+    _UPSERT_CONTADOR = (
+        "INSERT INTO contadores (nome, valor) VALUES (?, ?) "
+        "ON CONFLICT(nome) DO UPDATE SET valor = excluded.valor"
+    )
+
+    def __init__(self, arquivo: str):
+        self.arquivo = arquivo
+        self._conexao = sqlite3.connect(arquivo, check_same_thread=False)
+        self._conexao.execute('PRAGMA journal_mode=WAL')
+        self._conexao.execute('PRAGMA synchronous=NORMAL')
+        self._conexao.executescript(self._ESQUEMA)
+
+    def salvar(self, biblioteca: 'Biblioteca') -> None:
+        estado = biblioteca._exportar_estado()
+        with self._conexao:
+            self._conexao.execute('DELETE FROM livros')
+            self._conexao.execute('DELETE FROM usuarios')
+            self._conexao.execute('DELETE FROM emprestimos')
+            self._conexao.execute('DELETE FROM reservas')
+            self._conexao.executemany(self._UPSERT['livro'], estado['livros'])
+            self._conexao.executemany(self._UPSERT['usuario'], estado['usuarios'])
+            self._conexao.executemany(self._UPSERT['emprestimo'], estado['emprestimos'])
+            self._conexao.executemany(self._UPSERT['reserva'], estado['reservas'])
+            self._gravar_contadores(estado['contadores'])
+
+    def gravar(self, biblioteca: 'Biblioteca', registros: List[dict]) -> None:
+        with self._conexao:
+            for registro in registros:
+                self._conexao.execute(self._UPSERT[registro['tipo']], registro['dados'])
+                if registro['tipo'] == 'emprestimo':
+                    self._conexao.execute(self._ATUALIZAR_DISPONIBILIDADE, registro['dados'])
+            self._gravar_contadores(biblioteca._exportar_contadores())
+
+    def _gravar_contadores(self, contadores: dict) -> None:
+        self._conexao.executemany(self._UPSERT_CONTADOR, contadores.items())
+
+    def carregar(self, biblioteca: 'Biblioteca', progresso: Optional[Progresso] = None) -> None:
+        self._conexao.row_factory = sqlite3.Row
+        try:
+            biblioteca._carregar_estado({
+                'contadores': {
+                    linha['nome']: linha['valor']
+                    for linha in self._conexao.execute('SELECT nome, valor FROM contadores')
+                },
+                'livros': self._linhas('SELECT * FROM livros ORDER BY id', 'disponivel'),
+                'usuarios': self._linhas('SELECT * FROM usuarios ORDER BY id'),
+                'emprestimos': self._linhas('SELECT * FROM emprestimos ORDER BY id', 'devolvido'),
+                'reservas': self._linhas('SELECT * FROM reservas ORDER BY id'),
+            })
+        finally:
+            self._conexao.row_factory = None
+
+        if progresso:
+            linhas = sum(
+                self._conexao.execute(f'SELECT COUNT(*) FROM {tabela}').fetchone()[0]
+                for tabela in ('livros', 'usuarios', 'emprestimos', 'reservas')
+            )
+            progresso(linhas, linhas)
+
+    def _linhas(self, consulta: str, campo_booleano: str = None):
+        """Percorre as linhas de uma consulta como dicionários."""
+        for linha in self._conexao.execute(consulta):
+            dados = dict(linha)
+            if campo_booleano:
+                dados[campo_booleano] = bool(dados[campo_booleano])
+            yield dados
+
+    def fechar(self) -> None:
+        self._conexao.close()
+
+
+def criar_armazenamento(arquivo: str, usar_diario: bool = False,
+                        limite_diario: int = 1000) -> Armazenamento:
+    """Escolhe o armazenamento pela extensão do arquivo."""
+    extensao = os.path.splitext(arquivo)[1].lower()
+    if extensao in ('.db', '.sqlite', '.sqlite3'):
+        return ArmazenamentoSQLite(arquivo)
+
+    if extensao in ('.jsonl', '.ndjson'):
+        armazenamento = ArmazenamentoJSONL(arquivo)
+    elif extensao in EXTENSOES_BINARIAS:
+        armazenamento = ArmazenamentoBinario(arquivo)
+    else:
+        armazenamento = ArmazenamentoJSON(arquivo)
+
+    if usar_diario:
+        return ArmazenamentoDiario(armazenamento, arquivo, limite_diario)
+    return armazenamento
@@ -4,6 +4,11 @@ from sistema.usuario import Usuario
 from sistema.emprestimo import Emprestimo
 
 
+def _campos(obj):
+    # as entidades usam __slots__ (sem vars()); campos internos "_x" saem como "x"
+    return {nome.lstrip('_'): getattr(obj, nome.lstrip('_')) for nome in obj.__slots__}
+
+
 class Biblioteca:
     def __init__(self, arquivo_dados='biblioteca.json'):
         self._livros_obj = []
@@ -78,9 +83,9 @@ class Biblioteca:
     # ---------- PERSISTÊNCIA ----------
     def salvar_dados(self):
         dados = {
-            'livros': [vars(l) for l in self._livros_obj],
-            'usuarios': [vars(u) for u in self._usuarios_obj],
-            'emprestimos': [vars(e) for e in self._emprestimos_obj],
+            'livros': [_campos(l) for l in self._livros_obj],
+            'usuarios': [_campos(u) for u in self._usuarios_obj],
+            'emprestimos': [_campos(e) for e in self._emprestimos_obj],
             'contador_livros': self.contador_livros,
             'contador_usuarios': self.contador_usuarios
         }
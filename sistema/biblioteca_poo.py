@@ -3,30 +3,129 @@ Sistema de Biblioteca
 Implementação seguindo princípios de Clean Code e Orientação a Objetos
 """
 
-import json
+import bisect
 import os
-from datetime import datetime
-from typing import List, Optional
+import sys
+import threading
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple, Union
+
+from sistema.armazenamento import Armazenamento, ArmazenamentoNulo, Progresso, criar_armazenamento
+from sistema.busca import IndiceInvertido, normalizar
+from sistema.catalogo_mmap import gravar_catalogo
+from sistema.concorrencia import TravaLeituraEscrita, escrita, leitura
+from sistema.gravacao import ConfirmacaoEmGrupo
+from sistema.importacao import Fonte, ler_registros
+from sistema.indice_ordenado import IndiceOrdenado
+from sistema.instantaneo import Instantaneo
+from sistema.metricas import RegistroMetricas, medido
+from sistema.vencimentos import IndiceVencimentos
+
+# Datas são guardadas como microssegundos desde a época (int), bem mais
+# compactas que a string ISO; a conversão acontece apenas no acesso.
+_EPOCA = datetime(1970, 1, 1)
+_MICROSSEGUNDO = timedelta(microseconds=1)
+
+# Tipos de entidade, cada um com sua numeração de IDs
+TIPOS_ENTIDADE = ('livro', 'usuario', 'emprestimo', 'reserva')
+
+# Tamanho das páginas buscadas por iterar_*() quando não há limite
+TAMANHO_PAGINA = 500
+
+# Abaixo disso não compensa podar o histórico dos instantâneos
+_PODA_MINIMA_HISTORICO = 1024
+
+# Linhas importadas por gravação quando o armazenamento é incremental
+TAMANHO_BLOCO_IMPORTACAO = 1000
+
+# Ordens aceitas por iterar_*()
+ORDENS = ('crescente', 'decrescente')
+
+# Maior caractere Unicode: limite superior das chaves que começam com um prefixo
+_MAIOR_CARACTERE = '\U0010ffff'
+
+class ErroBibliotecaFechada(RuntimeError):
+    """Alteração pedida a uma biblioteca já fechada (por exemplo, descarregada pelo gerenciador)."""
+
+
+# Prazo de devolução de um empréstimo
+PRAZO_EMPRESTIMO = timedelta(days=14)
+_PRAZO_EM_MICROSSEGUNDOS = PRAZO_EMPRESTIMO // _MICROSSEGUNDO
+
+
+def _data_para_inteiro(data: Optional[str]) -> Union[int, str, None]:
+    """Converte uma data ISO em inteiro; valores não reconhecidos são mantidos."""
+    if data is None:
+        return None
+    try:
+        return (datetime.fromisoformat(data) - _EPOCA) // _MICROSSEGUNDO
+    except (TypeError, ValueError):
+        return data
+
+
+def _inteiro_para_data(valor: Union[int, str, None]) -> Optional[str]:
+    """Converte o inteiro guardado de volta para a data ISO."""
+    if isinstance(valor, int):
+        return (_EPOCA + valor * _MICROSSEGUNDO).isoformat()
+    return valor
+
+
+def _momento_para_inteiro(momento: Union[datetime, str, None]) -> int:
+    """Converte um datetime ou data ISO (None = agora) em microssegundos desde a época."""
+    if momento is None:
+        momento = datetime.now()
+    elif isinstance(momento, str):
+        momento = datetime.fromisoformat(momento)
+    return (momento - _EPOCA) // _MICROSSEGUNDO
+
+
+def _converter_ano(ano) -> Optional[int]:
+    """Ano como inteiro ("1999" é aceito); None se não for um ano válido."""
+    if isinstance(ano, bool):
+        return None
+    try:
+        return int(ano)
+    except (TypeError, ValueError):
+        return None
+
+
+def _texto_importado(valor) -> str:
+    """Campo de texto de um registro importado: números viram texto; outros tipos, vazio (inválido)."""
+    if isinstance(valor, bool) or not isinstance(valor, (str, int, float)):
+        return ''
+    return str(valor).strip()
 
 
 class Livro:
     """Representa um livro no sistema da biblioteca."""
     
+    __slots__ = ('id', 'titulo', 'autor', 'isbn', 'ano', 'disponivel')
+    
     contador_id = 0
+    _trava_ids = threading.Lock()
     
     def __init__(self, titulo: str, autor: str, isbn: str, ano: int, id: Optional[int] = None):
-        if id is not None:
-            self.id = int(id)
-            if self.id > Livro.contador_id:
-                Livro.contador_id = self.id
-        else:
-            Livro.contador_id += 1
-            self.id = Livro.contador_id
+        with Livro._trava_ids:
+            if id is not None:
+                self.id = int(id)
+                if self.id > Livro.contador_id:
+                    Livro.contador_id = self.id
+            else:
+                Livro.contador_id += 1
+                self.id = Livro.contador_id
         
         self.titulo = titulo
-        self.autor = autor
+        # Autores se repetem muito no acervo: uma única cópia de cada nome
+        self.autor = sys.intern(autor)
         self.isbn = isbn
-        self.ano = ano
+        # Sempre inteiro: o índice por ano compara (ano, id) entre livros e
+        # os formatos binário e de catálogo gravam o ano num campo inteiro
+        self.ano = _converter_ano(ano)
+        if self.ano is None:
+            raise ValueError(f"Ano inválido: {ano!r}")
         self.disponivel = True
     
     def emprestar(self) -> None:
@@ -48,6 +147,19 @@ class Livro:
             'disponivel': self.disponivel
         }
     
+    @classmethod
+    def from_dict(cls, dados: dict) -> 'Livro':
+        """Cria um livro a partir de um dicionário."""
+        livro = cls(
+            titulo=dados['titulo'],
+            autor=dados['autor'],
+            isbn=dados['isbn'],
+            ano=dados['ano'],
+            id=dados['id']
+        )
+        livro.disponivel = dados.get('disponivel', True)
+        return livro
+    
     def __str__(self) -> str:
         status = "Disponível" if self.disponivel else "Emprestado"
         return f"[{self.id}] {self.titulo} - {self.autor} ({self.ano}) | {status}"
@@ -61,16 +173,20 @@ class Livro:
 class Usuario:
     """Representa um usuário da biblioteca."""
     
+    __slots__ = ('id', 'nome', 'email', 'telefone')
+    
     contador_id = 0
+    _trava_ids = threading.Lock()
     
     def __init__(self, nome: str, email: str, telefone: str, id: Optional[int] = None):
-        if id is not None:
-            self.id = int(id)
-            if self.id > Usuario.contador_id:
-                Usuario.contador_id = self.id
-        else:
-            Usuario.contador_id += 1
-            self.id = Usuario.contador_id
+        with Usuario._trava_ids:
+            if id is not None:
+                self.id = int(id)
+                if self.id > Usuario.contador_id:
+                    Usuario.contador_id = self.id
+            else:
+                Usuario.contador_id += 1
+                self.id = Usuario.contador_id
         
         self.nome = nome
         self.email = email
@@ -85,6 +201,16 @@ class Usuario:
             'telefone': self.telefone
         }
     
+    @classmethod
+    def from_dict(cls, dados: dict) -> 'Usuario':
+        """Cria um usuário a partir de um dicionário."""
+        return cls(
+            nome=dados['nome'],
+            email=dados['email'],
+            telefone=dados['telefone'],
+            id=dados['id']
+        )
+    
     def __str__(self) -> str:
         return f"[{self.id}] {self.nome} - {self.email} - {self.telefone}"
     
@@ -97,27 +223,65 @@ class Usuario:
 class Emprestimo:
     """Representa um empréstimo de livro."""
     
+    __slots__ = ('id', 'usuario_id', 'livro_id', 'devolvido', '_data_emprestimo', '_data_devolucao')
+    
     contador_id = 0
+    _trava_ids = threading.Lock()
     
     def __init__(self, usuario_id: int, livro_id: int, id: Optional[int] = None):
-        if id is not None:
-            self.id = int(id)
-            if self.id > Emprestimo.contador_id:
-                Emprestimo.contador_id = self.id
-        else:
-            Emprestimo.contador_id += 1
-            self.id = Emprestimo.contador_id
+        with Emprestimo._trava_ids:
+            if id is not None:
+                self.id = int(id)
+                if self.id > Emprestimo.contador_id:
+                    Emprestimo.contador_id = self.id
+            else:
+                Emprestimo.contador_id += 1
+                self.id = Emprestimo.contador_id
         
         self.usuario_id = int(usuario_id)
         self.livro_id = int(livro_id)
         self.devolvido = False
-        self.data_emprestimo = datetime.now().isoformat()
-        self.data_devolucao = None
+        self._data_emprestimo = (datetime.now() - _EPOCA) // _MICROSSEGUNDO
+        self._data_devolucao = None
+    
+    @property
+    def data_emprestimo(self) -> Optional[str]:
+        """Data do empréstimo no formato ISO."""
+        return _inteiro_para_data(self._data_emprestimo)
+    
+    @data_emprestimo.setter
+    def data_emprestimo(self, valor: Optional[str]) -> None:
+        self._data_emprestimo = _data_para_inteiro(valor)
+    
+    @property
+    def data_devolucao(self) -> Optional[str]:
+        """Data da devolução no formato ISO (None enquanto não devolvido)."""
+        return _inteiro_para_data(self._data_devolucao)
+    
+    @data_devolucao.setter
+    def data_devolucao(self, valor: Optional[str]) -> None:
+        self._data_devolucao = _data_para_inteiro(valor)
+    
+    @property
+    def data_vencimento(self) -> Optional[str]:
+        """Prazo para devolução (data do empréstimo + PRAZO_EMPRESTIMO), no formato ISO."""
+        return _inteiro_para_data(self._vencimento())
+    
+    def _vencimento(self) -> Optional[int]:
+        """Prazo para devolução em microssegundos (None se a data for desconhecida)."""
+        if isinstance(self._data_emprestimo, int):
+            return self._data_emprestimo + _PRAZO_EM_MICROSSEGUNDOS
+        return None
+    
+    def esta_atrasado(self, momento: Union[datetime, str, None] = None) -> bool:
+        """Indica se o empréstimo segue em aberto depois do prazo (padrão: agora)."""
+        vencimento = self._vencimento()
+        return not self.devolvido and vencimento is not None and vencimento < _momento_para_inteiro(momento)
     
     def realizar_devolucao(self) -> None:
         """Marca o empréstimo como devolvido."""
         self.devolvido = True
-        self.data_devolucao = datetime.now().isoformat()
+        self._data_devolucao = (datetime.now() - _EPOCA) // _MICROSSEGUNDO
     
     def to_dict(self) -> dict:
         """Converte o empréstimo para dicionário."""
@@ -130,173 +294,980 @@ class Emprestimo:
             'data_devolucao': self.data_devolucao
         }
     
+    @classmethod
+    def from_dict(cls, dados: dict) -> 'Emprestimo':
+        """Cria um empréstimo a partir de um dicionário."""
+        emprestimo = cls(
+            usuario_id=dados['usuario_id'],
+            livro_id=dados['livro_id'],
+            id=dados['id']
+        )
+        emprestimo.devolvido = dados.get('devolvido', False)
+        emprestimo.data_emprestimo = dados.get('data_emprestimo')
+        emprestimo.data_devolucao = dados.get('data_devolucao')
+        return emprestimo
+    
+    @classmethod
+    def resetar_contador(cls) -> None:
+        """Reseta o contador de IDs (útil para testes)."""
+        cls.contador_id = 0
+
+
+class Reserva:
+    """Representa a reserva de um livro emprestado (lugar na fila de espera)."""
+    
+    __slots__ = ('id', 'usuario_id', 'livro_id', 'situacao', '_data_reserva')
+    
+    AGUARDANDO = 'aguardando'
+    ATENDIDA = 'atendida'
+    CANCELADA = 'cancelada'
+    
+    contador_id = 0
+    _trava_ids = threading.Lock()
+    
+    def __init__(self, usuario_id: int, livro_id: int, id: Optional[int] = None):
+        with Reserva._trava_ids:
+            if id is not None:
+                self.id = int(id)
+                if self.id > Reserva.contador_id:
+                    Reserva.contador_id = self.id
+            else:
+                Reserva.contador_id += 1
+                self.id = Reserva.contador_id
+        
+        self.usuario_id = int(usuario_id)
+        self.livro_id = int(livro_id)
+        self.situacao = Reserva.AGUARDANDO
+        self._data_reserva = (datetime.now() - _EPOCA) // _MICROSSEGUNDO
+    
+    @property
+    def data_reserva(self) -> Optional[str]:
+        """Data da reserva no formato ISO."""
+        return _inteiro_para_data(self._data_reserva)
+    
+    @data_reserva.setter
+    def data_reserva(self, valor: Optional[str]) -> None:
+        self._data_reserva = _data_para_inteiro(valor)
+    
+    @property
+    def aguardando(self) -> bool:
+        """Indica se a reserva ainda está na fila."""
+        return self.situacao == Reserva.AGUARDANDO
+    
+    def to_dict(self) -> dict:
+        """Converte a reserva para dicionário."""
+        return {
+            'id': self.id,
+            'usuario_id': self.usuario_id,
+            'livro_id': self.livro_id,
+            'situacao': self.situacao,
+            'data_reserva': self.data_reserva
+        }
+    
+    @classmethod
+    def from_dict(cls, dados: dict) -> 'Reserva':
+        """Cria uma reserva a partir de um dicionário."""
+        reserva = cls(
+            usuario_id=dados['usuario_id'],
+            livro_id=dados['livro_id'],
+            id=dados['id']
+        )
+        reserva.situacao = dados.get('situacao', Reserva.AGUARDANDO)
+        reserva.data_reserva = dados.get('data_reserva')
+        return reserva
+    
     @classmethod
     def resetar_contador(cls) -> None:
         """Reseta o contador de IDs (útil para testes)."""
         cls.contador_id = 0
 
 
-class Biblioteca:
+# Coleções da API estática antiga: tipo de entidade e classe de cada uma
+_COLECOES_LEGADAS = {'livros': ('livro', Livro), 'usuarios': ('usuario', Usuario),
+                     'emprestimos': ('emprestimo', Emprestimo)}
+
+# Campos que a API antiga alterava direto no dicionário e que, alterados num
+# registro, ainda alteram a biblioteca; os demais têm método próprio nela
+_CAMPOS_LEGADOS_ALTERAVEIS = {'livros': ('disponivel',)}
+
+
+class _RegistroLegado(dict):
+    """
+    Cópia de uma entidade no dicionário da API antiga (um dict de verdade,
+    serializável em JSON). Alterar 'disponivel' de um livro também altera (e
+    persiste) o livro; os demais campos mudam só nesta cópia.
+    """
+    
+    def __init__(self, biblioteca: 'Biblioteca', chave: str, objeto):
+        super().__init__(objeto.to_dict())
+        if chave == 'usuarios':
+            # Os usuários da API antiga tinham o campo 'ativo'
+            super().__setitem__('ativo', True)
+        self._biblioteca = biblioteca
+        self._chave = chave
+        self._objeto = objeto
+    
+    def __setitem__(self, campo: str, valor) -> None:
+        if campo in _CAMPOS_LEGADOS_ALTERAVEIS.get(self._chave, ()):
+            self._biblioteca._alterar_registro_legado(self._chave, self._objeto, campo, valor)
+        super().__setitem__(campo, valor)
+
+
+class _ListaLegada(list):
+    """
+    Cópia de uma coleção na lista de dicionários da API antiga (uma list de
+    verdade, serializável em JSON). append(), extend() e clear() também
+    cadastram os registros ou esvaziam a coleção na biblioteca; as demais
+    alterações mudam só esta cópia. Para trocar a coleção inteira, atribua
+    uma lista (Biblioteca.livros = [...]).
+    """
+    
+    def __init__(self, biblioteca: 'Biblioteca', chave: str):
+        objetos = getattr(biblioteca, f'_{chave}_obj')
+        super().__init__(_RegistroLegado(biblioteca, chave, objeto) for objeto in objetos)
+        self._biblioteca = biblioteca
+        self._chave = chave
+    
+    def append(self, dados: dict) -> None:
+        objeto = self._biblioteca._incluir_legado(self._chave, dados)
+        super().append(_RegistroLegado(self._biblioteca, self._chave, objeto))
+    
+    def extend(self, registros) -> None:
+        for dados in registros:
+            self.append(dados)
+    
+    def clear(self) -> None:
+        self._biblioteca._substituir_colecao_legada(self._chave, [])
+        super().clear()
+
+
+class _AtributoLegado:
+    """
+    Atributo da API estática antiga, lido e atribuído tanto na classe
+    (Biblioteca.livros) quanto numa instância (Biblioteca().livros), como os
+    atributos de classe de antes; nos dois casos, sobre a instância
+    compartilhada (ver Biblioteca._legada).
+    """
+    
+    @staticmethod
+    def _biblioteca(dono) -> 'Biblioteca':
+        classe = dono if isinstance(dono, type) else type(dono)
+        return classe._legada()
+
+
+class _ColecaoLegada(_AtributoLegado):
+    """livros, usuarios e emprestimos: cópias no formato antigo (_ListaLegada); atribuir uma lista substitui a coleção."""
+    
+    def __init__(self, chave: str):
+        self.chave = chave
+    
+    def __get__(self, dono, tipo=None):
+        if dono is None:
+            return self
+        return _ListaLegada(self._biblioteca(dono), self.chave)
+    
+    def __set__(self, dono, valores: List[dict]) -> None:
+        self._biblioteca(dono)._substituir_colecao_legada(self.chave, valores)
+
+
+class _ContadorLegado(_AtributoLegado):
+    """contador_livros e contador_usuarios: o próximo ID (a API antiga guardava o próximo, não o último)."""
+    
+    def __init__(self, tipo: str):
+        self.tipo = tipo
+    
+    def __get__(self, dono, tipo=None):
+        if dono is None:
+            return self
+        return self._biblioteca(dono)._exportar_contadores()[self.tipo] + 1
+    
+    def __set__(self, dono, valor: int) -> None:
+        self._biblioteca(dono)._ajustar_contador_legado(self.tipo, valor - 1)
+
+
+class _AtributosLegados(type):
+    """
+    Metaclasse com os atributos da API antiga, para que o acesso pela classe
+    também passe pelos descritores (inclusive a atribuição, que sem ela
+    trocaria o próprio descritor). O acesso por instância usa os descritores
+    declarados em Biblioteca.
+    """
+    
+    livros = _ColecaoLegada('livros')
+    usuarios = _ColecaoLegada('usuarios')
+    emprestimos = _ColecaoLegada('emprestimos')
+    contador_livros = _ContadorLegado('livro')
+    contador_usuarios = _ContadorLegado('usuario')
+
+
+class Biblioteca(metaclass=_AtributosLegados):
     """Sistema de gerenciamento de biblioteca."""
     
-    # Atributos de classe para compatibilidade com testes estáticos
-    livros: List[dict] = []
-    usuarios: List[dict] = []
-    emprestimos: List[dict] = []
-    contador_livros: int = 1
-    contador_usuarios: int = 1
+    # Instância compartilhada por trás da API estática antiga (criada no
+    # primeiro uso) e a trava que impede duas threads de criá-la
+    _instancia_legada: Optional['Biblioteca'] = None
+    _trava_legada = threading.Lock()
+    
+    # Atributos da API antiga também acessíveis por instância, como antes
+    livros = _ColecaoLegada('livros')
+    usuarios = _ColecaoLegada('usuarios')
+    emprestimos = _ColecaoLegada('emprestimos')
+    contador_livros = _ContadorLegado('livro')
+    contador_usuarios = _ContadorLegado('usuario')
     
-    def __init__(self, arquivo_dados: str = 'biblioteca.json'):
+    def __init__(self, arquivo_dados: str = 'biblioteca.json',
+                 usar_diario: bool = False, limite_diario: int = 1000,
+                 armazenamento: Optional[Armazenamento] = None,
+                 concorrente: bool = False, confirmacao_em_grupo: bool = False,
+                 latencia_confirmacao: float = 0.005, tamanho_lote_confirmacao: int = 64,
+                 metricas: bool = False):
         self.arquivo = arquivo_dados
+        # Fechada, a biblioteca ainda responde consultas, mas recusa alterações
+        self._fechada = False
+        
+        # Métricas por operação (chamadas, erros e latências); desligadas,
+        # cada método instrumentado custa apenas a consulta deste atributo
+        self._metricas: Optional[RegistroMetricas] = RegistroMetricas() if metricas else None
+        
+        # Modo concorrente: leituras em paralelo e escritas exclusivas,
+        # protegidas por uma trava de leitura/escrita
+        self._trava: Optional[TravaLeituraEscrita] = TravaLeituraEscrita() if concorrente else None
+        
+        # Confirmação em grupo: as alterações entram numa fila sob a trava de
+        # escrita e cada chamador, já sem a trava, espera uma gravação que
+        # atende todas as alterações próximas de uma só vez
+        self._confirmacao: Optional[ConfirmacaoEmGrupo] = None
+        if confirmacao_em_grupo:
+            if not concorrente:
+                raise ValueError("A confirmação em grupo exige concorrente=True.")
+            self._confirmacao = ConfirmacaoEmGrupo(
+                self._gravar_fila, latencia_confirmacao, tamanho_lote_confirmacao
+            )
+        self._fila_gravacao: List[dict] = []
+        self._trava_fila = threading.Lock()
+        self._aguardando_gravacao = threading.local()
+        
+        # Mecanismo de persistência: escolhido pela extensão do arquivo
+        # (.db/.sqlite usam SQLite) quando não for informado explicitamente.
+        # Com usar_diario, cada operação acrescenta um registro ao arquivo
+        # '<arquivo>.diario' em vez de regravar o arquivo inteiro.
+        if armazenamento is None:
+            armazenamento = criar_armazenamento(arquivo_dados, usar_diario, limite_diario)
+        self._armazenamento = armazenamento
         self._livros_obj: List[Livro] = []
         self._usuarios_obj: List[Usuario] = []
         self._emprestimos_obj: List[Emprestimo] = []
         
-        # Resetar contadores ao criar nova instância
-        Livro.resetar_contador()
-        Usuario.resetar_contador()
-        Emprestimo.resetar_contador()
+        # Índices em memória para buscas O(1)
+        self._livros_por_id: Dict[int, Livro] = {}
+        self._livros_por_isbn: Dict[str, Livro] = {}
+        self._usuarios_por_id: Dict[int, Usuario] = {}
+        self._usuarios_por_email: Dict[str, Usuario] = {}
+        self._emprestimos_por_id: Dict[int, Emprestimo] = {}
+        
+        # IDs em ordem, para a paginação por cursor de iterar_*()
+        self._ids_livros = IndiceOrdenado()
+        self._ids_usuarios = IndiceOrdenado()
+        self._ids_emprestimos = IndiceOrdenado()
+        
+        # Índices secundários ordenados de livros: (ano, id) e (autor normalizado, id)
+        self._livros_por_ano = IndiceOrdenado()
+        self._livros_por_autor = IndiceOrdenado()
+        
+        # Índices de empréstimos por usuário e por livro, e dos que estão em
+        # aberto (dicionários usados como conjuntos ordenados por ID)
+        self._emprestimos_por_usuario: Dict[int, List[Emprestimo]] = {}
+        self._emprestimos_por_livro: Dict[int, List[Emprestimo]] = {}
+        self._emprestimos_ativos: Dict[int, Emprestimo] = {}
+        self._ativos_por_usuario: Dict[int, Dict[int, Emprestimo]] = {}
+        self._ativo_por_livro: Dict[int, Emprestimo] = {}
+        
+        # Índice invertido de título e autor para buscar_livros()
+        self._indice_textual = IndiceInvertido()
+        
+        # Prazos dos empréstimos em aberto, para achar os atrasados sem varrer
+        # o histórico, e os callbacks avisados quando um empréstimo atrasa
+        self._indice_vencimentos = IndiceVencimentos()
+        self._callbacks_atraso: List[Callable[[Emprestimo], None]] = []
+        
+        # Reservas: fila FIFO por livro (as canceladas saem da fila só quando
+        # chegam à frente) e, por usuário, as reservas em espera por livro_id
+        self._reservas_obj: List[Reserva] = []
+        self._reservas_por_id: Dict[int, Reserva] = {}
+        self._fila_por_livro: Dict[int, Deque[Reserva]] = {}
+        self._reservas_por_usuario: Dict[int, Dict[int, Reserva]] = {}
+        
+        # Estado dos lotes abertos com lote()
+        self._profundidade_lote = 0
+        self._registros_pendentes: List[dict] = []
+        self._desfazer: List[tuple] = []
+        # Muda sempre que o estado volta atrás (lote desfeito) ou é trocado
+        # (nova carga): quem acompanha o estado de forma incremental, como a
+        # análise de empréstimos, sabe que precisa refazer tudo
+        self._geracao = 0
+        # Muda a cada nova carga (listas trocadas): um lote aberto antes dela
+        # não tem como desfazer os índices entrada a entrada
+        self._cargas = 0
+        
+        # Último ID usado por tipo de entidade, próprio desta instância: várias
+        # bibliotecas no mesmo processo não compartilham a numeração
+        self._contadores: Dict[str, int] = dict.fromkeys(TIPOS_ENTIDADE, 0)
+        
+        # Instantâneos vivos e, enquanto houver algum, o histórico dos
+        # atributos alterados: (objeto, atributo) -> ([versões], [valores
+        # anteriores]), em ordem de versão
+        self._versao = 0
+        self._instantaneos: 'weakref.WeakSet[Instantaneo]' = weakref.WeakSet()
+        self._historico: Dict[Tuple[object, str], Tuple[List[int], List[object]]] = {}
+        self._entradas_historico = 0
+        self._limite_historico = _PODA_MINIMA_HISTORICO
+        self._trava_instantaneos = threading.Lock()
     
     # ==================== MÉTODOS ESTÁTICOS (para testes antigos) ====================
     
+    # A API estática antiga é um adaptador sobre uma instância compartilhada:
+    # as mesmas validações, índices e IDs da API de objetos, sem gravar nada
+    # por conta própria (a persistência é feita por salvarDados).
+    
+    @classmethod
+    def _legada(cls) -> 'Biblioteca':
+        """Instância compartilhada pelos métodos e atributos estáticos."""
+        if cls._instancia_legada is None:
+            with cls._trava_legada:
+                if cls._instancia_legada is None:
+                    cls._instancia_legada = cls(armazenamento=ArmazenamentoNulo(), concorrente=True)
+        return cls._instancia_legada
+    
     @staticmethod
     def adicionarLivro(titulo: str, autor: str, isbn: str, ano: int) -> bool:
         """Adiciona um livro usando método estático."""
-        if not titulo or not autor or not isbn:
-            return False
-        
-        if len(isbn) not in [10, 13]:
-            return False
-        
-        for livro in Biblioteca.livros:
-            if livro['isbn'] == isbn:
-                return False
-        
-        livro = {
-            'id': Biblioteca.contador_livros,
-            'titulo': titulo,
-            'autor': autor,
-            'isbn': isbn,
-            'ano': ano,
-            'disponivel': True
-        }
-        
-        Biblioteca.livros.append(livro)
-        Biblioteca.contador_livros += 1
-        return True
+        return Biblioteca._legada().adicionar_livro(titulo, autor, isbn, ano)
     
     @staticmethod
     def cadastrarUsuario(nome: str, email: str, telefone: str) -> bool:
         """Cadastra um usuário usando método estático."""
-        if not nome or '@' not in email:
-            return False
-        
-        for usuario in Biblioteca.usuarios:
-            if usuario['email'] == email:
-                return False
-        
-        usuario = {
-            'id': Biblioteca.contador_usuarios,
-            'nome': nome,
-            'email': email,
-            'telefone': telefone,
-            'ativo': True
-        }
-        
-        Biblioteca.usuarios.append(usuario)
-        Biblioteca.contador_usuarios += 1
-        return True
+        return Biblioteca._legada().cadastrar_usuario(nome, email, telefone)
     
     @staticmethod
     def realizarEmprestimo(usuario_id: int, livro_id: int) -> bool:
         """Realiza um empréstimo usando método estático."""
-        usuario = None
-        livro = None
-        
-        for u in Biblioteca.usuarios:
-            if u['id'] == usuario_id:
-                usuario = u
-                break
-        
-        if not usuario:
-            return False
-        
-        for l in Biblioteca.livros:
-            if l['id'] == livro_id:
-                livro = l
-                break
-        
-        if not livro:
-            return False
-        
-        if not livro['disponivel']:
-            return False
-        
-        emprestimo = {
-            'id': len(Biblioteca.emprestimos) + 1,
-            'usuario_id': usuario_id,
-            'livro_id': livro_id,
-            'devolvido': False,
-            'data_emprestimo': datetime.now().isoformat()
-        }
-        
-        Biblioteca.emprestimos.append(emprestimo)
-        livro['disponivel'] = False
-        return True
+        return Biblioteca._legada().realizar_emprestimo(usuario_id, livro_id)
     
     @staticmethod
     def devolverLivro(emprestimo_id: int) -> bool:
         """Devolve um livro usando método estático."""
-        emprestimo = None
-        
-        for emp in Biblioteca.emprestimos:
-            if emp['id'] == emprestimo_id:
-                emprestimo = emp
-                break
-        
-        if not emprestimo:
-            return False
-        
-        if emprestimo['devolvido']:
-            return False
-        
-        for livro in Biblioteca.livros:
-            if livro['id'] == emprestimo['livro_id']:
-                livro['disponivel'] = True
-                break
-        
-        emprestimo['devolvido'] = True
-        return True
+        return Biblioteca._legada().devolver_livro(emprestimo_id)
     
     @staticmethod
-    def salvarDados() -> None:
-        """Salva dados usando método estático."""
-        dados = {
-            'livros': Biblioteca.livros,
-            'usuarios': Biblioteca.usuarios,
-            'emprestimos': Biblioteca.emprestimos,
-            'contador_livros': Biblioteca.contador_livros,
-            'contador_usuarios': Biblioteca.contador_usuarios
-        }
-        with open('biblioteca.json', 'w', encoding='utf-8') as f:
-            json.dump(dados, f, indent=2, ensure_ascii=False)
+    def salvarDados(arquivo: str = 'biblioteca.json') -> None:
+        """Salva dados usando método estático (no armazenamento escolhido pela extensão)."""
+        armazenamento = criar_armazenamento(arquivo)
+        try:
+            Biblioteca._legada()._salvar_em(armazenamento)
+        finally:
+            armazenamento.fechar()
     
     @staticmethod
-    def carregarDados() -> None:
+    def carregarDados(arquivo: str = 'biblioteca.json') -> None:
         """Carrega dados usando método estático."""
-        if not os.path.exists('biblioteca.json'):
+        if not os.path.exists(arquivo):
             return
         
-        with open('biblioteca.json', 'r', encoding='utf-8') as f:
-            dados = json.load(f)
-            Biblioteca.livros = dados.get('livros', [])
-            Biblioteca.usuarios = dados.get('usuarios', [])
-            Biblioteca.emprestimos = dados.get('emprestimos', [])
-            Biblioteca.contador_livros = dados.get('contador_livros', 1)
-            Biblioteca.contador_usuarios = dados.get('contador_usuarios', 1)
+        armazenamento = criar_armazenamento(arquivo)
+        try:
+            Biblioteca._legada()._carregar_de(armazenamento)
+        finally:
+            armazenamento.fechar()
+    
+    @escrita
+    def _incluir_legado(self, chave: str, dados: dict) -> Union[Livro, Usuario, Emprestimo]:
+        """Cadastra um registro no formato da API antiga (sem 'id', recebe o próximo)."""
+        tipo, classe = _COLECOES_LEGADAS[chave]
+        dados = dict(dados)
+        if dados.get('id') is None:
+            dados['id'] = self._contadores[tipo] + 1
+        elif int(dados['id']) in getattr(self, f'_{chave}_por_id'):
+            raise ValueError(f"Já existe um registro com o ID {dados['id']} em {chave}.")
+        objeto = classe.from_dict(dados)
+        getattr(self, f'_registrar_{tipo}')(objeto)
+        self._registrar_alteracao(tipo, objeto)
+        return objeto
+    
+    @escrita
+    def _alterar_registro_legado(self, chave: str, objeto, campo: str, valor) -> None:
+        """Altera um campo pelo registro da API antiga, como a alteração direta de antes."""
+        if getattr(self, f'_{chave}_por_id').get(objeto.id) is not objeto:
+            raise ValueError(f"O registro {objeto.id} não pertence mais a {chave}.")
+        self._guardar_atributo(objeto, campo)
+        setattr(objeto, campo, bool(valor))
+        self._registrar_alteracao(_COLECOES_LEGADAS[chave][0], objeto)
+    
+    @escrita
+    def _substituir_colecao_legada(self, chave: str, valores: List[dict]) -> None:
+        """Troca uma coleção inteira, refazendo os índices."""
+        estado = self._exportar_estado()
+        estado[chave] = [dict(valor) for valor in valores]
+        self._limpar_dados()
+        with self._indexacao_em_massa():
+            self._carregar_estado(estado)
+    
+    @escrita
+    def _ajustar_contador_legado(self, tipo: str, valor: int) -> None:
+        """Define o último ID usado de um tipo de entidade."""
+        contadores = self._exportar_contadores()
+        contadores[tipo] = valor
+        self._definir_contadores(contadores)
+    
+    @leitura
+    def _salvar_em(self, armazenamento: Armazenamento) -> None:
+        """Grava o estado completo em outro armazenamento."""
+        armazenamento.salvar(self)
+    
+    @escrita
+    def _carregar_de(self, armazenamento: Armazenamento) -> None:
+        """Substitui o estado pelo gravado em outro armazenamento."""
+        self._limpar_dados()
+        with self._indexacao_em_massa():
+            armazenamento.carregar(self)
     
     # ==================== MÉTODOS DE INSTÂNCIA (POO) ====================
     
+    def _novo_id(self, tipo: str) -> int:
+        """Reserva o próximo ID de um tipo de entidade nesta biblioteca."""
+        self._contadores[tipo] += 1
+        return self._contadores[tipo]
+    
+    def _acompanhar_id(self, tipo: str, id: int) -> None:
+        """Garante que o contador não fique atrás de um ID já existente."""
+        if id > self._contadores[tipo]:
+            self._contadores[tipo] = id
+    
+    def _registrar_livro(self, livro: Livro) -> None:
+        """Adiciona o livro à lista e aos índices."""
+        self._acompanhar_id('livro', livro.id)
+        self._livros_obj.append(livro)
+        self._indexar_livro(livro)
+    
+    def _registrar_usuario(self, usuario: Usuario) -> None:
+        """Adiciona o usuário à lista e aos índices."""
+        self._acompanhar_id('usuario', usuario.id)
+        self._usuarios_obj.append(usuario)
+        self._indexar_usuario(usuario)
+    
+    def _registrar_emprestimo(self, emprestimo: Emprestimo) -> None:
+        """Adiciona o empréstimo à lista e aos índices."""
+        self._acompanhar_id('emprestimo', emprestimo.id)
+        self._emprestimos_obj.append(emprestimo)
+        self._indexar_emprestimo(emprestimo)
+    
+    def _registrar_reserva(self, reserva: Reserva) -> None:
+        """Adiciona a reserva à lista e aos índices."""
+        self._acompanhar_id('reserva', reserva.id)
+        self._reservas_obj.append(reserva)
+        self._indexar_reserva(reserva)
+    
+    def _indexar_livro(self, livro: Livro) -> None:
+        """Registra o livro nos índices por ID, ISBN, ano e autor."""
+        self._livros_por_id[livro.id] = livro
+        self._livros_por_isbn[livro.isbn] = livro
+        self._ids_livros.inserir(livro.id)
+        self._livros_por_ano.inserir((livro.ano, livro.id))
+        self._livros_por_autor.inserir((normalizar(livro.autor), livro.id))
+        self._indice_textual.adicionar(livro.id, livro.titulo, livro.autor)
+    
+    def _indexar_usuario(self, usuario: Usuario) -> None:
+        """Registra o usuário nos índices por ID e email."""
+        self._usuarios_por_id[usuario.id] = usuario
+        self._usuarios_por_email[usuario.email] = usuario
+        self._ids_usuarios.inserir(usuario.id)
+    
+    def _indexar_emprestimo(self, emprestimo: Emprestimo) -> None:
+        """Registra o empréstimo nos índices por ID, usuário, livro e situação."""
+        self._emprestimos_por_id[emprestimo.id] = emprestimo
+        self._ids_emprestimos.inserir(emprestimo.id)
+        self._emprestimos_por_usuario.setdefault(emprestimo.usuario_id, []).append(emprestimo)
+        self._emprestimos_por_livro.setdefault(emprestimo.livro_id, []).append(emprestimo)
+        if not emprestimo.devolvido:
+            self._ativar_emprestimo(emprestimo)
+    
+    def _ativar_emprestimo(self, emprestimo: Emprestimo) -> None:
+        """Registra um empréstimo nos índices de empréstimos em aberto."""
+        self._emprestimos_ativos[emprestimo.id] = emprestimo
+        self._ativos_por_usuario.setdefault(emprestimo.usuario_id, {})[emprestimo.id] = emprestimo
+        self._ativo_por_livro[emprestimo.livro_id] = emprestimo
+        vencimento = emprestimo._vencimento()
+        if vencimento is not None:
+            self._indice_vencimentos.adicionar(emprestimo.id, vencimento)
+    
+    def _indexar_reserva(self, reserva: Reserva) -> None:
+        """Registra a reserva no índice por ID e, se em espera, na fila do livro e nas do usuário."""
+        self._reservas_por_id[reserva.id] = reserva
+        if reserva.aguardando:
+            self._fila_por_livro.setdefault(reserva.livro_id, deque()).append(reserva)
+            self._reservas_por_usuario.setdefault(reserva.usuario_id, {})[reserva.livro_id] = reserva
+    
+    def _desindexar_livro(self, livro: Livro) -> None:
+        """Retira o livro de todos os índices (lote desfeito)."""
+        del self._livros_por_id[livro.id]
+        if self._livros_por_isbn.get(livro.isbn) is livro:
+            del self._livros_por_isbn[livro.isbn]
+        self._ids_livros.remover(livro.id)
+        self._livros_por_ano.remover((livro.ano, livro.id))
+        self._livros_por_autor.remover((normalizar(livro.autor), livro.id))
+        self._indice_textual.remover(livro.id)
+    
+    def _desindexar_usuario(self, usuario: Usuario) -> None:
+        """Retira o usuário de todos os índices (lote desfeito)."""
+        del self._usuarios_por_id[usuario.id]
+        if self._usuarios_por_email.get(usuario.email) is usuario:
+            del self._usuarios_por_email[usuario.email]
+        self._ids_usuarios.remover(usuario.id)
+    
+    def _desindexar_emprestimo(self, emprestimo: Emprestimo) -> None:
+        """Retira o empréstimo de todos os índices (lote desfeito)."""
+        del self._emprestimos_por_id[emprestimo.id]
+        self._ids_emprestimos.remover(emprestimo.id)
+        for indice, chave in ((self._emprestimos_por_usuario, emprestimo.usuario_id),
+                              (self._emprestimos_por_livro, emprestimo.livro_id)):
+            lista = indice[chave]
+            # Desfeitos do último para o primeiro, em geral é o fim da lista
+            if lista[-1] is emprestimo:
+                lista.pop()
+            else:
+                lista.remove(emprestimo)
+            if not lista:
+                del indice[chave]
+        self._desativar_emprestimo(emprestimo)
+    
+    def _desindexar_reserva(self, reserva: Reserva) -> None:
+        """Retira a reserva de todos os índices (lote desfeito)."""
+        del self._reservas_por_id[reserva.id]
+        fila = self._fila_por_livro.get(reserva.livro_id)
+        # Se não está no fim da fila, já foi retirada dela ao ser atendida
+        if fila and fila[-1] is reserva:
+            fila.pop()
+            if not fila:
+                del self._fila_por_livro[reserva.livro_id]
+        self._desativar_reserva(reserva)
+    
+    def _reativar_reservas(self, reservas: List[Reserva]) -> None:
+        """Devolve às filas e às do usuário, em ordem de reserva, reservas que voltaram a esperar."""
+        por_livro: Dict[int, List[Reserva]] = {}
+        for reserva in reservas:
+            por_livro.setdefault(reserva.livro_id, []).append(reserva)
+            self._reservas_por_usuario.setdefault(reserva.usuario_id, {})[reserva.livro_id] = reserva
+        for livro_id, voltaram in por_livro.items():
+            fila = {r.id: r for r in self._fila_por_livro.get(livro_id, ()) if r.aguardando}
+            fila.update((reserva.id, reserva) for reserva in voltaram)
+            self._fila_por_livro[livro_id] = deque(sorted(fila.values(), key=lambda r: r.id))
+        for usuario_id in {reserva.usuario_id for reserva in reservas}:
+            do_usuario = self._reservas_por_usuario[usuario_id]
+            self._reservas_por_usuario[usuario_id] = dict(sorted(do_usuario.items(), key=lambda item: item[1].id))
+    
+    def _desativar_reserva(self, reserva: Reserva) -> None:
+        """Retira uma reserva atendida ou cancelada das reservas em espera do usuário."""
+        do_usuario = self._reservas_por_usuario.get(reserva.usuario_id)
+        if do_usuario is not None and do_usuario.get(reserva.livro_id) is reserva:
+            del do_usuario[reserva.livro_id]
+            if not do_usuario:
+                del self._reservas_por_usuario[reserva.usuario_id]
+    
+    def _proxima_reserva(self, livro_id: int) -> Optional[Reserva]:
+        """Retira da fila do livro a primeira reserva ainda em espera. O(1) amortizado."""
+        fila = self._fila_por_livro.get(livro_id)
+        while fila:
+            reserva = fila.popleft()
+            if reserva.aguardando:
+                if not fila:
+                    del self._fila_por_livro[livro_id]
+                return reserva
+        self._fila_por_livro.pop(livro_id, None)
+        return None
+    
+    def _desativar_emprestimo(self, emprestimo: Emprestimo) -> None:
+        """Retira um empréstimo devolvido dos índices de empréstimos em aberto."""
+        self._emprestimos_ativos.pop(emprestimo.id, None)
+        self._indice_vencimentos.remover(emprestimo.id)
+        ativos_do_usuario = self._ativos_por_usuario.get(emprestimo.usuario_id)
+        if ativos_do_usuario is not None:
+            ativos_do_usuario.pop(emprestimo.id, None)
+            if not ativos_do_usuario:
+                del self._ativos_por_usuario[emprestimo.usuario_id]
+        if self._ativo_por_livro.get(emprestimo.livro_id) is emprestimo:
+            del self._ativo_por_livro[emprestimo.livro_id]
+    
+    def _limpar_indices(self) -> None:
+        """Esvazia todos os índices."""
+        self._livros_por_id.clear()
+        self._livros_por_isbn.clear()
+        self._indice_textual.limpar()
+        self._usuarios_por_id.clear()
+        self._usuarios_por_email.clear()
+        self._emprestimos_por_id.clear()
+        self._ids_livros.limpar()
+        self._ids_usuarios.limpar()
+        self._ids_emprestimos.limpar()
+        self._livros_por_ano.limpar()
+        self._livros_por_autor.limpar()
+        self._emprestimos_por_usuario.clear()
+        self._emprestimos_por_livro.clear()
+        self._emprestimos_ativos.clear()
+        self._ativos_por_usuario.clear()
+        self._ativo_por_livro.clear()
+        self._indice_vencimentos.limpar()
+        self._reservas_por_id.clear()
+        self._fila_por_livro.clear()
+        self._reservas_por_usuario.clear()
+    
+    def _reconstruir_indices(self) -> None:
+        """Reconstrói todos os índices a partir das listas."""
+        self._limpar_indices()
+        with self._indexacao_em_massa():
+            for livro in self._livros_obj:
+                self._indexar_livro(livro)
+            for usuario in self._usuarios_obj:
+                self._indexar_usuario(usuario)
+            for emprestimo in self._emprestimos_obj:
+                self._indexar_emprestimo(emprestimo)
+            for reserva in self._reservas_obj:
+                self._indexar_reserva(reserva)
+    
+    @contextmanager
+    def _indexacao_em_massa(self) -> Iterator[None]:
+        """Adia a ordenação dos índices ordenados e da busca para o fim do bloco (cargas e reconstruções)."""
+        ordenados = (self._ids_livros, self._ids_usuarios, self._ids_emprestimos,
+                     self._livros_por_ano, self._livros_por_autor, self._indice_textual)
+        for indice in ordenados:
+            indice.adiar_ordenacao()
+        try:
+            yield
+        finally:
+            for indice in ordenados:
+                indice.ordenar()
+    
+    def _limpar_dados(self) -> None:
+        """Esvazia as coleções e todos os índices."""
+        # Listas novas, e não clear(): as antigas podem estar em instantâneos
+        self._livros_obj = []
+        self._usuarios_obj = []
+        self._emprestimos_obj = []
+        self._reservas_obj = []
+        self._geracao += 1
+        self._cargas += 1
+        self._limpar_indices()
+    
+    # ==================== LOTES (TRANSAÇÕES) ====================
+    
+    @contextmanager
+    def lote(self) -> Iterator['Biblioteca']:
+        """
+        Agrupa várias operações em uma única gravação.
+        
+        As alterações feitas dentro do bloco são salvas uma só vez na saída.
+        Se o bloco lançar uma exceção, o estado em memória volta ao que era
+        na entrada e nada é gravado. Lotes podem ser aninhados. No modo
+        concorrente, o lote mantém a trava de escrita do início ao fim.
+        """
+        if self._trava:
+            self._trava.adquirir_escrita()
+        try:
+            self._verificar_escrita()
+            ponto = self._criar_ponto_restauracao()
+            self._profundidade_lote += 1
+            try:
+                yield self
+            except BaseException:
+                self._restaurar(ponto)
+                raise
+            finally:
+                self._profundidade_lote -= 1
+            
+            if self._profundidade_lote == 0 and self._registros_pendentes:
+                registros = self._registros_pendentes
+                self._registros_pendentes = []
+                self._desfazer.clear()
+                self._persistir(registros)
+        finally:
+            if self._trava:
+                self._trava.liberar_escrita()
+                if not self._trava.escrevendo():
+                    self._depois_da_escrita()
+    
+    def _em_lote(self) -> bool:
+        """Indica se há um lote aberto."""
+        return self._profundidade_lote > 0
+    
+    def _registrar_alteracao(self, tipo: str, objeto) -> None:
+        """Persiste a alteração, ou a adia para o fim do lote aberto."""
+        if not self._em_lote():
+            self._persistir([{'tipo': tipo, 'dados': objeto.to_dict()}])
+        elif self._armazenamento.incremental or not self._registros_pendentes:
+            # Um armazenamento que regrava tudo ignora os registros: basta um
+            # para marcar o lote como alterado, e o lote não cresce com eles
+            self._registros_pendentes.append({'tipo': tipo, 'dados': objeto.to_dict()})
+    
+    @medido
+    def _persistir(self, registros: List[dict]) -> None:
+        """Entrega as alterações ao armazenamento (ou à fila da confirmação em grupo)."""
+        if self._confirmacao is None:
+            self._armazenamento.gravar(self, registros)
+            return
+        
+        with self._trava_fila:
+            self._fila_gravacao.extend(registros)
+        self._aguardando_gravacao.pendente = True
+    
+    def _verificar_escrita(self) -> None:
+        """Chamado com a trava de escrita, antes de qualquer alteração."""
+        if self._fechada:
+            raise ErroBibliotecaFechada(f"A biblioteca '{self.arquivo}' está fechada.")
+    
+    def fechar(self, fechar_armazenamento: bool = True) -> None:
+        """
+        Fecha a biblioteca: espera as alterações em andamento, grava as que
+        aguardam a confirmação em grupo e passa a recusar novas alterações com
+        ErroBibliotecaFechada. Assim, uma referência antiga a uma biblioteca
+        recarregada em outra instância não sobrescreve o arquivo.
+        """
+        if self._trava:
+            self._trava.adquirir_escrita()
+        try:
+            if self._em_lote():
+                raise RuntimeError("Não é possível fechar a biblioteca com um lote aberto.")
+            if self._fechada:
+                return
+            self._fechada = True
+            if self._confirmacao is not None:
+                self._gravar_fila()
+            if fechar_armazenamento:
+                self._armazenamento.fechar()
+        finally:
+            if self._trava:
+                self._trava.liberar_escrita()
+    
+    def _depois_da_escrita(self) -> None:
+        """Chamado ao liberar a trava de escrita: espera a gravação em grupo."""
+        if getattr(self._aguardando_gravacao, 'pendente', False):
+            self._aguardando_gravacao.pendente = False
+            self._confirmacao.confirmar()
+    
+    @medido
+    def _gravar_fila(self) -> None:
+        """Grava de uma vez todas as alterações enfileiradas."""
+        with self._trava_fila:
+            registros = self._fila_gravacao
+            self._fila_gravacao = []
+        if not registros:
+            return
+        
+        self._trava.adquirir_leitura()
+        try:
+            self._armazenamento.gravar(self, registros)
+        except BaseException:
+            # Devolve os registros à fila para a próxima tentativa
+            with self._trava_fila:
+                self._fila_gravacao[:0] = registros
+            raise
+        finally:
+            self._trava.liberar_leitura()
+    
+    @medido
+    @escrita
+    def compactar_diario(self) -> None:
+        """Incorpora o diário (se houver) em um novo arquivo de dados completo."""
+        self._armazenamento.compactar(self)
+    
+    @medido
+    @leitura
+    def exportar_catalogo(self, arquivo: str) -> int:
+        """
+        Gera o arquivo de catálogo somente leitura (ver sistema.catalogo_mmap)
+        com os livros atuais. Retorna a quantidade de livros exportados.
+        """
+        return gravar_catalogo(self, arquivo)
+    
+    def metricas(self) -> Dict[str, dict]:
+        """
+        Instantâneo das métricas por operação: chamadas, erros (exceções ou
+        retorno False) e histograma de latência. Vazio se desligadas.
+        """
+        return self._metricas.instantaneo() if self._metricas else {}
+    
+    def exposicao_metricas(self) -> str:
+        """Métricas no formato de texto do Prometheus (vazio se desligadas)."""
+        return self._metricas.exposicao() if self._metricas else ''
+    
+    def _guardar_atributo(self, objeto: object, atributo: str) -> None:
+        """
+        Guarda o valor atual de um atributo antes de alterá-lo: para desfazê-lo
+        se o lote falhar e para os instantâneos que ainda o enxergam.
+        """
+        self._versionar(objeto, atributo)
+        if self._em_lote():
+            self._desfazer.append((objeto, atributo, getattr(objeto, atributo)))
+    
+    # ==================== INSTANTÂNEOS ====================
+    
+    @medido
+    @leitura
+    def instantaneo(self) -> Instantaneo:
+        """
+        Visão somente leitura e consistente do estado atual, em O(1).
+        
+        As escritas seguintes não aparecem no instantâneo e não esperam por
+        quem o estiver lendo (ver sistema.instantaneo). Enquanto houver
+        instantâneos vivos, cada alteração de atributo guarda o valor
+        anterior; o que nenhum instantâneo vivo enxerga mais é podado de
+        tempos em tempos, e tudo é descartado quando o último deixa de existir.
+        """
+        with self._trava_instantaneos:
+            versao = self._versao
+            self._versao += 1
+            colecoes = {
+                'livros': (self._livros_obj, len(self._livros_obj)),
+                'usuarios': (self._usuarios_obj, len(self._usuarios_obj)),
+                'emprestimos': (self._emprestimos_obj, len(self._emprestimos_obj)),
+                'reservas': (self._reservas_obj, len(self._reservas_obj)),
+            }
+            instantaneo = Instantaneo(self, versao, colecoes, self._exportar_contadores())
+            self._instantaneos.add(instantaneo)
+        return instantaneo
+    
+    snapshot = instantaneo
+    
+    def _versionar(self, objeto: object, atributo: str) -> None:
+        """Guarda o valor atual do atributo para os instantâneos vivos (chamado antes de alterá-lo)."""
+        if not self._instantaneos:
+            if self._historico:
+                self._historico.clear()
+                self._entradas_historico = 0
+            return
+        historico = self._historico.get((objeto, atributo))
+        if historico is None:
+            historico = self._historico[(objeto, atributo)] = ([], [])
+        versoes, valores = historico
+        # Basta a primeira alteração desde o último instantâneo
+        if not versoes or versoes[-1] < self._versao:
+            # O valor entra antes da versão: quem lê sem trava nunca encontra
+            # uma versão sem o valor correspondente
+            valores.append(getattr(objeto, atributo))
+            versoes.append(self._versao)
+            self._entradas_historico += 1
+            if self._entradas_historico > self._limite_historico:
+                self._podar_historico()
+    
+    def _podar_historico(self) -> None:
+        """
+        Descarta as versões que nenhum instantâneo vivo enxerga: as de número
+        até o do instantâneo vivo mais antigo. O(histórico), e o próximo corte
+        só acontece quando o histórico dobrar: O(1) amortizado por alteração.
+        """
+        with self._trava_instantaneos:
+            vivos = [instantaneo.versao for instantaneo in self._instantaneos]
+        mais_antigo = min(vivos, default=self._versao)
+        entradas = 0
+        for chave, (versoes, valores) in list(self._historico.items()):
+            inicio = bisect.bisect_right(versoes, mais_antigo)
+            if inicio == len(versoes):
+                del self._historico[chave]
+            elif inicio:
+                # Listas novas, e não del: um leitor pode estar nas antigas
+                self._historico[chave] = (versoes[inicio:], valores[inicio:])
+                entradas += len(versoes) - inicio
+            else:
+                entradas += len(versoes)
+        self._entradas_historico = entradas
+        self._limite_historico = max(_PODA_MINIMA_HISTORICO, 2 * entradas)
+    
+    def _valor_na_versao(self, objeto: object, atributo: str, versao: int) -> object:
+        """Valor do atributo visto pelo instantâneo de `versao`. O(log h) para h versões do atributo."""
+        # O valor atual é lido antes do histórico: quem escreve registra o
+        # valor anterior antes de alterar o atributo
+        valor = getattr(objeto, atributo)
+        historico = self._historico.get((objeto, atributo))
+        if historico is not None:
+            versoes, valores = historico
+            posicao = bisect.bisect_right(versoes, versao)
+            if posicao < len(versoes):
+                return valores[posicao]
+        return valor
+    
+    def _criar_ponto_restauracao(self) -> tuple:
+        """Captura o necessário para restaurar o estado atual."""
+        return (
+            len(self._livros_obj),
+            len(self._usuarios_obj),
+            len(self._emprestimos_obj),
+            len(self._reservas_obj),
+            len(self._desfazer),
+            len(self._registros_pendentes),
+            dict(self._contadores),
+            self._cargas,
+        )
+    
+    def _restaurar(self, ponto: tuple) -> None:
+        """
+        Desfaz as alterações feitas desde o ponto de restauração.
+        
+        Os índices são desfeitos entrada a entrada, pelo que foi acrescentado
+        e pelo registro de desfazer: o custo é o do lote, não o do acervo. Só
+        uma nova carga dentro do lote obriga a reconstruí-los por inteiro.
+        """
+        (n_livros, n_usuarios, n_emprestimos, n_reservas, n_desfazer, n_pendentes, contadores, cargas) = ponto
+        self._contadores = dict(contadores)
+        self._geracao += 1
+        incremental = cargas == self._cargas
+        
+        del self._registros_pendentes[n_pendentes:]
+        
+        if incremental:
+            for reserva in reversed(self._reservas_obj[n_reservas:]):
+                self._desindexar_reserva(reserva)
+            for emprestimo in reversed(self._emprestimos_obj[n_emprestimos:]):
+                self._desindexar_emprestimo(emprestimo)
+            for usuario in reversed(self._usuarios_obj[n_usuarios:]):
+                self._desindexar_usuario(usuario)
+            for livro in reversed(self._livros_obj[n_livros:]):
+                self._desindexar_livro(livro)
+        
+        alterados = {}
+        while len(self._desfazer) > n_desfazer:
+            objeto, atributo, valor = self._desfazer.pop()
+            self._versionar(objeto, atributo)
+            setattr(objeto, atributo, valor)
+            alterados[id(objeto)] = objeto
+        
+        if self._instantaneos:
+            # Cópia na escrita: as listas atuais continuam com os instantâneos
+            self._livros_obj = self._livros_obj[:n_livros]
+            self._usuarios_obj = self._usuarios_obj[:n_usuarios]
+            self._emprestimos_obj = self._emprestimos_obj[:n_emprestimos]
+            self._reservas_obj = self._reservas_obj[:n_reservas]
+        else:
+            del self._livros_obj[n_livros:]
+            del self._usuarios_obj[n_usuarios:]
+            del self._emprestimos_obj[n_emprestimos:]
+            del self._reservas_obj[n_reservas:]
+        
+        if not incremental:
+            self._reconstruir_indices()
+            return
+        # Os objetos acrescentados no lote já saíram dos índices; nos que já
+        # existiam, só a situação de empréstimos e reservas é indexada
+        reservas = []
+        for objeto in alterados.values():
+            if isinstance(objeto, Emprestimo) and self._emprestimos_por_id.get(objeto.id) is objeto:
+                if objeto.devolvido:
+                    self._desativar_emprestimo(objeto)
+                else:
+                    self._ativar_emprestimo(objeto)
+            elif isinstance(objeto, Reserva) and self._reservas_por_id.get(objeto.id) is objeto:
+                if objeto.aguardando:
+                    reservas.append(objeto)
+                else:
+                    self._desativar_reserva(objeto)
+        self._reativar_reservas(reservas)
+    
     def _validar_livro(self, titulo: str, autor: str, isbn: str) -> bool:
         """Valida os dados de um livro."""
         if not titulo or not titulo.strip():
@@ -311,7 +1282,7 @@ class Biblioteca:
     
     def _isbn_ja_existe(self, isbn: str) -> bool:
         """Verifica se o ISBN já está cadastrado."""
-        return any(livro.isbn == isbn for livro in self._livros_obj)
+        return isbn in self._livros_por_isbn
     
     def _validar_usuario(self, nome: str, email: str) -> bool:
         """Valida os dados de um usuário."""
@@ -323,40 +1294,94 @@ class Biblioteca:
     
     def _email_ja_existe(self, email: str) -> bool:
         """Verifica se o email já está cadastrado."""
-        return any(usuario.email == email for usuario in self._usuarios_obj)
+        return email in self._usuarios_por_email
     
+    @medido
+    @escrita
     def adicionar_livro(self, titulo: str, autor: str, isbn: str, ano: int) -> bool:
         """Adiciona um novo livro à biblioteca."""
         if not self._validar_livro(titulo, autor, isbn):
             return False
         
+        ano = _converter_ano(ano)
+        if ano is None:
+            return False
+        
         if self._isbn_ja_existe(isbn):
             return False
         
-        livro = Livro(titulo, autor, isbn, ano)
-        self._livros_obj.append(livro)
-        self._salvar_dados()
+        livro = Livro(titulo, autor, isbn, ano, id=self._novo_id('livro'))
+        self._registrar_livro(livro)
+        self._registrar_alteracao('livro', livro)
         return True
     
+    @medido
+    @leitura
     def buscar_livro_por_id(self, livro_id: int) -> Optional[Livro]:
         """Busca um livro pelo ID."""
-        livro_id = int(livro_id)
-        for livro in self._livros_obj:
-            if livro.id == livro_id:
-                return livro
-        return None
+        return self._livros_por_id.get(int(livro_id))
     
+    @medido
+    @leitura
+    def buscar_livros(self, consulta: str, limite: int = 10) -> List[Livro]:
+        """
+        Busca livros pelo título e pelo autor.
+        
+        Ignora acentos e maiúsculas; retorna os livros que contêm todos os
+        termos da consulta, do mais para o menos relevante.
+        """
+        return [self._livros_por_id[livro_id] for livro_id in self._indice_textual.buscar(consulta, limite)]
+    
+    @medido
+    @leitura
+    def livros_por_ano(self, inicio: int, fim: int, limite: Optional[int] = None) -> List[Livro]:
+        """
+        Livros publicados de `inicio` a `fim` (inclusive), por ano e ID.
+        O(log n + k) sobre o índice ordenado por ano.
+        """
+        chaves = self._livros_por_ano.intervalo((int(inicio),), (int(fim) + 1,), limite)
+        return [self._livros_por_id[livro_id] for _, livro_id in chaves]
+    
+    @medido
+    @leitura
+    def livros_por_autor(self, prefixo: str, limite: Optional[int] = None) -> List[Livro]:
+        """
+        Livros cujo autor começa com `prefixo` (sem acentos nem caixa), por
+        autor e ID. O(log n + k) sobre o índice ordenado por autor.
+        """
+        prefixo = normalizar(prefixo.strip())
+        chaves = self._livros_por_autor.intervalo((prefixo,), (prefixo + _MAIOR_CARACTERE,), limite)
+        return [self._livros_por_id[livro_id] for _, livro_id in chaves]
+    
+    def iterar_livros(self, apos_id: Optional[int] = None, limite: Optional[int] = None,
+                      ordem: str = 'crescente') -> Iterator[Livro]:
+        """
+        Percorre os livros em ordem de ID a partir do cursor `apos_id`
+        (exclusivo), parando após `limite` livros se informado.
+        
+        Os livros são buscados em páginas de O(log n + página), cada uma sob a
+        trava de leitura: percorrer tudo não bloqueia as escritas. Para
+        paginar uma API, passe o ID do último item como `apos_id` seguinte.
+        """
+        return self._iterar(self._ids_livros, self._livros_por_id, apos_id, limite, ordem)
+    
+    @medido
     def listar_livros(self) -> None:
         """Lista todos os livros cadastrados."""
-        if not self._livros_obj:
-            print("Nenhum livro cadastrado.")
-            return
-        
-        print("\n=== LIVROS CADASTRADOS ===")
-        for livro in self._livros_obj:
+        vazio = True
+        for livro in self.iterar_livros():
+            if vazio:
+                print("\n=== LIVROS CADASTRADOS ===")
+                vazio = False
             print(livro)
-        print()
+        
+        if vazio:
+            print("Nenhum livro cadastrado.")
+        else:
+            print()
     
+    @medido
+    @escrita
     def cadastrar_usuario(self, nome: str, email: str, telefone: str) -> bool:
         """Cadastra um novo usuário na biblioteca."""
         if not self._validar_usuario(nome, email):
@@ -365,30 +1390,39 @@ class Biblioteca:
         if self._email_ja_existe(email):
             return False
         
-        usuario = Usuario(nome, email, telefone)
-        self._usuarios_obj.append(usuario)
-        self._salvar_dados()
+        usuario = Usuario(nome, email, telefone, id=self._novo_id('usuario'))
+        self._registrar_usuario(usuario)
+        self._registrar_alteracao('usuario', usuario)
         return True
     
+    @medido
+    @leitura
     def buscar_usuario_por_id(self, usuario_id: int) -> Optional[Usuario]:
         """Busca um usuário pelo ID."""
-        usuario_id = int(usuario_id)
-        for usuario in self._usuarios_obj:
-            if usuario.id == usuario_id:
-                return usuario
-        return None
+        return self._usuarios_por_id.get(int(usuario_id))
     
+    def iterar_usuarios(self, apos_id: Optional[int] = None, limite: Optional[int] = None,
+                        ordem: str = 'crescente') -> Iterator[Usuario]:
+        """Percorre os usuários em ordem de ID (ver iterar_livros)."""
+        return self._iterar(self._ids_usuarios, self._usuarios_por_id, apos_id, limite, ordem)
+    
+    @medido
     def listar_usuarios(self) -> None:
         """Lista todos os usuários cadastrados."""
-        if not self._usuarios_obj:
-            print("Nenhum usuário cadastrado.")
-            return
-        
-        print("\n=== USUÁRIOS CADASTRADOS ===")
-        for usuario in self._usuarios_obj:
+        vazio = True
+        for usuario in self.iterar_usuarios():
+            if vazio:
+                print("\n=== USUÁRIOS CADASTRADOS ===")
+                vazio = False
             print(usuario)
-        print()
+        
+        if vazio:
+            print("Nenhum usuário cadastrado.")
+        else:
+            print()
     
+    @medido
+    @escrita
     def realizar_emprestimo(self, usuario_id: int, livro_id: int) -> bool:
         """Realiza um empréstimo de livro."""
         usuario_id = int(usuario_id)
@@ -402,25 +1436,30 @@ class Biblioteca:
         if not livro:
             return False
         
+        # Verificação e empréstimo acontecem sob a mesma trava de escrita
         if not livro.disponivel:
             return False
         
-        emprestimo = Emprestimo(usuario_id, livro_id)
-        self._emprestimos_obj.append(emprestimo)
-        livro.emprestar()
-        self._salvar_dados()
+        self._emprestar(usuario_id, livro)
         return True
     
+    def _emprestar(self, usuario_id: int, livro: Livro) -> Emprestimo:
+        """Registra o empréstimo de um livro disponível."""
+        emprestimo = Emprestimo(usuario_id, livro.id, id=self._novo_id('emprestimo'))
+        self._registrar_emprestimo(emprestimo)
+        self._guardar_atributo(livro, 'disponivel')
+        livro.emprestar()
+        self._registrar_alteracao('emprestimo', emprestimo)
+        return emprestimo
+    
+    @medido
+    @escrita
     def devolver_livro(self, emprestimo_id: int) -> bool:
-        """Realiza a devolução de um livro emprestado."""
-        emprestimo_id = int(emprestimo_id)
-        
-        emprestimo = None
-        for emp in self._emprestimos_obj:
-            if emp.id == emprestimo_id:
-                emprestimo = emp
-                break
-        
+        """
+        Realiza a devolução de um livro emprestado. Se houver reservas, o
+        livro é emprestado na hora ao primeiro da fila.
+        """
+        emprestimo = self._emprestimos_por_id.get(int(emprestimo_id))
         if not emprestimo:
             return False
         
@@ -429,90 +1468,439 @@ class Biblioteca:
         
         livro = self.buscar_livro_por_id(emprestimo.livro_id)
         if livro:
+            self._guardar_atributo(livro, 'disponivel')
             livro.devolver()
         
+        self._guardar_atributo(emprestimo, 'devolvido')
+        self._guardar_atributo(emprestimo, 'data_devolucao')
         emprestimo.realizar_devolucao()
-        self._salvar_dados()
+        self._desativar_emprestimo(emprestimo)
+        self._registrar_alteracao('emprestimo', emprestimo)
+        
+        if livro:
+            reserva = self._proxima_reserva(livro.id)
+            if reserva is not None:
+                self._atender_reserva(reserva, livro)
         return True
     
+    def _atender_reserva(self, reserva: Reserva, livro: Livro) -> None:
+        """Empresta o livro devolvido ao titular da reserva."""
+        self._guardar_atributo(reserva, 'situacao')
+        reserva.situacao = Reserva.ATENDIDA
+        self._desativar_reserva(reserva)
+        self._registrar_alteracao('reserva', reserva)
+        self._emprestar(reserva.usuario_id, livro)
+    
+    # ==================== RESERVAS ====================
+    
+    @medido
+    @escrita
+    def reservar_livro(self, usuario_id: int, livro_id: int) -> bool:
+        """
+        Entra na fila de espera de um livro emprestado. Falha se o livro
+        estiver disponível (basta emprestá-lo) ou se o usuário já estiver com
+        ele ou já o tiver reservado.
+        """
+        usuario_id = int(usuario_id)
+        livro_id = int(livro_id)
+        
+        if usuario_id not in self._usuarios_por_id:
+            return False
+        
+        livro = self._livros_por_id.get(livro_id)
+        if not livro or livro.disponivel:
+            return False
+        
+        atual = self._ativo_por_livro.get(livro_id)
+        if atual is not None and atual.usuario_id == usuario_id:
+            return False
+        
+        if livro_id in self._reservas_por_usuario.get(usuario_id, {}):
+            return False
+        
+        reserva = Reserva(usuario_id, livro_id, id=self._novo_id('reserva'))
+        self._registrar_reserva(reserva)
+        self._registrar_alteracao('reserva', reserva)
+        return True
+    
+    @medido
+    @escrita
+    def cancelar_reserva(self, reserva_id: int) -> bool:
+        """Cancela uma reserva em espera (ela sai da fila em O(1))."""
+        reserva = self._reservas_por_id.get(int(reserva_id))
+        if not reserva or not reserva.aguardando:
+            return False
+        
+        self._guardar_atributo(reserva, 'situacao')
+        reserva.situacao = Reserva.CANCELADA
+        self._desativar_reserva(reserva)
+        self._registrar_alteracao('reserva', reserva)
+        return True
+    
+    @medido
+    @leitura
+    def reservas_do_usuario(self, usuario_id: int) -> List[Reserva]:
+        """Reservas em espera de um usuário, em ordem de reserva."""
+        return list(self._reservas_por_usuario.get(int(usuario_id), {}).values())
+    
+    @medido
+    @leitura
+    def fila_do_livro(self, livro_id: int) -> List[Reserva]:
+        """Reservas em espera de um livro, na ordem em que serão atendidas."""
+        return [reserva for reserva in self._fila_por_livro.get(int(livro_id), ()) if reserva.aguardando]
+    
+    @medido
+    @leitura
+    def emprestimos_do_usuario(self, usuario_id: int, apenas_ativos: bool = False) -> List[Emprestimo]:
+        """Retorna os empréstimos de um usuário (ou só os em aberto)."""
+        usuario_id = int(usuario_id)
+        if apenas_ativos:
+            return list(self._ativos_por_usuario.get(usuario_id, {}).values())
+        return list(self._emprestimos_por_usuario.get(usuario_id, []))
+    
+    @medido
+    @leitura
+    def emprestimos_do_livro(self, livro_id: int) -> List[Emprestimo]:
+        """Retorna o histórico de empréstimos de um livro."""
+        return list(self._emprestimos_por_livro.get(int(livro_id), []))
+    
+    @medido
+    @leitura
+    def emprestimo_atual_do_livro(self, livro_id: int) -> Optional[Emprestimo]:
+        """Retorna o empréstimo em aberto de um livro, se houver."""
+        return self._ativo_por_livro.get(int(livro_id))
+    
+    @medido
+    @leitura
+    def emprestimos_ativos(self) -> List[Emprestimo]:
+        """Retorna todos os empréstimos em aberto."""
+        return list(self._emprestimos_ativos.values())
+    
+    @medido
+    @leitura
+    def emprestimos_atrasados(self, ate: Union[datetime, str, None] = None) -> List[Emprestimo]:
+        """
+        Empréstimos em aberto cujo prazo venceu antes de `ate` (padrão: agora),
+        do mais antigo ao mais recente. Usa o índice de vencimentos: O(k log n)
+        para k atrasados, sem varrer o histórico.
+        """
+        limite = _momento_para_inteiro(ate)
+        return [self._emprestimos_por_id[emprestimo_id]
+                for emprestimo_id in self._indice_vencimentos.atrasados(limite)]
+    
+    def ao_atrasar(self, callback: Callable[[Emprestimo], None]) -> None:
+        """
+        Registra um callback chamado (uma vez por empréstimo) quando
+        verificar_atrasos() encontra um empréstimo que passou do prazo.
+        """
+        self._callbacks_atraso.append(callback)
+    
+    def verificar_atrasos(self, agora: Union[datetime, str, None] = None) -> List[Emprestimo]:
+        """
+        Avisa os callbacks de ao_atrasar() sobre os empréstimos que venceram
+        desde a última verificação e os retorna. Feita para ser chamada
+        periodicamente (ver vencimentos.AgendadorAtrasos); os callbacks rodam
+        fora da trava, então podem usar a biblioteca livremente.
+        """
+        novos = self._retirar_vencidos(_momento_para_inteiro(agora))
+        for emprestimo in novos:
+            for callback in self._callbacks_atraso:
+                callback(emprestimo)
+        return novos
+    
+    @escrita
+    def _retirar_vencidos(self, limite: int) -> List[Emprestimo]:
+        return [self._emprestimos_por_id[emprestimo_id]
+                for emprestimo_id in self._indice_vencimentos.vencidos(limite)]
+    
+    def iterar_emprestimos(self, apos_id: Optional[int] = None, limite: Optional[int] = None,
+                           ordem: str = 'crescente') -> Iterator[Emprestimo]:
+        """Percorre os empréstimos em ordem de ID (ver iterar_livros)."""
+        return self._iterar(self._ids_emprestimos, self._emprestimos_por_id, apos_id, limite, ordem)
+    
+    @medido
     def listar_emprestimos(self) -> None:
         """Lista todos os empréstimos."""
-        if not self._emprestimos_obj:
-            print("Nenhum empréstimo registrado.")
-            return
-        
-        for emprestimo in self._emprestimos_obj:
+        vazio = True
+        for emprestimo in self.iterar_emprestimos():
+            vazio = False
             usuario = self.buscar_usuario_por_id(emprestimo.usuario_id)
             livro = self.buscar_livro_por_id(emprestimo.livro_id)
             
             if usuario and livro:
                 status = "Devolvido" if emprestimo.devolvido else "Em andamento"
                 print(f"[{emprestimo.id}] {usuario.nome} - {livro.titulo} | {status}")
+        
+        if vazio:
+            print("Nenhum empréstimo registrado.")
     
-    def _salvar_dados(self) -> None:
-        """Salva todos os dados no arquivo JSON."""
-        dados = {
+    def _iterar(self, ids: IndiceOrdenado, objetos: dict, apos_id: Optional[int],
+                limite: Optional[int], ordem: str) -> Iterator:
+        """Gera os objetos de um índice de IDs, página a página."""
+        if ordem not in ORDENS:
+            raise ValueError(f"Ordem desconhecida: use {' ou '.join(ORDENS)}.")
+        if limite is not None and limite < 0:
+            raise ValueError("O limite não pode ser negativo.")
+        
+        def gerar():
+            cursor = None if apos_id is None else int(apos_id)
+            restante = limite
+            while restante is None or restante > 0:
+                tamanho = TAMANHO_PAGINA if restante is None else min(restante, TAMANHO_PAGINA)
+                pagina = self._pagina(ids, objetos, cursor, tamanho, ordem == 'decrescente')
+                yield from pagina
+                if len(pagina) < tamanho:
+                    return
+                cursor = pagina[-1].id
+                if restante is not None:
+                    restante -= len(pagina)
+        return gerar()
+    
+    @leitura
+    def _pagina(self, ids: IndiceOrdenado, objetos: dict, apos_id: Optional[int],
+                tamanho: int, decrescente: bool) -> list:
+        return [objetos[id] for id in ids.pagina(apos_id, tamanho, decrescente)]
+    
+    # ==================== IMPORTAÇÃO EM MASSA ====================
+    
+    @medido
+    @escrita
+    def importar_livros(self, fonte: Fonte, formato: Optional[str] = None) -> dict:
+        """
+        Importa livros de um arquivo CSV ou JSON Lines.
+        
+        As linhas são lidas em fluxo e validadas com as mesmas regras de
+        adicionar_livro. Se o armazenamento regrava tudo (JSON, binário), os
+        dados são gravados uma única vez ao final; se é incremental (SQLite,
+        diário), a cada TAMANHO_BLOCO_IMPORTACAO linhas, e uma falha de
+        leitura no meio mantém os blocos já gravados. Em ambos os casos, a
+        memória usada além das entidades importadas não depende do tamanho
+        do arquivo (exceto dentro de um lote aberto pelo chamador).
+        Retorna {'importados': n, 'erros': [(linha, motivo), ...]}.
+        """
+        return self._importar(fonte, formato, self._importar_livro)
+    
+    @medido
+    @escrita
+    def importar_usuarios(self, fonte: Fonte, formato: Optional[str] = None) -> dict:
+        """
+        Importa usuários de um arquivo CSV ou JSON Lines.
+        
+        Segue as mesmas regras de cadastrar_usuario e retorna o mesmo
+        relatório de importar_livros.
+        """
+        return self._importar(fonte, formato, self._importar_usuario)
+    
+    def _importar(self, fonte: Fonte, formato: Optional[str], importar_registro) -> dict:
+        """Aplica importar_registro a cada linha da fonte, em lotes (ver importar_livros)."""
+        importados = 0
+        erros: List[Tuple[int, str]] = []
+        bloco = TAMANHO_BLOCO_IMPORTACAO if self._armazenamento.incremental else None
+        
+        registros = ler_registros(fonte, formato)
+        while True:
+            with self.lote():
+                for linha, dados, erro in registros:
+                    if erro is None:
+                        erro = importar_registro(dados)
+                    if erro is None:
+                        importados += 1
+                    else:
+                        erros.append((linha, erro))
+                    if bloco is not None and len(self._registros_pendentes) >= bloco:
+                        break
+                else:
+                    break
+        
+        return {'importados': importados, 'erros': erros}
+    
+    def _importar_livro(self, dados: dict) -> Optional[str]:
+        """Adiciona um livro importado; retorna o motivo da rejeição, se houver."""
+        titulo = _texto_importado(dados.get('titulo'))
+        autor = _texto_importado(dados.get('autor'))
+        isbn = _texto_importado(dados.get('isbn'))
+        
+        if not self._validar_livro(titulo, autor, isbn):
+            return "Dados do livro inválidos"
+        if self._isbn_ja_existe(isbn):
+            return f"ISBN {isbn} já cadastrado"
+        ano = _converter_ano(dados.get('ano'))
+        if ano is None:
+            return "Ano inválido"
+        
+        livro = Livro(titulo, autor, isbn, ano, id=self._novo_id('livro'))
+        self._registrar_livro(livro)
+        self._registrar_alteracao('livro', livro)
+        return None
+    
+    def _importar_usuario(self, dados: dict) -> Optional[str]:
+        """Cadastra um usuário importado; retorna o motivo da rejeição, se houver."""
+        nome = _texto_importado(dados.get('nome'))
+        email = _texto_importado(dados.get('email'))
+        telefone = _texto_importado(dados.get('telefone'))
+        
+        if not self._validar_usuario(nome, email):
+            return "Dados do usuário inválidos"
+        if self._email_ja_existe(email):
+            return f"Email {email} já cadastrado"
+        
+        usuario = Usuario(nome, email, telefone, id=self._novo_id('usuario'))
+        self._registrar_usuario(usuario)
+        self._registrar_alteracao('usuario', usuario)
+        return None
+    
+    def _exportar_contadores(self) -> dict:
+        """Retorna os contadores de IDs atuais."""
+        return dict(self._contadores)
+    
+    def _exportar_estado(self) -> dict:
+        """Retorna o estado completo no formato do arquivo JSON."""
+        return {
             'livros': [livro.to_dict() for livro in self._livros_obj],
             'usuarios': [usuario.to_dict() for usuario in self._usuarios_obj],
             'emprestimos': [emp.to_dict() for emp in self._emprestimos_obj],
-            'contadores': {
-                'livro': Livro.contador_id,
-                'usuario': Usuario.contador_id,
-                'emprestimo': Emprestimo.contador_id
-            }
+            'reservas': [reserva.to_dict() for reserva in self._reservas_obj],
+            'contadores': self._exportar_contadores()
         }
+    
+    def _exportar_registros(self) -> Iterator[dict]:
+        """Percorre o estado completo como registros {'tipo': ..., 'dados': ...}."""
+        yield {'tipo': 'contadores', 'dados': self._exportar_contadores()}
+        for livro in self._livros_obj:
+            yield {'tipo': 'livro', 'dados': livro.to_dict()}
+        for usuario in self._usuarios_obj:
+            yield {'tipo': 'usuario', 'dados': usuario.to_dict()}
+        for emprestimo in self._emprestimos_obj:
+            yield {'tipo': 'emprestimo', 'dados': emprestimo.to_dict()}
+        for reserva in self._reservas_obj:
+            yield {'tipo': 'reserva', 'dados': reserva.to_dict()}
+    
+    def _definir_contadores(self, contadores: dict) -> None:
+        """Ajusta os contadores de IDs a partir de valores gravados."""
+        self._contadores = {tipo: contadores.get(tipo, 0) for tipo in TIPOS_ENTIDADE}
+    
+    def _carregar_estado(self, dados: dict) -> None:
+        """Registra as entidades de um estado no formato do arquivo JSON."""
+        contadores = dados.get('contadores', {})
+        if not contadores and 'contador_livros' in dados:
+            # Arquivo gravado pela API estática antiga, que guardava o próximo ID
+            contadores = {'livro': dados['contador_livros'] - 1,
+                          'usuario': dados.get('contador_usuarios', 1) - 1}
+        if contadores:
+            self._definir_contadores(contadores)
+        
+        for livro_data in dados.get('livros', []):
+            self._carregar_livro(livro_data)
+        
+        for usuario_data in dados.get('usuarios', []):
+            self._registrar_usuario(Usuario.from_dict(usuario_data))
         
-        with open(self.arquivo, 'w', encoding='utf-8') as f:
-            json.dump(dados, f, indent=2, ensure_ascii=False)
+        for emp_data in dados.get('emprestimos', []):
+            self._registrar_emprestimo(Emprestimo.from_dict(emp_data))
+        
+        for reserva_data in dados.get('reservas', []):
+            self._registrar_reserva(Reserva.from_dict(reserva_data))
     
-    def carregar_dados(self) -> None:
-        """Carrega os dados do arquivo JSON."""
-        if not os.path.exists(self.arquivo):
+    def _carregar_livro(self, dados: dict) -> None:
+        """
+        Registra um livro gravado. Um registro inválido, como o "ano": null que
+        versões antigas aceitavam, é relatado e ignorado sem impedir a carga.
+        """
+        try:
+            livro = Livro.from_dict(dados)
+        except ValueError as e:
+            print(f"Livro {dados.get('id')} ignorado ao carregar: {e}")
             return
+        self._registrar_livro(livro)
+    
+    def _carregar_tabelas(self, contadores: dict, livros: List[tuple], usuarios: List[tuple],
+                          emprestimos: List[tuple], reservas: List[tuple]) -> None:
+        """
+        Registra as entidades lidas como tuplas (ver formato_binario.ler_tabelas),
+        sem passar por dicionários nem reconverter as datas.
+        """
+        self._definir_contadores(contadores)
         
-        try:
-            with open(self.arquivo, 'r', encoding='utf-8') as f:
-                dados = json.load(f)
-            
-            contadores = dados.get('contadores', {})
-            if contadores:
-                Livro.contador_id = contadores.get('livro', 0)
-                Usuario.contador_id = contadores.get('usuario', 0)
-                Emprestimo.contador_id = contadores.get('emprestimo', 0)
-            
-            for livro_data in dados.get('livros', []):
-                livro = Livro(
-                    titulo=livro_data['titulo'],
-                    autor=livro_data['autor'],
-                    isbn=livro_data['isbn'],
-                    ano=livro_data['ano'],
-                    id=livro_data['id']
-                )
-                livro.disponivel = livro_data.get('disponivel', True)
-                self._livros_obj.append(livro)
-            
-            for usuario_data in dados.get('usuarios', []):
-                usuario = Usuario(
-                    nome=usuario_data['nome'],
-                    email=usuario_data['email'],
-                    telefone=usuario_data['telefone'],
-                    id=usuario_data['id']
-                )
-                self._usuarios_obj.append(usuario)
+        for id, titulo, autor, isbn, ano, disponivel in livros:
+            livro = Livro(titulo, autor, isbn, ano, id=id)
+            livro.disponivel = disponivel
+            self._registrar_livro(livro)
+        
+        for id, nome, email, telefone in usuarios:
+            self._registrar_usuario(Usuario(nome, email, telefone, id=id))
+        
+        for id, usuario_id, livro_id, devolvido, data_emprestimo, data_devolucao in emprestimos:
+            emprestimo = Emprestimo(usuario_id, livro_id, id=id)
+            emprestimo.devolvido = devolvido
+            emprestimo._data_emprestimo = data_emprestimo
+            emprestimo._data_devolucao = data_devolucao
+            self._registrar_emprestimo(emprestimo)
+        
+        for id, usuario_id, livro_id, situacao, data_reserva in reservas:
+            reserva = Reserva(usuario_id, livro_id, id=id)
+            reserva.situacao = situacao
+            reserva._data_reserva = data_reserva
+            self._registrar_reserva(reserva)
+    
+    @medido
+    @escrita
+    def _salvar_dados(self) -> None:
+        """Grava o estado completo no armazenamento."""
+        self._armazenamento.salvar(self)
+    
+    @medido
+    @escrita
+    def carregar_dados(self, progresso: Optional[Progresso] = None) -> None:
+        """
+        Carrega os dados do armazenamento, substituindo o estado atual.
+        
+        Se informado, progresso(processados, total) é chamado periodicamente
+        durante a leitura (em bytes para arquivos, em linhas para SQLite).
+        """
+        self._limpar_dados()
+        with self._indexacao_em_massa():
+            self._armazenamento.carregar(self, progresso)
+    
+    def _aplicar_registro(self, tipo: str, dados: dict) -> None:
+        """Insere ou atualiza uma entidade a partir de um registro gravado."""
+        if tipo == 'contadores':
+            self._definir_contadores(dados)
+        
+        elif tipo == 'livro':
+            livro = self._livros_por_id.get(dados['id'])
+            if livro is None:
+                self._carregar_livro(dados)
+            else:
+                livro.disponivel = dados.get('disponivel', True)
+        
+        elif tipo == 'usuario':
+            if dados['id'] not in self._usuarios_por_id:
+                self._registrar_usuario(Usuario.from_dict(dados))
+        
+        elif tipo == 'emprestimo':
+            emprestimo = self._emprestimos_por_id.get(dados['id'])
+            if emprestimo is None:
+                emprestimo = Emprestimo.from_dict(dados)
+                self._registrar_emprestimo(emprestimo)
+            else:
+                emprestimo.devolvido = dados.get('devolvido', False)
+                emprestimo.data_devolucao = dados.get('data_devolucao')
+                if emprestimo.devolvido:
+                    self._desativar_emprestimo(emprestimo)
             
-            for emp_data in dados.get('emprestimos', []):
-                emprestimo = Emprestimo(
-                    usuario_id=emp_data['usuario_id'],
-                    livro_id=emp_data['livro_id'],
-                    id=emp_data['id']
-                )
-                emprestimo.devolvido = emp_data.get('devolvido', False)
-                emprestimo.data_emprestimo = emp_data.get('data_emprestimo')
-                emprestimo.data_devolucao = emp_data.get('data_devolucao')
-                self._emprestimos_obj.append(emprestimo)
-        
-        except (json.JSONDecodeError, KeyError) as e:
-            print(f"Erro ao carregar dados: {e}")
+            # A disponibilidade do livro acompanha o último empréstimo
+            livro = self._livros_por_id.get(emprestimo.livro_id)
+            if livro:
+                livro.disponivel = emprestimo.devolvido
+        
+        elif tipo == 'reserva':
+            reserva = self._reservas_por_id.get(dados['id'])
+            if reserva is None:
+                self._registrar_reserva(Reserva.from_dict(dados))
+            else:
+                reserva.situacao = dados.get('situacao', Reserva.AGUARDANDO)
+                if not reserva.aguardando:
+                    self._desativar_reserva(reserva)
 
 
 def main():
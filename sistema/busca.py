@@ -0,0 +1,214 @@
+"""
+Busca Textual
+Índice invertido sobre título e autor dos livros, sem acentos e sem caixa
+"""
+
+import bisect
+import functools
+import heapq
+import math
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Peso de um termo encontrado no título em relação ao autor
+PESO_TITULO = 2.0
+PESO_AUTOR = 1.0
+
+# Termos com ao menos tantas postagens também as guardam ordenadas por peso,
+# para a consulta parar nas de maior impacto; os mais raros são pontuados
+# por inteiro, e saem baratos
+MINIMO_IMPACTOS = 512
+
+_PALAVRA = re.compile(r'\w+')
+
+
+def normalizar(texto: str) -> str:
+    """Remove acentos e converte para minúsculas ("Anéis" -> "aneis")."""
+    if texto.isascii():
+        # Texto ASCII não tem acentos a decompor
+        return texto.lower()
+    decomposto = unicodedata.normalize('NFKD', texto)
+    sem_acentos = ''.join(c for c in decomposto if not unicodedata.combining(c))
+    return sem_acentos.casefold()
+
+
+def tokenizar(texto: str) -> List[str]:
+    """Divide o texto normalizado em termos."""
+    return _PALAVRA.findall(normalizar(texto))
+
+
+@functools.lru_cache(maxsize=4096)
+def _termos_em_cache(texto: str) -> Tuple[str, ...]:
+    """tokenizar() com cache: autores se repetem muito entre os livros."""
+    return tuple(tokenizar(texto))
+
+
+class IndiceInvertido:
+    """
+    Índice invertido termo -> {livro_id: peso}.
+
+    Os livros são adicionados um a um (sem reconstruir o índice). A consulta
+    soma, para cada livro, o peso dos termos encontrados ponderado pelo IDF
+    do termo, e devolve os mais relevantes primeiro.
+
+    Os termos comuns ("amor", "silva") têm também as postagens agrupadas por
+    peso, com os IDs em ordem: a consulta percorre os grupos do maior peso
+    para o menor e para assim que nenhum livro restante puder entrar entre
+    os `limite` melhores, em vez de pontuar todas as postagens.
+    """
+
+    def __init__(self):
+        self._postagens: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._termos_por_livro: Dict[int, Set[str]] = {}
+        # termo -> {peso: [livro_id, ...] em ordem}, só dos termos comuns
+        self._impactos: Dict[str, Dict[float, List[int]]] = {}
+        self._adiado = False
+
+    def __len__(self) -> int:
+        return len(self._termos_por_livro)
+
+    def adicionar(self, livro_id: int, titulo: str, autor: str) -> None:
+        """Indexa (ou reindexa) os termos de título e autor de um livro."""
+        if livro_id in self._termos_por_livro:
+            self.remover(livro_id)
+
+        pesos: Dict[str, float] = defaultdict(float)
+        for termo in tokenizar(titulo):
+            pesos[termo] += PESO_TITULO
+        for termo in _termos_em_cache(autor):
+            pesos[termo] += PESO_AUTOR
+
+        for termo, peso in pesos.items():
+            postagem = self._postagens[termo]
+            postagem[livro_id] = peso
+            if self._adiado:
+                continue
+            impactos = self._impactos.get(termo)
+            if impactos is not None:
+                ids = impactos.setdefault(peso, [])
+                if not ids or livro_id > ids[-1]:
+                    ids.append(livro_id)
+                else:
+                    bisect.insort(ids, livro_id)
+            elif len(postagem) >= MINIMO_IMPACTOS:
+                self._agrupar_por_impacto(termo)
+        self._termos_por_livro[livro_id] = set(pesos)
+
+    def remover(self, livro_id: int) -> None:
+        """Retira um livro do índice."""
+        for termo in self._termos_por_livro.pop(livro_id, ()):
+            postagem = self._postagens[termo]
+            peso = postagem.pop(livro_id, None)
+            impactos = self._impactos.get(termo)
+            if impactos is not None:
+                if len(postagem) < MINIMO_IMPACTOS // 2:
+                    del self._impactos[termo]
+                elif peso in impactos:
+                    ids = impactos[peso]
+                    posicao = bisect.bisect_left(ids, livro_id)
+                    if posicao < len(ids) and ids[posicao] == livro_id:
+                        del ids[posicao]
+                    if not ids:
+                        del impactos[peso]
+            if not postagem:
+                del self._postagens[termo]
+
+    def limpar(self) -> None:
+        """Esvazia o índice."""
+        self._postagens.clear()
+        self._termos_por_livro.clear()
+        self._impactos.clear()
+
+    def adiar_ordenacao(self) -> None:
+        """Deixa de agrupar as postagens por peso até ordenar() (cargas e reconstruções)."""
+        self._adiado = True
+        self._impactos.clear()
+
+    def ordenar(self) -> None:
+        """Agrupa de uma vez por peso as postagens dos termos comuns."""
+        self._adiado = False
+        for termo, postagem in self._postagens.items():
+            if len(postagem) >= MINIMO_IMPACTOS:
+                self._agrupar_por_impacto(termo)
+
+    def _agrupar_por_impacto(self, termo: str) -> None:
+        """Agrupa por peso, com os IDs em ordem, as postagens de um termo."""
+        impactos: Dict[float, List[int]] = {}
+        for livro_id, peso in self._postagens[termo].items():
+            impactos.setdefault(peso, []).append(livro_id)
+        for ids in impactos.values():
+            ids.sort()
+        self._impactos[termo] = impactos
+
+    def _peso_maximo(self, termo: str) -> float:
+        """Maior peso do termo em um livro."""
+        impactos = self._impactos.get(termo)
+        return max(impactos) if impactos else max(self._postagens[termo].values())
+
+    def buscar(self, consulta: str, limite: int = 10) -> List[int]:
+        """
+        Retorna os IDs dos livros que contêm todos os termos da consulta,
+        do mais para o menos relevante.
+        """
+        return [livro_id for _, livro_id in self.buscar_pontuados(consulta, limite)]
+
+    def buscar_pontuados(self, consulta: str, limite: int = 10) -> List[Tuple[float, int]]:
+        """Como buscar(), mas retorna pares (pontuação, livro_id)."""
+        # Do termo mais raro para o mais comum
+        termos = sorted(set(tokenizar(consulta)), key=lambda termo: len(self._postagens.get(termo, ())))
+        if not termos or limite <= 0:
+            return []
+
+        postagens = [self._postagens.get(termo) for termo in termos]
+        if not all(postagens):
+            return []
+
+        total = len(self._termos_por_livro)
+        idfs = [math.log(1 + total / len(postagem)) for postagem in postagens]
+        impactos = self._impactos.get(termos[0])
+        if impactos is not None:
+            tetos = [idf * self._peso_maximo(termo) for idf, termo in zip(idfs[1:], termos[1:])]
+            return self._melhores_por_impacto(impactos, idfs, tetos, postagens, limite)
+
+        # Interseção a partir da menor lista de postagens
+        candidatos: Iterable[int] = postagens[0]
+        for postagem in postagens[1:]:
+            candidatos = [livro_id for livro_id in candidatos if livro_id in postagem]
+
+        pontuados = (
+            (sum(idf * postagem[livro_id] for idf, postagem in zip(idfs, postagens)), -livro_id)
+            for livro_id in candidatos
+        )
+        return [(pontuacao, -menos_id) for pontuacao, menos_id in heapq.nlargest(limite, pontuados)]
+
+    @staticmethod
+    def _melhores_por_impacto(impactos: Dict[float, List[int]], idfs: List[float], tetos: List[float],
+                              postagens: List[Dict[int, float]], limite: int) -> List[Tuple[float, int]]:
+        """
+        Os `limite` melhores, percorrendo as postagens do termo mais raro do
+        maior peso para o menor. `tetos` limita a contribuição de cada um dos
+        outros termos; somado na mesma ordem da pontuação, o teto de um grupo
+        nunca fica abaixo da pontuação de um livro dele.
+        """
+        melhores: List[Tuple[float, int]] = []  # heap mínimo de (pontuação, -livro_id)
+        outras = postagens[1:]
+        for peso in sorted(impactos, reverse=True):
+            teto = idfs[0] * peso
+            for parcela in tetos:
+                teto += parcela
+            if len(melhores) == limite and teto < melhores[0][0]:
+                break
+            for livro_id in impactos[peso]:
+                if len(melhores) == limite and (teto, -livro_id) < melhores[0]:
+                    # IDs crescentes: nenhum dos seguintes deste peso entra
+                    break
+                if not all(livro_id in postagem for postagem in outras):
+                    continue
+                item = (sum(idf * postagem[livro_id] for idf, postagem in zip(idfs, postagens)), -livro_id)
+                if len(melhores) < limite:
+                    heapq.heappush(melhores, item)
+                elif item > melhores[0]:
+                    heapq.heapreplace(melhores, item)
+        return [(pontuacao, -menos_id) for pontuacao, menos_id in sorted(melhores, reverse=True)]
@@ -0,0 +1,171 @@
+"""
+Catálogo Somente Leitura
+Arquivo de catálogo mapeado em memória (mmap) para processos que só consultam
+livros: abrir é instantâneo e cada busca decodifica apenas o registro tocado,
+com as páginas compartilhadas entre processos pelo cache do sistema
+
+Estrutura (inteiros little-endian):
+    cabeçalho    MAGICO, versão, quantidade de livros e posição de cada seção
+    índice id    pares (id, posição do registro) ordenados pelo id
+    índice isbn  pares (hash do isbn, posição do registro) ordenados pelo hash
+    registros    id, ano, disponível e os textos prefixados pelo tamanho
+"""
+
+import hashlib
+import mmap
+import struct
+from typing import Iterator, List, Optional
+
+from sistema.gravacao import gravar_atomicamente
+
+MAGICO = b'BIBC'
+VERSAO = 1
+
+CABECALHO = struct.Struct('<4sHIQQQ')
+ENTRADA = struct.Struct('<qQ')
+REGISTRO = struct.Struct('<qi?')
+TAMANHO_TEXTO = struct.Struct('<I')
+
+
+class ErroCatalogo(ValueError):
+    """Arquivo de catálogo inválido ou de versão desconhecida."""
+
+
+def _hash_isbn(isbn: str) -> int:
+    """Hash estável (entre processos) de 64 bits com sinal do ISBN."""
+    return int.from_bytes(hashlib.blake2b(isbn.encode('utf-8'), digest_size=8).digest(), 'little', signed=True)
+
+
+def _registro(livro) -> bytes:
+    partes = [REGISTRO.pack(livro.id, int(livro.ano), livro.disponivel)]
+    for texto in (livro.titulo, livro.autor, livro.isbn):
+        codificado = texto.encode('utf-8')
+        partes.append(TAMANHO_TEXTO.pack(len(codificado)))
+        partes.append(codificado)
+    return b''.join(partes)
+
+
+def gravar_catalogo(biblioteca, arquivo: str) -> int:
+    """
+    Exporta os livros da biblioteca para um arquivo de catálogo (de forma
+    atômica). O catálogo é uma foto: alterações posteriores exigem nova
+    exportação. Retorna a quantidade de livros gravados.
+    """
+    livros = sorted(biblioteca._livros_obj, key=lambda livro: livro.id)
+    inicio_indice_id = CABECALHO.size
+    inicio_indice_isbn = inicio_indice_id + ENTRADA.size * len(livros)
+    inicio_registros = inicio_indice_isbn + ENTRADA.size * len(livros)
+
+    registros: List[bytes] = []
+    indice_id = []
+    indice_isbn = []
+    posicao = inicio_registros
+    for livro in livros:
+        registro = _registro(livro)
+        registros.append(registro)
+        indice_id.append(ENTRADA.pack(livro.id, posicao))
+        indice_isbn.append((_hash_isbn(livro.isbn), posicao))
+        posicao += len(registro)
+    indice_isbn.sort()
+
+    conteudo = b''.join([
+        CABECALHO.pack(MAGICO, VERSAO, len(livros), inicio_indice_id, inicio_indice_isbn, inicio_registros),
+        *indice_id,
+        *(ENTRADA.pack(chave, posicao) for chave, posicao in indice_isbn),
+        *registros,
+    ])
+    gravar_atomicamente(arquivo, lambda f: f.write(conteudo), binario=True)
+    return len(livros)
+
+
+class CatalogoSomenteLeitura:
+    """
+    Consulta de livros sobre um arquivo gerado por gravar_catalogo().
+
+    Nada é carregado na abertura: as buscas por ID e por ISBN fazem busca
+    binária nos índices direto no mapeamento, em O(log n), e decodificam só
+    o registro encontrado. Os livros são devolvidos como dicionários (no
+    formato de Livro.to_dict).
+    """
+
+    def __init__(self, arquivo: str):
+        self.arquivo = arquivo
+        with open(arquivo, 'rb') as f:
+            self._mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mapa) < CABECALHO.size:
+            self.fechar()
+            raise ErroCatalogo("Arquivo de catálogo truncado.")
+        (magico, versao, self._quantidade, self._indice_id,
+         self._indice_isbn, self._registros) = CABECALHO.unpack_from(self._mapa)
+        if magico != MAGICO or versao != VERSAO:
+            self.fechar()
+            raise ErroCatalogo("Arquivo não é um catálogo da biblioteca nesta versão.")
+
+    def __len__(self) -> int:
+        return self._quantidade
+
+    def _inferior(self, inicio_indice: int, chave: int) -> int:
+        """Primeira entrada do índice com chave >= `chave` (como bisect_left)."""
+        baixo, alto = 0, self._quantidade
+        while baixo < alto:
+            meio = (baixo + alto) // 2
+            if ENTRADA.unpack_from(self._mapa, inicio_indice + meio * ENTRADA.size)[0] < chave:
+                baixo = meio + 1
+            else:
+                alto = meio
+        return baixo
+
+    def _ler_registro(self, posicao: int) -> dict:
+        id, ano, disponivel = REGISTRO.unpack_from(self._mapa, posicao)
+        posicao += REGISTRO.size
+        textos = []
+        for _ in range(3):
+            (tamanho,) = TAMANHO_TEXTO.unpack_from(self._mapa, posicao)
+            posicao += TAMANHO_TEXTO.size
+            textos.append(self._mapa[posicao:posicao + tamanho].decode('utf-8'))
+            posicao += tamanho
+        titulo, autor, isbn = textos
+        return {'id': id, 'titulo': titulo, 'autor': autor, 'isbn': isbn, 'ano': ano, 'disponivel': disponivel}
+
+    def buscar_livro_por_id(self, livro_id: int) -> Optional[dict]:
+        """Busca um livro pelo ID."""
+        indice = self._inferior(self._indice_id, livro_id)
+        if indice == self._quantidade:
+            return None
+        chave, posicao = ENTRADA.unpack_from(self._mapa, self._indice_id + indice * ENTRADA.size)
+        return self._ler_registro(posicao) if chave == livro_id else None
+
+    def buscar_livro_por_isbn(self, isbn: str) -> Optional[dict]:
+        """Busca um livro pelo ISBN (colisões do hash são conferidas no registro)."""
+        chave = _hash_isbn(isbn)
+        indice = self._inferior(self._indice_isbn, chave)
+        while indice < self._quantidade:
+            encontrada, posicao = ENTRADA.unpack_from(self._mapa, self._indice_isbn + indice * ENTRADA.size)
+            if encontrada != chave:
+                break
+            livro = self._ler_registro(posicao)
+            if livro['isbn'] == isbn:
+                return livro
+            indice += 1
+        return None
+
+    def __iter__(self) -> Iterator[dict]:
+        """Percorre os livros em ordem de ID, decodificando um por vez."""
+        for indice in range(self._quantidade):
+            _, posicao = ENTRADA.unpack_from(self._mapa, self._indice_id + indice * ENTRADA.size)
+            yield self._ler_registro(posicao)
+
+    def listar_livros(self) -> List[dict]:
+        """Todos os livros, em ordem de ID."""
+        return list(self)
+
+    def fechar(self) -> None:
+        """Desfaz o mapeamento do arquivo."""
+        self._mapa.close()
+
+    def __enter__(self) -> 'CatalogoSomenteLeitura':
+        return self
+
+    def __exit__(self, *excecao) -> None:
+        self.fechar()
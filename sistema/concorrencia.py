@@ -0,0 +1,125 @@
+"""
+Concorrência
+Trava de leitura/escrita e decoradores para proteger os métodos da Biblioteca
+"""
+
+import functools
+import threading
+
+
+class TravaLeituraEscrita:
+    """
+    Trava de leitura/escrita com preferência para escritores.
+
+    Vários leitores podem entrar juntos; um escritor entra sozinho. Ambas as
+    travas são reentrantes na mesma thread, e quem escreve também pode ler.
+    Promover uma leitura para escrita não é permitido (causaria impasse).
+    """
+
+    def __init__(self):
+        self._condicao = threading.Condition(threading.Lock())
+        self._leitores = 0
+        self._escritor = None
+        self._profundidade_escrita = 0
+        self._escritores_esperando = 0
+        self._local = threading.local()
+
+    def _leituras(self) -> int:
+        return getattr(self._local, 'leituras', 0)
+
+    def adquirir_leitura(self) -> None:
+        leituras = self._leituras()
+        if leituras or self._escritor == threading.get_ident():
+            # Reentrada: a thread já lê ou já escreve
+            self._local.leituras = leituras + 1
+            return
+
+        with self._condicao:
+            while self._escritor is not None or self._escritores_esperando:
+                self._condicao.wait()
+            self._leitores += 1
+        self._local.leituras = 1
+
+    def liberar_leitura(self) -> None:
+        leituras = self._leituras() - 1
+        self._local.leituras = leituras
+        if leituras or self._escritor == threading.get_ident():
+            return
+
+        with self._condicao:
+            self._leitores -= 1
+            if self._leitores == 0:
+                self._condicao.notify_all()
+
+    def escrevendo(self) -> bool:
+        """Indica se a thread atual detém a trava de escrita."""
+        return self._escritor == threading.get_ident()
+
+    def adquirir_escrita(self) -> None:
+        eu = threading.get_ident()
+        if self._escritor == eu:
+            self._profundidade_escrita += 1
+            return
+        if self._leituras():
+            raise RuntimeError("Não é possível escrever enquanto a mesma thread está lendo.")
+
+        with self._condicao:
+            self._escritores_esperando += 1
+            try:
+                while self._escritor is not None or self._leitores:
+                    self._condicao.wait()
+            finally:
+                self._escritores_esperando -= 1
+            self._escritor = eu
+            self._profundidade_escrita = 1
+
+    def liberar_escrita(self) -> None:
+        self._profundidade_escrita -= 1
+        if self._profundidade_escrita:
+            return
+
+        with self._condicao:
+            self._escritor = None
+            self._condicao.notify_all()
+
+
+def leitura(metodo):
+    """Executa o método com a trava de leitura do objeto (se houver)."""
+    @functools.wraps(metodo)
+    def envoltorio(self, *args, **kwargs):
+        trava = self._trava
+        if trava is None:
+            return metodo(self, *args, **kwargs)
+        trava.adquirir_leitura()
+        try:
+            return metodo(self, *args, **kwargs)
+        finally:
+            trava.liberar_leitura()
+    return envoltorio
+
+
+def escrita(metodo):
+    """
+    Executa o método com a trava de escrita do objeto (se houver).
+
+    Já com a trava, chama self._verificar_escrita(), que pode recusar a
+    alteração antes de o método tocar no estado (objeto fechado, por exemplo).
+    Ao liberar a trava mais externa, chama self._depois_da_escrita(), onde o
+    objeto pode aguardar a gravação das alterações sem bloquear as demais threads.
+    """
+    @functools.wraps(metodo)
+    def envoltorio(self, *args, **kwargs):
+        trava = self._trava
+        if trava is None:
+            self._verificar_escrita()
+            return metodo(self, *args, **kwargs)
+        trava.adquirir_escrita()
+        try:
+            self._verificar_escrita()
+            resultado = metodo(self, *args, **kwargs)
+        finally:
+            trava.liberar_escrita()
+        if not trava.escrevendo():
+            self._depois_da_escrita()
+        return resultado
+    return envoltorio
@@ -1,6 +1,11 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 class Emprestimo:
+    # atributos fixos: sem __dict__ por instância, bem menor em memória;
+    # as datas ficam guardadas como número do dia (date.toordinal)
+    __slots__ = ('id', 'usuario_id', 'livro_id', '_data_emprestimo',
+                 '_data_devolucao', 'devolvido', '_data_devolucao_real')
+
     def __init__(self, id_emp, usuario_id, livro_id, data_emp=None):
         self.id = id_emp
         self.usuario_id = usuario_id
@@ -10,6 +15,38 @@ class Emprestimo:
         self.devolvido = False
         self.data_devolucao_real = None
 
+    @staticmethod
+    def _para_dia(data):
+        return date.fromisoformat(data).toordinal() if data else None
+
+    @staticmethod
+    def _para_texto(dia):
+        return date.fromordinal(dia).isoformat() if dia is not None else None
+
+    @property
+    def data_emprestimo(self):
+        return self._para_texto(self._data_emprestimo)
+
+    @data_emprestimo.setter
+    def data_emprestimo(self, valor):
+        self._data_emprestimo = self._para_dia(valor)
+
+    @property
+    def data_devolucao(self):
+        return self._para_texto(self._data_devolucao)
+
+    @data_devolucao.setter
+    def data_devolucao(self, valor):
+        self._data_devolucao = self._para_dia(valor)
+
+    @property
+    def data_devolucao_real(self):
+        return self._para_texto(self._data_devolucao_real)
+
+    @data_devolucao_real.setter
+    def data_devolucao_real(self, valor):
+        self._data_devolucao_real = self._para_dia(valor)
+
     def devolver(self):
         self.devolvido = True
-        self.data_devolucao_real = datetime.now().strftime('%Y-%m-%d')
\ No newline at end of file
+        self.data_devolucao_real = datetime.now().strftime('%Y-%m-%d')
@@ -0,0 +1,271 @@
+"""
+Catálogo Fragmentado
+Distribui os livros entre processos de trabalho pelo hash do ISBN; cada
+processo mantém sua própria Biblioteca e seu próprio arquivo de dados
+"""
+
+import heapq
+import json
+import multiprocessing
+import os
+import threading
+import zlib
+from typing import List, Optional
+
+from sistema.biblioteca_poo import Biblioteca
+from sistema.gravacao import gravar_atomicamente
+
+# Arquivo, no diretório do catálogo, com a quantidade de fragmentos usada
+# na criação: o roteamento e os IDs globais dependem dela
+ARQUIVO_CONFIGURACAO = 'fragmentos.json'
+
+
+# ==================== PROCESSO DE TRABALHO ====================
+
+def _livros(biblioteca: Biblioteca) -> List[dict]:
+    return [livro.to_dict() for livro in biblioteca._livros_obj]
+
+
+def _usuarios(biblioteca: Biblioteca) -> List[dict]:
+    return [usuario.to_dict() for usuario in biblioteca._usuarios_obj]
+
+
+def _emprestimos(biblioteca: Biblioteca) -> List[dict]:
+    return [emprestimo.to_dict() for emprestimo in biblioteca._emprestimos_obj]
+
+
+def _buscar_livro(biblioteca: Biblioteca, livro_id: int) -> Optional[dict]:
+    livro = biblioteca.buscar_livro_por_id(livro_id)
+    return livro.to_dict() if livro else None
+
+
+def _buscar_livros(biblioteca: Biblioteca, consulta: str, limite: int) -> List[tuple]:
+    return [
+        (pontuacao, biblioteca._livros_por_id[livro_id].to_dict())
+        for pontuacao, livro_id in biblioteca._indice_textual.buscar_pontuados(consulta, limite)
+    ]
+
+
+def _adicionar_livro(biblioteca: Biblioteca, titulo: str, autor: str, isbn: str, ano: int) -> Optional[int]:
+    """Adiciona o livro e retorna o ID local na mesma mensagem (None se recusado)."""
+    if not biblioteca.adicionar_livro(titulo, autor, isbn, ano):
+        return None
+    return biblioteca._livros_obj[-1].id
+
+
+def _realizar_emprestimo(biblioteca: Biblioteca, usuario_id: int, livro_id: int) -> Optional[int]:
+    """Empresta o livro e retorna o ID local do empréstimo na mesma mensagem (None se recusado)."""
+    if not biblioteca.realizar_emprestimo(usuario_id, livro_id):
+        return None
+    return biblioteca._emprestimos_obj[-1].id
+
+
+# Operações que o coordenador pode pedir a um fragmento
+_OPERACOES = {
+    'adicionar_livro': _adicionar_livro,
+    'cadastrar_usuario': Biblioteca.cadastrar_usuario,
+    'realizar_emprestimo': _realizar_emprestimo,
+    'devolver_livro': Biblioteca.devolver_livro,
+    'compactar_diario': Biblioteca.compactar_diario,
+    'buscar_livro': _buscar_livro,
+    'buscar_livros': _buscar_livros,
+    'livros': _livros,
+    'usuarios': _usuarios,
+    'emprestimos': _emprestimos,
+}
+
+
+def _trabalhador(conexao, arquivo: str) -> None:
+    """Laço de um processo de fragmento: executa operações até receber None."""
+    biblioteca = Biblioteca(arquivo, usar_diario=True)
+    biblioteca.carregar_dados()
+
+    while True:
+        pedido = conexao.recv()
+        if pedido is None:
+            biblioteca.compactar_diario()
+            conexao.close()
+            return
+
+        operacao, argumentos = pedido
+        try:
+            conexao.send(('ok', _OPERACOES[operacao](biblioteca, *argumentos)))
+        except Exception as e:
+            conexao.send(('erro', f"{type(e).__name__}: {e}"))
+
+
+# ==================== COORDENADOR ====================
+
+class CatalogoFragmentado:
+    """
+    Coordenador de um catálogo dividido em `num_fragmentos` processos.
+
+    Os livros vão para o fragmento crc32(isbn) % n. Os IDs globais de livros
+    e empréstimos codificam o fragmento (global = (local - 1) * n + fragmento + 1),
+    então empréstimos e devoluções são roteados sem consulta extra. Usuários
+    são replicados em todos os fragmentos, com os mesmos IDs. Listagens e
+    buscas são distribuídas em paralelo e os resultados, combinados.
+
+    A quantidade de fragmentos fica gravada no diretório: reabri-lo com
+    outra quantidade levanta ValueError, em vez de rotear para o fragmento
+    errado.
+    """
+
+    def __init__(self, diretorio: str, num_fragmentos: int = 4, extensao: str = '.jsonl'):
+        if num_fragmentos < 1:
+            raise ValueError("É preciso ao menos um fragmento.")
+        os.makedirs(diretorio, exist_ok=True)
+        self._verificar_configuracao(diretorio, num_fragmentos)
+        self.num_fragmentos = num_fragmentos
+        self._conexoes = []
+        self._travas = []
+        self._processos = []
+
+        for indice in range(num_fragmentos):
+            arquivo = os.path.join(diretorio, f'fragmento_{indice}{extensao}')
+            local, remota = multiprocessing.Pipe()
+            processo = multiprocessing.Process(target=_trabalhador, args=(remota, arquivo), daemon=True)
+            processo.start()
+            remota.close()
+            self._conexoes.append(local)
+            self._travas.append(threading.Lock())
+            self._processos.append(processo)
+
+        # Cadastros de usuários precisam chegar a todos os fragmentos na mesma ordem
+        self._trava_usuarios = threading.Lock()
+
+    @staticmethod
+    def _verificar_configuracao(diretorio: str, num_fragmentos: int) -> None:
+        """Grava a quantidade de fragmentos na criação; na reabertura, exige a mesma."""
+        arquivo = os.path.join(diretorio, ARQUIVO_CONFIGURACAO)
+        if os.path.exists(arquivo):
+            with open(arquivo, 'r', encoding='utf-8') as f:
+                gravado = json.load(f)['num_fragmentos']
+            if gravado != num_fragmentos:
+                raise ValueError(f"O catálogo em {diretorio} foi criado com {gravado} fragmentos, "
+                                 f"não {num_fragmentos}.")
+            return
+        gravar_atomicamente(arquivo, lambda f: json.dump({'num_fragmentos': num_fragmentos}, f))
+
+    # ==================== ROTEAMENTO ====================
+
+    def fragmento_do_isbn(self, isbn: str) -> int:
+        """Retorna o fragmento responsável por um ISBN."""
+        return zlib.crc32(isbn.encode('utf-8')) % self.num_fragmentos
+
+    def _global(self, id_local: int, fragmento: int) -> int:
+        return (id_local - 1) * self.num_fragmentos + fragmento + 1
+
+    def _local(self, id_global: int) -> tuple:
+        """Retorna (fragmento, id_local) de um ID global."""
+        return (int(id_global) - 1) % self.num_fragmentos, (int(id_global) - 1) // self.num_fragmentos + 1
+
+    def _chamar(self, fragmento: int, operacao: str, *argumentos):
+        with self._travas[fragmento]:
+            self._conexoes[fragmento].send((operacao, argumentos))
+            situacao, resultado = self._conexoes[fragmento].recv()
+        if situacao == 'erro':
+            raise RuntimeError(f"Fragmento {fragmento}: {resultado}")
+        return resultado
+
+    def _chamar_todos(self, operacao: str, *argumentos) -> list:
+        """Envia a operação a todos os fragmentos antes de esperar as respostas."""
+        for trava in self._travas:
+            trava.acquire()
+        try:
+            for conexao in self._conexoes:
+                conexao.send((operacao, argumentos))
+            respostas = [conexao.recv() for conexao in self._conexoes]
+        finally:
+            for trava in self._travas:
+                trava.release()
+
+        for fragmento, (situacao, resultado) in enumerate(respostas):
+            if situacao == 'erro':
+                raise RuntimeError(f"Fragmento {fragmento}: {resultado}")
+        return [resultado for _, resultado in respostas]
+
+    def _globalizar_livro(self, livro: Optional[dict], fragmento: int) -> Optional[dict]:
+        if livro is not None:
+            livro['id'] = self._global(livro['id'], fragmento)
+        return livro
+
+    def _globalizar_emprestimo(self, emprestimo: Optional[dict], fragmento: int) -> Optional[dict]:
+        if emprestimo is not None:
+            emprestimo['id'] = self._global(emprestimo['id'], fragmento)
+            emprestimo['livro_id'] = self._global(emprestimo['livro_id'], fragmento)
+        return emprestimo
+
+    # ==================== OPERAÇÕES ====================
+
+    def adicionar_livro(self, titulo: str, autor: str, isbn: str, ano: int) -> Optional[int]:
+        """Adiciona o livro ao seu fragmento; retorna o ID global ou None."""
+        if not isbn:
+            return None
+        fragmento = self.fragmento_do_isbn(isbn)
+        livro_local = self._chamar(fragmento, 'adicionar_livro', titulo, autor, isbn, ano)
+        return None if livro_local is None else self._global(livro_local, fragmento)
+
+    def cadastrar_usuario(self, nome: str, email: str, telefone: str) -> bool:
+        """Cadastra o usuário em todos os fragmentos."""
+        with self._trava_usuarios:
+            return all(self._chamar_todos('cadastrar_usuario', nome, email, telefone))
+
+    def realizar_emprestimo(self, usuario_id: int, livro_id: int) -> Optional[int]:
+        """Empresta o livro no seu fragmento; retorna o ID global do empréstimo ou None."""
+        fragmento, livro_local = self._local(livro_id)
+        emprestimo_local = self._chamar(fragmento, 'realizar_emprestimo', usuario_id, livro_local)
+        return None if emprestimo_local is None else self._global(emprestimo_local, fragmento)
+
+    def devolver_livro(self, emprestimo_id: int) -> bool:
+        """Devolve o livro no fragmento que registrou o empréstimo."""
+        fragmento, emprestimo_local = self._local(emprestimo_id)
+        return self._chamar(fragmento, 'devolver_livro', emprestimo_local)
+
+    def buscar_livro_por_id(self, livro_id: int) -> Optional[dict]:
+        """Busca o livro no fragmento indicado pelo ID global."""
+        fragmento, livro_local = self._local(livro_id)
+        return self._globalizar_livro(self._chamar(fragmento, 'buscar_livro', livro_local), fragmento)
+
+    def buscar_livros(self, consulta: str, limite: int = 10) -> List[dict]:
+        """Busca em todos os fragmentos e combina pela pontuação."""
+        candidatos = []
+        for fragmento, resultados in enumerate(self._chamar_todos('buscar_livros', consulta, limite)):
+            for pontuacao, livro in resultados:
+                candidatos.append((pontuacao, self._globalizar_livro(livro, fragmento)))
+        melhores = heapq.nlargest(limite, candidatos, key=lambda par: (par[0], -par[1]['id']))
+        return [livro for _, livro in melhores]
+
+    def listar_livros(self) -> List[dict]:
+        """Todos os livros, ordenados pelo ID global."""
+        return self._combinar('livros', self._globalizar_livro)
+
+    def listar_emprestimos(self) -> List[dict]:
+        """Todos os empréstimos, ordenados pelo ID global."""
+        return self._combinar('emprestimos', self._globalizar_emprestimo)
+
+    def listar_usuarios(self) -> List[dict]:
+        """Usuários (replicados): basta consultar um fragmento."""
+        return self._chamar(0, 'usuarios')
+
+    def _combinar(self, operacao: str, globalizar) -> List[dict]:
+        partes = [
+            [globalizar(item, fragmento) for item in itens]
+            for fragmento, itens in enumerate(self._chamar_todos(operacao))
+        ]
+        return list(heapq.merge(*partes, key=lambda item: item['id']))
+
+    def encerrar(self) -> None:
+        """Compacta os arquivos dos fragmentos e encerra os processos."""
+        for conexao in self._conexoes:
+            conexao.send(None)
+        for processo in self._processos:
+            processo.join()
+        for conexao in self._conexoes:
+            conexao.close()
+
+    def __enter__(self) -> 'CatalogoFragmentado':
+        return self
+
+    def __exit__(self, *excecao) -> None:
+        self.encerrar()
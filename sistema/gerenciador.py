@@ -0,0 +1,199 @@
+"""
+Gerenciador de Bibliotecas
+Várias bibliotecas (por exemplo, uma por unidade) no mesmo processo,
+carregadas do armazenamento no primeiro acesso e descarregadas quando ficam
+ociosas ou quando a memória estimada passa do orçamento
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List
+
+from sistema.biblioteca_poo import Biblioteca
+
+# Bytes aproximados por registro, já contando os índices (medidos com
+# tracemalloc sobre bibliotecas sintéticas; os livros pesam mais por causa
+# do índice textual)
+BYTES_POR_REGISTRO = {'livro': 2000, 'usuario': 300, 'emprestimo': 1000, 'reserva': 500}
+
+
+def estimar_memoria(biblioteca: Biblioteca) -> int:
+    """Estimativa, em bytes, da memória ocupada pelos dados da biblioteca. O(1)."""
+    return (
+        len(biblioteca._livros_obj) * BYTES_POR_REGISTRO['livro']
+        + len(biblioteca._usuarios_obj) * BYTES_POR_REGISTRO['usuario']
+        + len(biblioteca._emprestimos_obj) * BYTES_POR_REGISTRO['emprestimo']
+        + len(biblioteca._reservas_obj) * BYTES_POR_REGISTRO['reserva']
+    )
+
+
+class GerenciadorBibliotecas:
+    """
+    Registro de bibliotecas por nome.
+
+    registrar() só guarda o arquivo e as opções; a biblioteca é criada e
+    carregada no primeiro obter()/usar(). Cada alteração já é persistida
+    pela própria biblioteca, então descarregar é fechar a instância e
+    soltá-la: o próximo acesso a carrega de novo do disco. Uma referência à
+    instância descarregada continua lendo, mas suas alterações lançam
+    ErroBibliotecaFechada, em vez de sobrescrever as da instância nova.
+
+    A cada acesso e ao fim de cada usar(), as bibliotecas menos usadas
+    recentemente são descarregadas até a memória estimada caber em
+    `orcamento_bytes`;
+    descarregar_ociosas() solta as que não são acessadas há `ociosidade`
+    segundos. Bibliotecas em uso (dentro de usar()) ou com lote aberto
+    nunca são descarregadas.
+    """
+
+    def __init__(self, orcamento_bytes: int = 256 * 1024 * 1024, ociosidade: float = 300.0,
+                 relogio: Callable[[], float] = time.monotonic):
+        self.orcamento_bytes = orcamento_bytes
+        self.ociosidade = ociosidade
+        self._relogio = relogio
+        self._configuracoes: Dict[str, tuple] = {}
+        # Carregadas, da menos para a mais recentemente acessada
+        self._carregadas: 'OrderedDict[str, Biblioteca]' = OrderedDict()
+        self._ultimo_acesso: Dict[str, float] = {}
+        self._em_uso: Dict[str, int] = {}
+        self._trava = threading.RLock()
+
+    def registrar(self, nome: str, arquivo_dados: str, **opcoes) -> None:
+        """Registra uma biblioteca; `opcoes` são repassadas a Biblioteca()."""
+        with self._trava:
+            if nome in self._configuracoes:
+                raise ValueError(f"Biblioteca '{nome}' já registrada.")
+            self._configuracoes[nome] = (arquivo_dados, opcoes)
+
+    def remover(self, nome: str) -> None:
+        """Descarrega (se preciso) e esquece uma biblioteca."""
+        with self._trava:
+            if self._em_uso.get(nome):
+                raise RuntimeError(f"Biblioteca '{nome}' está em uso.")
+            self._soltar(nome)
+            del self._configuracoes[nome]
+
+    def __contains__(self, nome: str) -> bool:
+        return nome in self._configuracoes
+
+    def __len__(self) -> int:
+        return len(self._configuracoes)
+
+    def nomes(self) -> List[str]:
+        """Nomes registrados, em ordem alfabética."""
+        return sorted(self._configuracoes)
+
+    def carregadas(self) -> List[str]:
+        """Nomes das bibliotecas em memória, da menos para a mais recentemente usada."""
+        with self._trava:
+            return list(self._carregadas)
+
+    def memoria_estimada(self) -> int:
+        """Soma das estimativas de memória das bibliotecas carregadas."""
+        with self._trava:
+            return sum(estimar_memoria(biblioteca) for biblioteca in self._carregadas.values())
+
+    # ==================== ACESSO ====================
+
+    def obter(self, nome: str) -> Biblioteca:
+        """
+        Retorna a biblioteca, carregando-a se necessário.
+
+        Para operações longas, prefira usar(): uma biblioteca obtida aqui
+        pode ser descarregada (e fechada) enquanto a referência ainda existe.
+        """
+        with self._trava:
+            biblioteca = self._carregadas.get(nome)
+            if biblioteca is None:
+                biblioteca = self._carregar(nome)
+            else:
+                self._carregadas.move_to_end(nome)
+            self._ultimo_acesso[nome] = self._relogio()
+            self._aplicar_orcamento(preservar=nome)
+            return biblioteca
+
+    @contextmanager
+    def usar(self, nome: str) -> Iterator[Biblioteca]:
+        """Obtém a biblioteca e impede que ela seja descarregada até o fim do bloco."""
+        with self._trava:
+            biblioteca = self.obter(nome)
+            self._em_uso[nome] = self._em_uso.get(nome, 0) + 1
+        try:
+            yield biblioteca
+        finally:
+            with self._trava:
+                self._em_uso[nome] -= 1
+                if not self._em_uso[nome]:
+                    del self._em_uso[nome]
+                self._ultimo_acesso[nome] = self._relogio()
+                # A biblioteca pode ter crescido, e as que estavam em uso
+                # podem ter adiado a descarga
+                if nome in self._carregadas:
+                    self._aplicar_orcamento(preservar=nome)
+
+    def _carregar(self, nome: str) -> Biblioteca:
+        try:
+            arquivo_dados, opcoes = self._configuracoes[nome]
+        except KeyError:
+            raise KeyError(f"Biblioteca '{nome}' não registrada.") from None
+        biblioteca = Biblioteca(arquivo_dados, **opcoes)
+        biblioteca.carregar_dados()
+        self._carregadas[nome] = biblioteca
+        return biblioteca
+
+    # ==================== DESCARGA ====================
+
+    def _pode_descarregar(self, nome: str) -> bool:
+        return not self._em_uso.get(nome) and not self._carregadas[nome]._em_lote()
+
+    def _soltar(self, nome: str) -> None:
+        biblioteca = self._carregadas.pop(nome, None)
+        self._ultimo_acesso.pop(nome, None)
+        if biblioteca is not None:
+            # Só fecha o armazenamento criado pela própria biblioteca; um
+            # armazenamento recebido nas opções pertence a quem o passou
+            biblioteca.fechar(fechar_armazenamento='armazenamento' not in self._configuracoes[nome][1])
+
+    def descarregar(self, nome: str) -> bool:
+        """Descarrega a biblioteca; retorna False se ela não estiver carregada ou estiver em uso."""
+        with self._trava:
+            if nome not in self._carregadas or not self._pode_descarregar(nome):
+                return False
+            self._soltar(nome)
+            return True
+
+    def descarregar_ociosas(self) -> List[str]:
+        """Descarrega as bibliotecas sem acesso há mais de `ociosidade` segundos."""
+        with self._trava:
+            limite = self._relogio() - self.ociosidade
+            ociosas = [nome for nome in self._carregadas
+                       if self._ultimo_acesso.get(nome, limite) <= limite and self._pode_descarregar(nome)]
+            for nome in ociosas:
+                self._soltar(nome)
+            return ociosas
+
+    def _aplicar_orcamento(self, preservar: str) -> None:
+        """Descarrega as menos usadas recentemente até caber no orçamento."""
+        memoria = {nome: estimar_memoria(biblioteca) for nome, biblioteca in self._carregadas.items()}
+        total = sum(memoria.values())
+        for nome in list(self._carregadas):
+            if total <= self.orcamento_bytes:
+                break
+            if nome != preservar and self._pode_descarregar(nome):
+                self._soltar(nome)
+                total -= memoria[nome]
+
+    def fechar(self) -> None:
+        """Descarrega todas as bibliotecas que não estejam em uso."""
+        with self._trava:
+            for nome in list(self._carregadas):
+                if self._pode_descarregar(nome):
+                    self._soltar(nome)
+
+    def __enter__(self) -> 'GerenciadorBibliotecas':
+        return self
+
+    def __exit__(self, *excecao) -> None:
+        self.fechar()
@@ -0,0 +1,114 @@
+"""
+Gravação Durável
+Escrita atômica (arquivo temporário + fsync + rename) e confirmação em grupo
+(várias alterações próximas compartilham uma única gravação)
+"""
+
+import os
+import tempfile
+import threading
+import time
+from typing import IO, Any, Callable
+
+
+def sincronizar_diretorio(diretorio: str) -> None:
+    """Garante que a troca de nomes no diretório chegou ao disco (POSIX)."""
+    if os.name != 'posix':
+        return
+    descritor = os.open(diretorio, os.O_RDONLY)
+    try:
+        os.fsync(descritor)
+    finally:
+        os.close(descritor)
+
+
+def gravar_atomicamente(arquivo: str, escrever: Callable[[IO[Any]], None], binario: bool = False) -> None:
+    """
+    Substitui `arquivo` de forma atômica.
+
+    O conteúdo é escrito por `escrever` em um arquivo temporário no mesmo
+    diretório, sincronizado com fsync e então renomeado por cima do original.
+    Uma falha no meio do caminho deixa o arquivo anterior intacto. Com
+    `binario`, o arquivo é aberto em modo binário em vez de texto UTF-8.
+
+    Destinos que não são arquivos comuns (os.devnull, FIFOs, dispositivos)
+    são escritos diretamente: renomear por cima os substituiria.
+    """
+    modo = {'mode': 'wb'} if binario else {'mode': 'w', 'encoding': 'utf-8'}
+    if os.path.exists(arquivo) and not os.path.isfile(arquivo):
+        with open(arquivo, **modo) as f:
+            escrever(f)
+        return
+
+    diretorio = os.path.dirname(os.path.abspath(arquivo))
+    descritor, temporario = tempfile.mkstemp(
+        dir=diretorio, prefix=f'.{os.path.basename(arquivo)}.', suffix='.tmp'
+    )
+    try:
+        with os.fdopen(descritor, **modo) as f:
+            escrever(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, arquivo)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+    sincronizar_diretorio(diretorio)
+
+
+class ConfirmacaoEmGrupo:
+    """
+    Confirmação em grupo (group commit).
+
+    Cada chamador de confirmar() espera até que uma gravação iniciada depois
+    do seu pedido termine. O primeiro a chegar vira o líder: aguarda até
+    `latencia` segundos (ou até juntar `tamanho_lote` pedidos), chama
+    `gravar()` uma única vez e libera todos os pedidos atendidos por ela.
+    """
+
+    def __init__(self, gravar: Callable[[], None], latencia: float = 0.005, tamanho_lote: int = 64):
+        self._gravar = gravar
+        self.latencia = latencia
+        self.tamanho_lote = tamanho_lote
+        self._condicao = threading.Condition()
+        self._pedidos = 0
+        self._confirmados = 0
+        self._gravando = False
+        self.gravacoes = 0
+
+    def confirmar(self) -> None:
+        """Bloqueia até que as alterações anteriores a esta chamada estejam em disco."""
+        with self._condicao:
+            self._pedidos += 1
+            meu_pedido = self._pedidos
+            self._condicao.notify_all()
+
+            while self._confirmados < meu_pedido:
+                if self._gravando:
+                    self._condicao.wait()
+                    continue
+                self._liderar()
+
+    def _liderar(self) -> None:
+        """Junta os pedidos por um instante e faz a gravação do grupo."""
+        self._gravando = True
+        prazo = time.monotonic() + self.latencia
+        while self._pedidos - self._confirmados < self.tamanho_lote:
+            restante = prazo - time.monotonic()
+            if restante <= 0:
+                break
+            self._condicao.wait(restante)
+
+        atendidos = self._pedidos
+        self._condicao.release()
+        try:
+            self._gravar()
+        finally:
+            self._condicao.acquire()
+            self._gravando = False
+            self._condicao.notify_all()
+
+        # Só avança se a gravação deu certo; senão outro pedido tenta de novo
+        self._confirmados = max(self._confirmados, atendidos)
+        self.gravacoes += 1
@@ -0,0 +1,71 @@
+"""
+Importação em Massa
+Leitura em fluxo de livros e usuários a partir de arquivos CSV ou JSON Lines
+"""
+
+import csv
+import json
+import os
+from contextlib import contextmanager
+from typing import IO, Iterable, Iterator, Optional, Tuple, Union
+
+Fonte = Union[str, IO[str], Iterable[str]]
+
+FORMATOS = {
+    '.csv': 'csv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+}
+
+
+def detectar_formato(fonte: Fonte, formato: Optional[str] = None) -> str:
+    """Retorna o formato informado ou o deduz pela extensão do arquivo."""
+    if formato:
+        formato = formato.lower()
+    elif isinstance(fonte, str):
+        formato = FORMATOS.get(os.path.splitext(fonte)[1].lower())
+
+    if formato not in ('csv', 'jsonl'):
+        raise ValueError("Formato de importação desconhecido: use 'csv' ou 'jsonl'.")
+    return formato
+
+
+@contextmanager
+def _abrir(fonte: Fonte) -> Iterator[Iterable[str]]:
+    """Abre a fonte se ela for um caminho; caso contrário, usa-a como está."""
+    if isinstance(fonte, str):
+        with open(fonte, 'r', encoding='utf-8', newline='') as f:
+            yield f
+    else:
+        yield fonte
+
+
+def ler_registros(fonte: Fonte, formato: Optional[str] = None) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Percorre os registros da fonte, um de cada vez.
+
+    Gera tuplas (linha, dados, erro): `dados` é o dicionário lido, ou None
+    quando a linha não pôde ser interpretada (e então `erro` traz o motivo).
+    Apenas uma linha fica em memória por vez.
+    """
+    formato = detectar_formato(fonte, formato)
+
+    with _abrir(fonte) as linhas:
+        if formato == 'csv':
+            leitor = csv.DictReader(linhas)
+            for dados in leitor:
+                yield leitor.line_num, dados, None
+            return
+
+        for numero, linha in enumerate(linhas, start=1):
+            if not linha.strip():
+                continue
+            try:
+                dados = json.loads(linha)
+            except json.JSONDecodeError as e:
+                yield numero, None, f"JSON inválido: {e.msg}"
+                continue
+            if not isinstance(dados, dict):
+                yield numero, None, "Registro não é um objeto JSON"
+                continue
+            yield numero, dados, None
@@ -0,0 +1,87 @@
+"""
+Índice Ordenado
+Lista de chaves mantida em ordem (bisect) para paginação por cursor e
+consultas por intervalo ou prefixo
+"""
+
+import bisect
+from typing import Any, List, Optional
+
+
+class IndiceOrdenado:
+    """
+    Chaves em ordem crescente, sem repetição.
+
+    Inserir uma chave maior que todas (o caso comum: IDs crescentes) é um
+    append O(1); fora de ordem, é uma inserção com bisect. Uma página a
+    partir de um cursor custa O(log n + tamanho da página).
+
+    Em cargas, as chaves chegam fora de ordem e cada inserção desloca a
+    lista: entre adiar_ordenacao() e ordenar(), inserir() só acrescenta e a
+    ordem é refeita de uma vez, em O(n log n) em vez de O(n²).
+    """
+
+    def __init__(self):
+        self._chaves: List[Any] = []
+        self._adiado = False
+
+    def __len__(self) -> int:
+        return len(self._chaves)
+
+    def inserir(self, chave: Any) -> None:
+        chaves = self._chaves
+        if self._adiado or not chaves or chave > chaves[-1]:
+            chaves.append(chave)
+            return
+        posicao = bisect.bisect_left(chaves, chave)
+        if posicao == len(chaves) or chaves[posicao] != chave:
+            chaves.insert(posicao, chave)
+
+    def remover(self, chave: Any) -> None:
+        posicao = bisect.bisect_left(self._chaves, chave)
+        if posicao < len(self._chaves) and self._chaves[posicao] == chave:
+            del self._chaves[posicao]
+
+    def limpar(self) -> None:
+        self._chaves.clear()
+
+    def adiar_ordenacao(self) -> None:
+        """Passa a só acrescentar as chaves inseridas, até ordenar()."""
+        self._adiado = True
+
+    def ordenar(self) -> None:
+        """Ordena (e tira as repetições de) as chaves acrescentadas desde adiar_ordenacao()."""
+        self._adiado = False
+        chaves = self._chaves
+        chaves.sort()
+        if any(chaves[i] == chaves[i - 1] for i in range(1, len(chaves))):
+            self._chaves = [chave for i, chave in enumerate(chaves) if i == 0 or chave != chaves[i - 1]]
+
+    def pagina(self, apos: Optional[Any] = None, limite: int = 100,
+               decrescente: bool = False) -> List[Any]:
+        """
+        Até `limite` chaves depois do cursor `apos` (exclusivo), na ordem
+        pedida; sem cursor, começa do início (ou do fim, se decrescente).
+        """
+        chaves = self._chaves
+        if decrescente:
+            fim = len(chaves) if apos is None else bisect.bisect_left(chaves, apos)
+            inicio = max(0, fim - limite)
+            return chaves[inicio:fim][::-1]
+        inicio = 0 if apos is None else bisect.bisect_right(chaves, apos)
+        return chaves[inicio:inicio + limite]
+
+    def intervalo(self, minimo: Any, maximo: Any, limite: Optional[int] = None) -> List[Any]:
+        """
+        Chaves com minimo <= chave < maximo, em ordem crescente (até `limite`).
+        O(log n + k).
+
+        Com chaves compostas, uma tupla mais curta delimita todas as que a
+        estendem: intervalo((1890,), (1951,)) cobre (1890, id) a (1950, id).
+        """
+        chaves = self._chaves
+        inicio = bisect.bisect_left(chaves, minimo)
+        fim = bisect.bisect_left(chaves, maximo, lo=inicio)
+        if limite is not None:
+            fim = min(fim, inicio + limite)
+        return chaves[inicio:fim]
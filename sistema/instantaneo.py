@@ -0,0 +1,107 @@
+"""
+Instantâneos
+Visão somente leitura do estado da biblioteca em um momento, obtida em O(1)
+e consistente enquanto as escritas continuam
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from sistema.biblioteca_poo import Biblioteca
+
+# Atributos que mudam depois que a entidade é registrada, por tipo (nome da
+# classe): os demais são fixos e podem ser lidos direto do objeto vivo
+ATRIBUTOS_MUTAVEIS: Dict[str, Tuple[str, ...]] = {
+    'Livro': ('disponivel',),
+    'Usuario': (),
+    'Emprestimo': ('devolvido', 'data_devolucao'),
+    'Reserva': ('situacao',),
+}
+
+
+class Instantaneo:
+    """
+    Estado da biblioteca no momento de Biblioteca.instantaneo().
+
+    Nada é copiado na criação. As coleções são listas que só crescem, então
+    basta guardar a lista e o seu tamanho; se a biblioteca precisar
+    encolhê-la (lote desfeito ou nova carga), ela passa a usar uma cópia e a
+    lista antiga fica só com os instantâneos. Os atributos que mudam
+    (disponibilidade, devolução, situação da reserva) são versionados: ao
+    alterá-los com instantâneos vivos, a biblioteca guarda o valor anterior
+    com a versão, e a leitura aqui devolve o valor vigente na versão do
+    instantâneo.
+
+    As leituras não usam a trava da biblioteca: relatórios longos não
+    seguram as escritas. As entidades são devolvidas como dicionários (no
+    formato de to_dict), cópias que não mudam depois.
+    """
+
+    def __init__(self, biblioteca: 'Biblioteca', versao: int, colecoes: Dict[str, Tuple[list, int]],
+                 contadores: Dict[str, int]):
+        self._biblioteca = biblioteca
+        self.versao = versao
+        self._colecoes = colecoes
+        self._contadores = contadores
+        self._por_id: Dict[str, Dict[int, Any]] = {}
+
+    def _objetos(self, colecao: str) -> List[Any]:
+        lista, tamanho = self._colecoes[colecao]
+        return lista[:tamanho] if tamanho < len(lista) else lista
+
+    def _para_dict(self, objeto: Any) -> dict:
+        dados = objeto.to_dict()
+        for atributo in ATRIBUTOS_MUTAVEIS[type(objeto).__name__]:
+            dados[atributo] = self._biblioteca._valor_na_versao(objeto, atributo, self.versao)
+        return dados
+
+    def _iterar(self, colecao: str) -> Iterator[dict]:
+        lista, tamanho = self._colecoes[colecao]
+        for posicao in range(tamanho):
+            yield self._para_dict(lista[posicao])
+
+    def _buscar(self, colecao: str, id: int) -> Optional[dict]:
+        # O índice por ID do instantâneo é montado na primeira busca (O(n)
+        # uma vez): os índices vivos da biblioteca já podem ter mudado
+        indice = self._por_id.get(colecao)
+        if indice is None:
+            indice = self._por_id[colecao] = {objeto.id: objeto for objeto in self._objetos(colecao)}
+        objeto = indice.get(int(id))
+        return self._para_dict(objeto) if objeto is not None else None
+
+    # ==================== CONSULTAS ====================
+
+    def quantidades(self) -> Dict[str, int]:
+        """Quantidade de registros de cada coleção."""
+        return {colecao: tamanho for colecao, (_, tamanho) in self._colecoes.items()}
+
+    def livros(self) -> Iterator[dict]:
+        return self._iterar('livros')
+
+    def usuarios(self) -> Iterator[dict]:
+        return self._iterar('usuarios')
+
+    def emprestimos(self) -> Iterator[dict]:
+        return self._iterar('emprestimos')
+
+    def reservas(self) -> Iterator[dict]:
+        return self._iterar('reservas')
+
+    def emprestimos_ativos(self) -> List[dict]:
+        """Empréstimos em aberto no momento do instantâneo."""
+        return [emprestimo for emprestimo in self.emprestimos() if not emprestimo['devolvido']]
+
+    def buscar_livro_por_id(self, livro_id: int) -> Optional[dict]:
+        return self._buscar('livros', livro_id)
+
+    def buscar_usuario_por_id(self, usuario_id: int) -> Optional[dict]:
+        return self._buscar('usuarios', usuario_id)
+
+    def buscar_emprestimo_por_id(self, emprestimo_id: int) -> Optional[dict]:
+        return self._buscar('emprestimos', emprestimo_id)
+
+    def exportar_estado(self) -> dict:
+        """O estado no formato do arquivo JSON (como Biblioteca._exportar_estado), para cópias de segurança."""
+        estado = {colecao: list(self._iterar(colecao)) for colecao in self._colecoes}
+        estado['contadores'] = dict(self._contadores)
+        return estado
@@ -1,4 +1,10 @@
+import sys
+
+
 class Livro:
+    # atributos fixos: sem __dict__ por instância, bem menor em memória
+    __slots__ = ('id', 'titulo', 'autor', 'isbn', 'ano', 'disponivel')
+
     _id_counter = 1   # contador interno para gerar IDs automáticos
 
     def __init__(self, id_livro, titulo, autor, isbn, ano, disponivel=True):
@@ -10,7 +16,7 @@ class Livro:
             self.id = id_livro
         
         self.titulo = titulo
-        self.autor = autor
+        self.autor = sys.intern(autor)   # uma única cópia de cada nome de autor
         self.isbn = isbn
         self.ano = ano
         self.disponivel = True
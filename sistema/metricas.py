@@ -0,0 +1,152 @@
+"""
+Métricas
+Contadores de chamadas e de erros e histogramas de latência por operação,
+com instantâneo em dicionário e exposição em texto (formato Prometheus)
+"""
+
+import bisect
+import functools
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Limites superiores (em segundos) dos baldes do histograma de latência
+LIMITES_LATENCIA: Tuple[float, ...] = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histograma:
+    """Histograma de baldes fixos: cada observação cai no primeiro limite >= valor."""
+
+    __slots__ = ('limites', 'baldes', 'soma', 'quantidade')
+
+    def __init__(self, limites: Tuple[float, ...] = LIMITES_LATENCIA):
+        self.limites = limites
+        self.baldes: List[int] = [0] * (len(limites) + 1)   # o último é +Inf
+        self.soma = 0.0
+        self.quantidade = 0
+
+    def observar(self, valor: float) -> None:
+        self.baldes[bisect.bisect_left(self.limites, valor)] += 1
+        self.soma += valor
+        self.quantidade += 1
+
+    def acumulados(self) -> List[Tuple[float, int]]:
+        """Pares (limite, observações <= limite), terminando em +Inf."""
+        total = 0
+        pares = []
+        for limite, contagem in zip(self.limites + (float('inf'),), self.baldes):
+            total += contagem
+            pares.append((limite, total))
+        return pares
+
+    def percentil(self, p: float) -> Optional[float]:
+        """Estimativa do percentil: o limite do balde onde ele cai."""
+        if not self.quantidade:
+            return None
+        alvo = p * self.quantidade
+        for limite, acumulado in self.acumulados():
+            if acumulado >= alvo:
+                return limite
+        return float('inf')
+
+
+class MetricaOperacao:
+    """Chamadas, erros e latências de uma operação."""
+
+    __slots__ = ('chamadas', 'erros', 'latencia')
+
+    def __init__(self):
+        self.chamadas = 0
+        self.erros = 0
+        self.latencia = Histograma()
+
+
+class RegistroMetricas:
+    """
+    Registro em processo das métricas por operação.
+
+    A atualização é um trecho curto sob uma trava simples, então serve tanto
+    ao modo sequencial quanto ao concorrente.
+    """
+
+    def __init__(self):
+        self._operacoes: Dict[str, MetricaOperacao] = {}
+        self._trava = threading.Lock()
+
+    def registrar(self, operacao: str, segundos: float, erro: bool) -> None:
+        with self._trava:
+            metrica = self._operacoes.get(operacao)
+            if metrica is None:
+                metrica = self._operacoes[operacao] = MetricaOperacao()
+            metrica.chamadas += 1
+            if erro:
+                metrica.erros += 1
+            metrica.latencia.observar(segundos)
+
+    def instantaneo(self) -> Dict[str, dict]:
+        """Cópia das métricas: {operacao: {chamadas, erros, latencia: {...}}}."""
+        with self._trava:
+            return {
+                operacao: {
+                    'chamadas': metrica.chamadas,
+                    'erros': metrica.erros,
+                    'latencia': {
+                        'soma_segundos': metrica.latencia.soma,
+                        'p50_segundos': metrica.latencia.percentil(0.50),
+                        'p99_segundos': metrica.latencia.percentil(0.99),
+                        'baldes': metrica.latencia.acumulados(),
+                    },
+                }
+                for operacao, metrica in sorted(self._operacoes.items())
+            }
+
+    def exposicao(self, prefixo: str = 'biblioteca') -> str:
+        """Métricas no formato de texto do Prometheus."""
+        linhas = [
+            f'# TYPE {prefixo}_chamadas_total counter',
+            f'# TYPE {prefixo}_erros_total counter',
+            f'# TYPE {prefixo}_latencia_segundos histogram',
+        ]
+        for operacao, metrica in self.instantaneo().items():
+            rotulo = f'operacao="{operacao}"'
+            linhas.append(f'{prefixo}_chamadas_total{{{rotulo}}} {metrica["chamadas"]}')
+            linhas.append(f'{prefixo}_erros_total{{{rotulo}}} {metrica["erros"]}')
+            for limite, acumulado in metrica['latencia']['baldes']:
+                le = '+Inf' if limite == float('inf') else repr(limite)
+                linhas.append(f'{prefixo}_latencia_segundos_bucket{{{rotulo},le="{le}"}} {acumulado}')
+            linhas.append(f'{prefixo}_latencia_segundos_sum{{{rotulo}}} {metrica["latencia"]["soma_segundos"]}')
+            linhas.append(f'{prefixo}_latencia_segundos_count{{{rotulo}}} {metrica["chamadas"]}')
+        return '\n'.join(linhas) + '\n'
+
+    def limpar(self) -> None:
+        with self._trava:
+            self._operacoes.clear()
+
+
+def medido(metodo):
+    """
+    Registra chamada, erro e latência do método em self._metricas (se houver).
+
+    Conta como erro uma exceção ou um retorno False (a convenção da
+    Biblioteca para operações recusadas). Sem registro, o custo é uma
+    consulta de atributo.
+    """
+    operacao = metodo.__name__
+
+    @functools.wraps(metodo)
+    def envoltorio(self, *args, **kwargs):
+        registro = self._metricas
+        if registro is None:
+            return metodo(self, *args, **kwargs)
+        inicio = time.perf_counter()
+        try:
+            resultado = metodo(self, *args, **kwargs)
+        except BaseException:
+            registro.registrar(operacao, time.perf_counter() - inicio, True)
+            raise
+        registro.registrar(operacao, time.perf_counter() - inicio, resultado is False)
+        return resultado
+    return envoltorio
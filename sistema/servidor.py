@@ -0,0 +1,379 @@
+"""
+Servidor HTTP da Biblioteca
+Serviço HTTP/JSON assíncrono (apenas biblioteca padrão) para livros,
+usuários, empréstimos, devoluções e reservas
+
+Uso: python -m sistema.servidor [--arquivo biblioteca.json] [--porta 8080]
+"""
+
+import argparse
+import asyncio
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from sistema.biblioteca_poo import ORDENS, Biblioteca, _converter_ano
+
+MOTIVOS = {
+    200: 'OK',
+    201: 'Created',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    409: 'Conflict',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+}
+
+TAMANHO_MAXIMO_CORPO = 1024 * 1024
+
+Resposta = Tuple[int, object]
+
+
+class ErroRequisicao(Exception):
+    """Erro que vira uma resposta HTTP com o código informado."""
+
+    def __init__(self, status: int, mensagem: str):
+        super().__init__(mensagem)
+        self.status = status
+        self.mensagem = mensagem
+
+
+class ServidorBiblioteca:
+    """
+    Expõe uma Biblioteca por HTTP/JSON usando asyncio.start_server.
+
+    O laço de eventos só cuida da rede: as operações da biblioteca (e a
+    gravação em disco que elas disparam) rodam em um pool de threads, com a
+    biblioteca no modo concorrente.
+    """
+
+    def __init__(self, biblioteca: Biblioteca, host: str = '127.0.0.1', porta: int = 8080,
+                 trabalhadores: int = 32):
+        if biblioteca._trava is None:
+            raise ValueError("A biblioteca precisa ser criada com concorrente=True.")
+        self.biblioteca = biblioteca
+        self.host = host
+        self.porta = porta
+        self._executor = ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix='biblioteca')
+        self._servidor: Optional[asyncio.AbstractServer] = None
+        self._rotas: List[Tuple[str, re.Pattern, Callable]] = [
+            ('GET', re.compile(r'/livros'), self._listar_livros),
+            ('POST', re.compile(r'/livros'), self._adicionar_livro),
+            ('GET', re.compile(r'/livros/busca'), self._buscar_livros),
+            ('GET', re.compile(r'/livros/(\d+)'), self._obter_livro),
+            ('GET', re.compile(r'/usuarios'), self._listar_usuarios),
+            ('POST', re.compile(r'/usuarios'), self._cadastrar_usuario),
+            ('GET', re.compile(r'/usuarios/(\d+)'), self._obter_usuario),
+            ('GET', re.compile(r'/usuarios/(\d+)/emprestimos'), self._emprestimos_do_usuario),
+            ('GET', re.compile(r'/emprestimos'), self._listar_emprestimos),
+            ('POST', re.compile(r'/emprestimos'), self._realizar_emprestimo),
+            ('POST', re.compile(r'/emprestimos/(\d+)/devolucao'), self._devolver_livro),
+            ('GET', re.compile(r'/usuarios/(\d+)/reservas'), self._reservas_do_usuario),
+            ('POST', re.compile(r'/reservas'), self._reservar_livro),
+            ('POST', re.compile(r'/reservas/(\d+)/cancelamento'), self._cancelar_reserva),
+        ]
+
+    # ==================== CICLO DE VIDA ====================
+
+    async def iniciar(self) -> None:
+        """Começa a aceitar conexões (porta 0 escolhe uma porta livre)."""
+        self._servidor = await asyncio.start_server(self._atender, self.host, self.porta)
+        self.porta = self._servidor.sockets[0].getsockname()[1]
+
+    async def servir_para_sempre(self) -> None:
+        """Inicia o servidor e atende até ser cancelado."""
+        if self._servidor is None:
+            await self.iniciar()
+        async with self._servidor:
+            await self._servidor.serve_forever()
+
+    async def encerrar(self) -> None:
+        """Para de aceitar conexões e libera o pool de threads."""
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+            self._servidor = None
+        self._executor.shutdown(wait=True)
+
+    # ==================== PROTOCOLO HTTP ====================
+
+    async def _atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        """Atende as requisições de uma conexão (com keep-alive)."""
+        try:
+            while True:
+                try:
+                    cabecalho = await leitor.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                manter_conexao = True
+                corpo = None
+                try:
+                    metodo, alvo, cabecalhos = self._interpretar_cabecalho(cabecalho)
+                    manter_conexao = cabecalhos.get('connection', '').lower() != 'close'
+                    corpo = await self._ler_corpo(leitor, cabecalhos)
+                    status, conteudo = await self._despachar(metodo, alvo, corpo)
+                except ErroRequisicao as e:
+                    status, conteudo = e.status, {'erro': e.mensagem}
+                    if corpo is None:
+                        # Corpo não lido: o que vier a seguir na conexão não é uma requisição
+                        manter_conexao = False
+                except asyncio.IncompleteReadError:
+                    break
+                except Exception as e:
+                    status, conteudo = 500, {'erro': str(e)}
+
+                escritor.write(self._montar_resposta(status, conteudo, manter_conexao))
+                await escritor.drain()
+                if not manter_conexao:
+                    break
+        finally:
+            escritor.close()
+
+    @staticmethod
+    def _interpretar_cabecalho(cabecalho: bytes) -> Tuple[str, str, dict]:
+        linhas = cabecalho.decode('latin-1').split('\r\n')
+        try:
+            metodo, alvo, _ = linhas[0].split(' ', 2)
+        except ValueError:
+            raise ErroRequisicao(400, 'Linha de requisição inválida')
+
+        cabecalhos = {}
+        for linha in linhas[1:]:
+            if ':' in linha:
+                nome, valor = linha.split(':', 1)
+                cabecalhos[nome.strip().lower()] = valor.strip()
+        return metodo.upper(), alvo, cabecalhos
+
+    @staticmethod
+    async def _ler_corpo(leitor: asyncio.StreamReader, cabecalhos: dict) -> bytes:
+        try:
+            tamanho = int(cabecalhos.get('content-length', 0))
+        except ValueError:
+            raise ErroRequisicao(400, 'Content-Length inválido')
+        if tamanho < 0:
+            raise ErroRequisicao(400, 'Content-Length inválido')
+        if tamanho > TAMANHO_MAXIMO_CORPO:
+            raise ErroRequisicao(413, 'Corpo da requisição muito grande')
+        return await leitor.readexactly(tamanho) if tamanho else b''
+
+    @staticmethod
+    def _montar_resposta(status: int, conteudo: object, manter_conexao: bool) -> bytes:
+        corpo = json.dumps(conteudo, ensure_ascii=False).encode('utf-8')
+        cabecalho = (
+            f"HTTP/1.1 {status} {MOTIVOS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(corpo)}\r\n"
+            f"Connection: {'keep-alive' if manter_conexao else 'close'}\r\n\r\n"
+        )
+        return cabecalho.encode('latin-1') + corpo
+
+    async def _despachar(self, metodo: str, alvo: str, corpo: bytes) -> Resposta:
+        partes = urlsplit(alvo)
+        caminho = partes.path.rstrip('/') or '/'
+        consulta = {chave: valores[-1] for chave, valores in parse_qs(partes.query).items()}
+
+        caminho_existe = False
+        for metodo_rota, padrao, tratador in self._rotas:
+            encontrado = padrao.fullmatch(caminho)
+            if not encontrado:
+                continue
+            caminho_existe = True
+            if metodo_rota == metodo:
+                dados = self._interpretar_json(corpo) if metodo == 'POST' else consulta
+                return await tratador(dados, *(int(grupo) for grupo in encontrado.groups()))
+
+        if caminho_existe:
+            raise ErroRequisicao(405, 'Método não permitido')
+        raise ErroRequisicao(404, 'Recurso não encontrado')
+
+    @staticmethod
+    def _interpretar_json(corpo: bytes) -> dict:
+        try:
+            dados = json.loads(corpo or b'{}')
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            raise ErroRequisicao(400, 'JSON inválido')
+        if not isinstance(dados, dict):
+            raise ErroRequisicao(400, 'O corpo deve ser um objeto JSON')
+        return dados
+
+    async def _executar(self, funcao: Callable, *args):
+        """Roda uma operação da biblioteca fora do laço de eventos."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, funcao, *args)
+
+    def _alterar(self, operacao: Callable, entidade: Callable, *args) -> Optional[dict]:
+        """
+        Roda a operação e serializa a entidade que entidade() retorna sob a
+        mesma trava de escrita (um lote), no pool de threads: nenhuma outra
+        escrita entra entre as duas. Retorna None se a operação for recusada.
+        """
+        with self.biblioteca.lote():
+            if not operacao(*args):
+                return None
+            return entidade().to_dict()
+
+    def _ultimo(self, colecao: str) -> Callable:
+        """A entidade criada por último em uma coleção (dentro de _alterar, a da própria operação)."""
+        return lambda: getattr(self.biblioteca, f'_{colecao}_obj')[-1]
+
+    # ==================== ROTAS ====================
+
+    async def _listar_livros(self, consulta: dict) -> Resposta:
+        return 200, await self._executar(self._coletar, 'livros', *self._paginacao(consulta))
+
+    async def _buscar_livros(self, consulta: dict) -> Resposta:
+        try:
+            limite = int(consulta.get('limite', 10))
+        except ValueError:
+            raise ErroRequisicao(400, 'Limite inválido')
+        if limite < 0:
+            raise ErroRequisicao(400, 'Limite inválido')
+        livros = await self._executar(self.biblioteca.buscar_livros, consulta.get('q', ''), limite)
+        return 200, [livro.to_dict() for livro in livros]
+
+    async def _obter_livro(self, consulta: dict, livro_id: int) -> Resposta:
+        livro = await self._executar(self.biblioteca.buscar_livro_por_id, livro_id)
+        if livro is None:
+            raise ErroRequisicao(404, 'Livro não encontrado')
+        return 200, livro.to_dict()
+
+    async def _adicionar_livro(self, dados: dict) -> Resposta:
+        *textos, ano = self._campos(dados, 'titulo', 'autor', 'isbn', 'ano')
+        self._exigir_textos(textos)
+        ano = _converter_ano(ano)
+        if ano is None:
+            raise ErroRequisicao(400, 'Ano inválido')
+        livro = await self._executar(self._alterar, self.biblioteca.adicionar_livro, self._ultimo('livros'),
+                                     *textos, ano)
+        if livro is None:
+            raise ErroRequisicao(409, 'Livro inválido ou ISBN já cadastrado')
+        return 201, livro
+
+    async def _listar_usuarios(self, consulta: dict) -> Resposta:
+        return 200, await self._executar(self._coletar, 'usuarios', *self._paginacao(consulta))
+
+    async def _obter_usuario(self, consulta: dict, usuario_id: int) -> Resposta:
+        usuario = await self._executar(self.biblioteca.buscar_usuario_por_id, usuario_id)
+        if usuario is None:
+            raise ErroRequisicao(404, 'Usuário não encontrado')
+        return 200, usuario.to_dict()
+
+    async def _cadastrar_usuario(self, dados: dict) -> Resposta:
+        campos = self._campos(dados, 'nome', 'email', 'telefone')
+        self._exigir_textos(campos)
+        usuario = await self._executar(self._alterar, self.biblioteca.cadastrar_usuario, self._ultimo('usuarios'),
+                                       *campos)
+        if usuario is None:
+            raise ErroRequisicao(409, 'Usuário inválido ou email já cadastrado')
+        return 201, usuario
+
+    async def _emprestimos_do_usuario(self, consulta: dict, usuario_id: int) -> Resposta:
+        ativos = consulta.get('ativos', '').lower() in ('1', 'true', 'sim')
+        emprestimos = await self._executar(self.biblioteca.emprestimos_do_usuario, usuario_id, ativos)
+        return 200, [emprestimo.to_dict() for emprestimo in emprestimos]
+
+    async def _listar_emprestimos(self, consulta: dict) -> Resposta:
+        return 200, await self._executar(self._coletar, 'emprestimos', *self._paginacao(consulta))
+
+    async def _realizar_emprestimo(self, dados: dict) -> Resposta:
+        usuario_id, livro_id = self._campos(dados, 'usuario_id', 'livro_id')
+        try:
+            emprestimo = await self._executar(self._alterar, self.biblioteca.realizar_emprestimo,
+                                              self._ultimo('emprestimos'), usuario_id, livro_id)
+        except (TypeError, ValueError):
+            raise ErroRequisicao(400, 'IDs inválidos')
+        if emprestimo is None:
+            raise ErroRequisicao(409, 'Usuário ou livro inexistente, ou livro indisponível')
+        return 201, emprestimo
+
+    async def _devolver_livro(self, dados: dict, emprestimo_id: int) -> Resposta:
+        emprestimo = await self._executar(self._alterar, self.biblioteca.devolver_livro,
+                                          lambda: self.biblioteca._emprestimos_por_id[emprestimo_id], emprestimo_id)
+        if emprestimo is None:
+            raise ErroRequisicao(409, 'Empréstimo inexistente ou já devolvido')
+        return 200, emprestimo
+
+    async def _reservas_do_usuario(self, consulta: dict, usuario_id: int) -> Resposta:
+        reservas = await self._executar(self.biblioteca.reservas_do_usuario, usuario_id)
+        return 200, [reserva.to_dict() for reserva in reservas]
+
+    async def _reservar_livro(self, dados: dict) -> Resposta:
+        usuario_id, livro_id = self._campos(dados, 'usuario_id', 'livro_id')
+        try:
+            reserva = await self._executar(self._alterar, self.biblioteca.reservar_livro,
+                                           self._ultimo('reservas'), usuario_id, livro_id)
+        except (TypeError, ValueError):
+            raise ErroRequisicao(400, 'IDs inválidos')
+        if reserva is None:
+            raise ErroRequisicao(409, 'Usuário ou livro inexistente, livro disponível ou já reservado')
+        return 201, reserva
+
+    async def _cancelar_reserva(self, dados: dict, reserva_id: int) -> Resposta:
+        reserva = await self._executar(self._alterar, self.biblioteca.cancelar_reserva,
+                                       lambda: self.biblioteca._reservas_por_id[reserva_id], reserva_id)
+        if reserva is None:
+            raise ErroRequisicao(409, 'Reserva inexistente ou fora da fila')
+        return 200, reserva
+
+    @staticmethod
+    def _campos(dados: dict, *nomes: str) -> list:
+        faltando = [nome for nome in nomes if nome not in dados]
+        if faltando:
+            raise ErroRequisicao(400, f"Campos obrigatórios ausentes: {', '.join(faltando)}")
+        return [dados[nome] for nome in nomes]
+
+    @staticmethod
+    def _exigir_textos(valores: list) -> None:
+        if not all(isinstance(valor, str) for valor in valores):
+            raise ErroRequisicao(400, 'Campos de texto inválidos')
+
+    @staticmethod
+    def _paginacao(consulta: dict) -> Tuple[Optional[int], Optional[int], str]:
+        """Cursor (?apos=), tamanho (?limite=) e ordem (?ordem=) de uma listagem."""
+        try:
+            apos = int(consulta['apos']) if 'apos' in consulta else None
+            limite = int(consulta['limite']) if 'limite' in consulta else None
+        except ValueError:
+            raise ErroRequisicao(400, 'Paginação inválida')
+        ordem = consulta.get('ordem', 'crescente')
+        if (limite is not None and limite < 0) or ordem not in ORDENS:
+            raise ErroRequisicao(400, 'Paginação inválida')
+        return apos, limite, ordem
+
+    def _coletar(self, colecao: str, apos: Optional[int] = None, limite: Optional[int] = None,
+                 ordem: str = 'crescente') -> List[dict]:
+        """
+        Serializa uma coleção. Com cursor, limite ou ordem, devolve só a
+        página pedida (via iterar_*); sem eles, a coleção inteira a partir de
+        um instantâneo, sem segurar as escritas durante a serialização.
+        """
+        if apos is not None or limite is not None or ordem != 'crescente':
+            iterar = getattr(self.biblioteca, f'iterar_{colecao}')
+            return [item.to_dict() for item in iterar(apos, limite, ordem)]
+        return list(getattr(self.biblioteca.instantaneo(), colecao)())
+
+
+def main():
+    """Sobe o servidor a partir da linha de comando."""
+    parser = argparse.ArgumentParser(description="Servidor HTTP/JSON da biblioteca")
+    parser.add_argument('--arquivo', default='biblioteca.json')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8080)
+    argumentos = parser.parse_args()
+
+    biblioteca = Biblioteca(argumentos.arquivo, concorrente=True, confirmacao_em_grupo=True)
+    biblioteca.carregar_dados()
+    servidor = ServidorBiblioteca(biblioteca, argumentos.host, argumentos.porta)
+
+    print(f"Servidor da biblioteca em http://{argumentos.host}:{argumentos.porta}")
+    try:
+        asyncio.run(servidor.servir_para_sempre())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
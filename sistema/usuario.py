@@ -1,4 +1,7 @@
 class Usuario:
+    # atributos fixos: sem __dict__ por instância, bem menor em memória
+    __slots__ = ('id', 'nome', 'email', 'telefone', 'ativo')
+
     def __init__(self, id_usuario, nome, email, telefone):
         self.id = id_usuario
         self.nome = nome
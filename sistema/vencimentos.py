@@ -0,0 +1,222 @@
+"""
+Vencimentos
+Índice de prazos de devolução dos empréstimos em aberto e agendador que
+avisa quando eles passam a estar atrasados
+"""
+
+import threading
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    from sistema.biblioteca_poo import Biblioteca
+
+
+class _HeapIndexado:
+    """
+    Heap binário de (prioridade, chave) que guarda a posição de cada chave,
+    para que remover uma chave qualquer custe O(log n) e o heap só contenha
+    entradas vivas.
+    """
+
+    def __init__(self):
+        self.entradas: List[Tuple[int, int]] = []
+        self._posicoes: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.entradas)
+
+    def __contains__(self, chave: int) -> bool:
+        return chave in self._posicoes
+
+    def limpar(self) -> None:
+        self.entradas.clear()
+        self._posicoes.clear()
+
+    def inserir(self, chave: int, prioridade: int) -> None:
+        """Insere a chave (ou troca sua prioridade). O(log n)."""
+        self.remover(chave)
+        self.entradas.append((prioridade, chave))
+        self._subir(len(self.entradas) - 1)
+
+    def remover(self, chave: int) -> bool:
+        """Retira a chave, se estiver no heap. O(log n)."""
+        posicao = self._posicoes.pop(chave, None)
+        if posicao is None:
+            return False
+        ultima = self.entradas.pop()
+        if posicao < len(self.entradas):
+            # A última entrada ocupa o lugar da removida e desce ou sobe
+            self.entradas[posicao] = ultima
+            self._descer(posicao)
+            self._subir(self._posicoes[ultima[1]])
+        return True
+
+    def retirar(self) -> Tuple[int, int]:
+        """Retira e retorna a entrada de menor prioridade. O(log n)."""
+        topo = self.entradas[0]
+        self.remover(topo[1])
+        return topo
+
+    def _subir(self, posicao: int) -> None:
+        entradas = self.entradas
+        entrada = entradas[posicao]
+        while posicao:
+            pai = (posicao - 1) >> 1
+            if entradas[pai] <= entrada:
+                break
+            entradas[posicao] = entradas[pai]
+            self._posicoes[entradas[posicao][1]] = posicao
+            posicao = pai
+        entradas[posicao] = entrada
+        self._posicoes[entrada[1]] = posicao
+
+    def _descer(self, posicao: int) -> None:
+        entradas = self.entradas
+        tamanho = len(entradas)
+        entrada = entradas[posicao]
+        while True:
+            filho = 2 * posicao + 1
+            if filho >= tamanho:
+                break
+            if filho + 1 < tamanho and entradas[filho + 1] < entradas[filho]:
+                filho += 1
+            if entrada <= entradas[filho]:
+                break
+            entradas[posicao] = entradas[filho]
+            self._posicoes[entradas[posicao][1]] = posicao
+            posicao = filho
+        entradas[posicao] = entrada
+        self._posicoes[entrada[1]] = posicao
+
+
+class IndiceVencimentos:
+    """
+    Heap de (vencimento, emprestimo_id) dos empréstimos em aberto.
+
+    Os vencimentos são inteiros comparáveis (microssegundos desde a época).
+    O heap é indexado pelo ID: a devolução retira a entrada na hora, em
+    O(log n), e o heap só tem empréstimos em aberto.
+
+    Um segundo heap guarda os empréstimos ainda não avisados; vencidos() os
+    retira conforme o prazo passa, para que cada atraso seja avisado uma vez.
+    Os avisos já dados ficam registrados à parte só enquanto o empréstimo
+    está em aberto. Os de empréstimos que saíram do índice (devolvidos, ou
+    retirados por limpar()) são guardados até o próximo vencidos(): desfazer
+    um lote ou reconstruir os índices, que os acrescentam de novo antes
+    disso, não repete avisos.
+    """
+
+    def __init__(self):
+        self._heap = _HeapIndexado()
+        self._avisos = _HeapIndexado()
+        # emprestimo_id -> vencimento já avisado, dos empréstimos em aberto
+        self._avisados: Dict[int, int] = {}
+        # O mesmo, dos que saíram do índice desde o último vencidos()
+        self._avisados_soltos: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def adicionar(self, emprestimo_id: int, vencimento: int) -> None:
+        """Passa a acompanhar o prazo de um empréstimo em aberto. O(log n)."""
+        self._heap.inserir(emprestimo_id, vencimento)
+        avisado = self._avisados_soltos.pop(emprestimo_id, None)
+        if avisado is not None:
+            self._avisados[emprestimo_id] = avisado
+        if self._avisados.get(emprestimo_id) != vencimento:
+            self._avisos.inserir(emprestimo_id, vencimento)
+
+    def remover(self, emprestimo_id: int) -> None:
+        """Deixa de acompanhar o empréstimo (devolvido). O(log n)."""
+        self._heap.remover(emprestimo_id)
+        self._avisos.remover(emprestimo_id)
+        avisado = self._avisados.pop(emprestimo_id, None)
+        if avisado is not None:
+            self._avisados_soltos[emprestimo_id] = avisado
+
+    def limpar(self) -> None:
+        """Esvazia os heaps; os avisos já dados ficam guardados até o próximo vencidos()."""
+        self._heap.limpar()
+        self._avisos.limpar()
+        self._avisados_soltos.update(self._avisados)
+        self._avisados = {}
+
+    def atrasados(self, limite: int) -> List[int]:
+        """
+        IDs dos empréstimos com vencimento anterior a `limite`, do mais antigo
+        ao mais recente.
+
+        Percorre só o topo do heap cujos nós vencem antes do limite (os filhos
+        de um nó nunca vencem antes dele). Como o heap só tem entradas vivas,
+        visita no máximo 2k + 1 nós e ordena os k encontrados: O(k log k).
+        """
+        entradas = self._heap.entradas
+        encontrados = []
+        pilha = [0] if entradas else []
+        while pilha:
+            posicao = pilha.pop()
+            entrada = entradas[posicao]
+            if entrada[0] >= limite:
+                continue
+            encontrados.append(entrada)
+            filho = 2 * posicao + 1
+            if filho < len(entradas):
+                pilha.append(filho)
+            if filho + 1 < len(entradas):
+                pilha.append(filho + 1)
+        encontrados.sort()
+        return [emprestimo_id for _, emprestimo_id in encontrados]
+
+    def vencidos(self, limite: int) -> List[int]:
+        """Retira e retorna os empréstimos que venceram antes de `limite` e ainda não foram avisados."""
+        # Quem não voltou ao índice até aqui não precisa mais do registro
+        self._avisados_soltos.clear()
+        novos = []
+        avisos = self._avisos
+        while avisos and avisos.entradas[0][0] < limite:
+            vencimento, emprestimo_id = avisos.retirar()
+            self._avisados[emprestimo_id] = vencimento
+            novos.append(emprestimo_id)
+        return novos
+
+
+class AgendadorAtrasos:
+    """
+    Chama biblioteca.verificar_atrasos() a cada `intervalo` segundos em uma
+    thread de fundo, disparando os callbacks de biblioteca.ao_atrasar().
+
+    Uso:
+        with AgendadorAtrasos(biblioteca, intervalo=60):
+            ...
+    """
+
+    def __init__(self, biblioteca: 'Biblioteca', intervalo: float = 60.0):
+        self.biblioteca = biblioteca
+        self.intervalo = intervalo
+        self._parar = threading.Event()
+        self._thread = None
+
+    def iniciar(self) -> None:
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executar, name='agendador-atrasos', daemon=True)
+        self._thread.start()
+
+    def _executar(self) -> None:
+        while not self._parar.wait(self.intervalo):
+            try:
+                self.biblioteca.verificar_atrasos()
+            except Exception as e:
+                print(f"Erro ao verificar atrasos: {e}")
+
+    def parar(self) -> None:
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'AgendadorAtrasos':
+        self.iniciar()
+        return self
+
+    def __exit__(self, *excecao) -> None:
+        self.parar()
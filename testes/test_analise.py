@@ -0,0 +1,93 @@
+import sys
+import os
+import unittest
+
+# adiciona a pasta "sistema" ao path para o Python encontrar o módulo biblioteca
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema.biblioteca_poo import Biblioteca
+from sistema.armazenamento import ArmazenamentoNulo
+from sistema.analise import AnaliseEmprestimos, np
+
+
+@unittest.skipIf(np is None, "numpy não instalado")
+class TestAnaliseEmprestimos(unittest.TestCase):
+    """Testes da análise colunar dos empréstimos."""
+
+    def setUp(self):
+        """Executa antes de cada teste para criar uma biblioteca em memória."""
+        self.biblioteca = Biblioteca(armazenamento=ArmazenamentoNulo())
+        with self.biblioteca.lote():
+            for i in range(1, 6):
+                self.biblioteca.adicionar_livro(f"Livro {i}", "Autor", f"123456789{i}", 2000)
+            for i in range(1, 4):
+                self.biblioteca.cadastrar_usuario(f"Usuário {i}", f"user{i}@example.com", "123")
+        self.analise = AnaliseEmprestimos(self.biblioteca)
+
+    def _emprestar(self, usuario_id, livro_id, inicio, fim=None):
+        """Empresta (e opcionalmente devolve) com datas fixas."""
+        self.biblioteca.realizar_emprestimo(usuario_id, livro_id)
+        emprestimo = self.biblioteca.emprestimo_atual_do_livro(livro_id)
+        emprestimo.data_emprestimo = inicio
+        if fim:
+            self.biblioteca.devolver_livro(emprestimo.id)
+            emprestimo.data_devolucao = fim
+
+    def test_agregacoes(self):
+        """Ranking, meses e duração média devem refletir o histórico."""
+        self._emprestar(1, 1, '2024-01-05T10:00:00', '2024-01-15T10:00:00')
+        self._emprestar(2, 1, '2024-01-20T10:00:00', '2024-01-24T10:00:00')
+        self._emprestar(1, 2, '2024-02-01T10:00:00')
+        self._emprestar(1, 1, '2024-03-01T10:00:00')
+
+        self.assertEqual(self.analise.livros_mais_emprestados(2), [(1, 3), (2, 1)])
+        self.assertEqual(self.analise.usuarios_mais_ativos(), [(1, 3), (2, 1)])
+        self.assertEqual(self.analise.emprestimos_por_mes(), [('2024-01', 2), ('2024-02', 1), ('2024-03', 1)])
+        self.assertAlmostEqual(self.analise.duracao_media_dias(), 7.0)
+
+    def test_atualizacao_incremental(self):
+        """Empréstimos e devoluções novos devem entrar sem reconstruir as colunas."""
+        self._emprestar(1, 1, '2024-01-05T10:00:00')
+        self.assertIsNone(self.analise.duracao_media_dias())
+        colunas = self.analise._usuario
+
+        self.biblioteca.devolver_livro(1)
+        self.biblioteca._emprestimos_por_id[1].data_devolucao = '2024-01-07T10:00:00'
+        self._emprestar(2, 2, '2024-01-06T10:00:00')
+        self.assertAlmostEqual(self.analise.duracao_media_dias(), 2.0)
+        self.assertEqual(self.analise.usuarios_mais_ativos(), [(1, 1), (2, 1)])
+        self.assertIs(self.analise._usuario, colunas, msg="Falha: colunas realocadas sem necessidade.")
+
+    def test_crescimento_e_recarga(self):
+        """As colunas devem crescer além da capacidade inicial e ser refeitas após nova carga."""
+        self.biblioteca.adicionar_livro("Livro X", "Autor", "9999999999", 2000)
+        for _ in range(1500):
+            self.biblioteca.realizar_emprestimo(3, 6)
+            self.biblioteca.devolver_livro(self.biblioteca.emprestimo_atual_do_livro(6).id)
+        self.assertEqual(self.analise.livros_mais_emprestados(1), [(6, 1500)])
+
+        self.biblioteca._limpar_dados()
+        self.assertEqual(self.analise.livros_mais_emprestados(), [])
+        self.assertEqual(self.analise.emprestimos_por_mes(), [])
+
+
+    def test_devolucao_desfeita_reabre_o_emprestimo(self):
+        """Uma devolução desfeita por um lote que falhou deve voltar a aparecer em aberto."""
+        self._emprestar(1, 1, '2024-01-05T10:00:00')
+        self.assertEqual(self.analise.colunas()['devolvido'].tolist(), [False])
+
+        with self.assertRaises(RuntimeError):
+            with self.biblioteca.lote():
+                self.biblioteca.devolver_livro(1)
+                self.assertEqual(self.analise.colunas()['devolvido'].tolist(), [True])
+                raise RuntimeError("desfazer")
+        self.assertFalse(self.biblioteca._emprestimos_por_id[1].devolvido)
+        self.assertEqual(self.analise.colunas()['devolvido'].tolist(), [False],
+                         msg="Falha: a coluna manteve a devolução desfeita.")
+
+        self.biblioteca.devolver_livro(1)
+        self.assertEqual(self.analise.colunas()['devolvido'].tolist(), [True],
+                         msg="Falha: devolução após o lote desfeito não registrada.")
+
+if __name__ == "__main__":
+    unittest.main()
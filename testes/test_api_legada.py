@@ -0,0 +1,174 @@
+import sys
+import os
+import io
+import json
+import unittest
+from contextlib import redirect_stdout
+
+# adiciona a pasta "sistema" ao path para o Python encontrar o módulo biblioteca
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema.armazenamento import ArmazenamentoNulo
+from sistema.biblioteca_poo import Biblioteca
+
+
+ARQUIVOS_TESTE = ("test_api_legada.json", "test_api_legada.db",
+                  "test_api_legada.db-wal", "test_api_legada.db-shm")
+
+
+class TestApiLegada(unittest.TestCase):
+    """Testes da API estática antiga sobre a instância compartilhada."""
+
+    def setUp(self):
+        """Executa antes de cada teste para limpar os dados."""
+        self.tearDown()
+        Biblioteca._instancia_legada = None
+
+    def tearDown(self):
+        """Executa após cada teste para limpar."""
+        for arquivo in ARQUIVOS_TESTE:
+            if os.path.exists(arquivo):
+                os.remove(arquivo)
+
+    def _popular(self):
+        self.assertTrue(Biblioteca.adicionarLivro("Dom Casmurro", "Machado de Assis", "1234567890123", 1899))
+        self.assertTrue(Biblioteca.adicionarLivro("Vidas Secas", "Graciliano Ramos", "1234567890", 1938))
+        self.assertTrue(Biblioteca.cadastrarUsuario("Ana", "ana@example.com", "123"))
+
+    def test_fluxo_estatico(self):
+        """Cadastro, empréstimo e devolução devem refletir nas listas da classe."""
+        self._popular()
+        self.assertFalse(Biblioteca.adicionarLivro("Outro", "Autor", "1234567890123", 2000),
+                         msg="Falha: ISBN duplicado deveria ser recusado.")
+        self.assertFalse(Biblioteca.cadastrarUsuario("Bia", "ana@example.com", "1"),
+                         msg="Falha: email duplicado deveria ser recusado.")
+
+        self.assertTrue(Biblioteca.realizarEmprestimo(1, 1))
+        self.assertFalse(Biblioteca.realizarEmprestimo(1, 1), msg="Falha: livro emprestado deveria ser recusado.")
+        self.assertFalse(Biblioteca.livros[0]['disponivel'], msg="Falha: o livro deveria aparecer emprestado.")
+
+        self.assertTrue(Biblioteca.devolverLivro(1))
+        self.assertFalse(Biblioteca.devolverLivro(1), msg="Falha: devolução repetida deveria ser recusada.")
+        self.assertTrue(Biblioteca.livros[0]['disponivel'], msg="Falha: o livro deveria voltar a estar disponível.")
+
+        self.assertEqual([u['ativo'] for u in Biblioteca.usuarios], [True], msg="Falha: formato antigo de usuário.")
+        self.assertEqual((Biblioteca.contador_livros, Biblioteca.contador_usuarios), (3, 2),
+                         msg="Falha: contadores deveriam indicar o próximo ID.")
+
+    def test_ids_de_emprestimo_nao_colidem(self):
+        """Os IDs de empréstimo devem vir do contador, não do tamanho da lista."""
+        self._popular()
+        Biblioteca.realizarEmprestimo(1, 1)
+        Biblioteca.realizarEmprestimo(1, 2)
+        Biblioteca.emprestimos = Biblioteca.emprestimos[1:]
+        Biblioteca.devolverLivro(2)
+        self.assertTrue(Biblioteca.realizarEmprestimo(1, 2))
+        ids = [emprestimo['id'] for emprestimo in Biblioteca.emprestimos]
+        self.assertEqual(ids, [2, 3], msg="Falha: IDs de empréstimo repetidos.")
+
+    def test_salvar_e_carregar(self):
+        """salvarDados/carregarDados devem usar o armazenamento da API de objetos."""
+        self._popular()
+        Biblioteca.realizarEmprestimo(1, 2)
+        Biblioteca.salvarDados("test_api_legada.db")
+        Biblioteca.livros = []
+        self.assertEqual(Biblioteca.livros, [], msg="Falha: atribuir a lista deveria substituir a coleção.")
+
+        Biblioteca.carregarDados("test_api_legada.db")
+        self.assertEqual(len(Biblioteca.livros), 2, msg="Falha: livros não carregados.")
+        self.assertFalse(Biblioteca.livros[1]['disponivel'], msg="Falha: empréstimo não refletido no livro.")
+
+        objetos = Biblioteca("test_api_legada.db")
+        objetos.carregar_dados()
+        objetos._armazenamento.fechar()
+        self.assertEqual(objetos.buscar_usuario_por_id(1).email, "ana@example.com",
+                         msg="Falha: o arquivo deveria ser legível pela API de objetos.")
+
+    def test_carrega_arquivo_do_formato_antigo(self):
+        """Arquivos antigos guardavam contador_livros/contador_usuarios (próximo ID)."""
+        with open("test_api_legada.json", "w", encoding="utf-8") as f:
+            json.dump({
+                'livros': [{'id': 1, 'titulo': 'A', 'autor': 'B', 'isbn': '1234567890', 'ano': 2000, 'disponivel': True}],
+                'usuarios': [{'id': 1, 'nome': 'Ana', 'email': 'ana@example.com', 'telefone': '1', 'ativo': True}],
+                'emprestimos': [],
+                'contador_livros': 5,
+                'contador_usuarios': 2,
+            }, f)
+        Biblioteca.carregarDados("test_api_legada.json")
+        self.assertEqual(Biblioteca.contador_livros, 5, msg="Falha: contador antigo não restaurado.")
+        Biblioteca.adicionarLivro("C", "D", "1234567890123", 2001)
+        self.assertEqual(Biblioteca.livros[-1]['id'], 5, msg="Falha: próximo ID de livro incorreto.")
+
+    def test_carrega_livro_sem_ano(self):
+        """Um livro antigo com "ano": null deve ser relatado e ignorado, sem impedir a carga dos demais."""
+        with open("test_api_legada.json", "w", encoding="utf-8") as f:
+            json.dump({
+                'livros': [{'id': 1, 'titulo': 'A', 'autor': 'B', 'isbn': '1234567890', 'ano': None, 'disponivel': True},
+                           {'id': 2, 'titulo': 'C', 'autor': 'D', 'isbn': '1234567890123', 'ano': 2001}],
+                'usuarios': [{'id': 1, 'nome': 'Ana', 'email': 'ana@example.com', 'telefone': '1', 'ativo': True}],
+                'emprestimos': [],
+                'contador_livros': 3,
+                'contador_usuarios': 2,
+            }, f)
+        with redirect_stdout(io.StringIO()) as saida:
+            Biblioteca.carregarDados("test_api_legada.json")
+        self.assertIn("Livro 1 ignorado", saida.getvalue(), msg="Falha: o livro inválido não foi relatado.")
+        self.assertEqual([livro['id'] for livro in Biblioteca.livros], [2], msg="Falha: os demais livros não foram carregados.")
+        self.assertEqual(len(Biblioteca.usuarios), 1)
+
+        objetos = Biblioteca("test_api_legada.json")
+        with redirect_stdout(io.StringIO()):
+            objetos.carregar_dados()
+        self.assertIsNotNone(objetos.buscar_livro_por_id(2), msg="Falha: carregar_dados abortou no livro inválido.")
+
+    def test_atributos_por_instancia(self):
+        """Como os atributos de classe de antes, os atributos devem ser acessíveis por uma instância."""
+        self._popular()
+        instancia = Biblioteca(armazenamento=ArmazenamentoNulo())
+        self.assertEqual([livro['id'] for livro in instancia.livros], [1, 2], msg="Falha: livros pela instância.")
+        self.assertEqual(len(instancia.usuarios), 1)
+        self.assertEqual(instancia.emprestimos, [])
+        self.assertEqual((instancia.contador_livros, instancia.contador_usuarios), (3, 2),
+                         msg="Falha: contadores pela instância.")
+        instancia.livros = []
+        self.assertEqual(len(Biblioteca.livros), 0, msg="Falha: atribuir pela instância deveria substituir a coleção.")
+
+    def test_listas_sao_list_e_dict(self):
+        """As coleções devem ser list/dict de verdade; append, clear e 'disponivel' alteram a biblioteca."""
+        self._popular()
+        self.assertEqual(json.loads(json.dumps(Biblioteca.livros))[0]['titulo'], "Dom Casmurro",
+                         msg="Falha: a lista deveria ser serializável em JSON.")
+        self.assertEqual(json.loads(json.dumps(Biblioteca.usuarios[0]))['ativo'], True)
+
+        Biblioteca.livros[0]['disponivel'] = False
+        self.assertFalse(Biblioteca._legada().buscar_livro_por_id(1).disponivel, msg="Falha: alteração descartada.")
+        self.assertFalse(Biblioteca.realizarEmprestimo(1, 1), msg="Falha: livro marcado indisponível foi emprestado.")
+
+        livros = Biblioteca.livros
+        livros.append({'titulo': 'Novo', 'autor': 'Autor', 'isbn': '9876543210', 'ano': 2001})
+        self.assertEqual(livros[-1]['id'], 3, msg="Falha: append deveria receber o próximo ID.")
+        self.assertEqual(Biblioteca.contador_livros, 4)
+        self.assertTrue(Biblioteca.realizarEmprestimo(1, 3), msg="Falha: livro acrescentado não foi registrado.")
+        with self.assertRaises(ValueError):
+            Biblioteca.livros.append({'id': 3, 'titulo': 'X', 'autor': 'Y', 'isbn': '1111111111', 'ano': 2001})
+
+        registro = Biblioteca.livros[0]
+        registro['titulo'] = 'Outro'
+        self.assertEqual(registro['titulo'], 'Outro', msg="Falha: a cópia deveria aceitar a alteração.")
+        self.assertEqual(Biblioteca.livros[0]['titulo'], 'Dom Casmurro', msg="Falha: o título só muda na cópia.")
+
+        Biblioteca.usuarios.clear()
+        self.assertEqual(Biblioteca.usuarios, [], msg="Falha: clear() deveria esvaziar a coleção.")
+        self.assertEqual(len(Biblioteca.livros), 3)
+
+    def test_instancia_compartilhada_nao_afeta_outras(self):
+        """Criar a instância compartilhada não deve repetir IDs de outra biblioteca."""
+        biblioteca = Biblioteca(armazenamento=ArmazenamentoNulo())
+        biblioteca.adicionar_livro("Livro A", "Autor", "1234567890123", 2000)
+        Biblioteca.livros
+        biblioteca.adicionar_livro("Livro B", "Autor", "1234567890", 2000)
+        self.assertEqual([livro.id for livro in biblioteca._livros_obj], [1, 2], msg="Falha: IDs repetidos.")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import sys
+import os
+import unittest
+
+# adiciona a pasta "sistema" ao path para o Python encontrar o módulo biblioteca
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema.biblioteca_poo import Biblioteca
+from sistema.armazenamento import (
+    ArmazenamentoDiario, ArmazenamentoJSON, ArmazenamentoJSONL, ArmazenamentoSQLite, criar_armazenamento
+)
+
+
+ARQUIVOS_TESTE = ("test_armazenamento.db", "test_armazenamento.db-wal",
+                  "test_armazenamento.db-shm", "test_armazenamento.json",
+                  "test_armazenamento.jsonl", "test_armazenamento.jsonl.diario")
+
+
+class TestArmazenamento(unittest.TestCase):
+    """Testes dos mecanismos de armazenamento da biblioteca."""
+
+    def setUp(self):
+        """Executa antes de cada teste para limpar os arquivos."""
+        self.tearDown()
+
+    def tearDown(self):
+        """Executa após cada teste para limpar."""
+        for arquivo in ARQUIVOS_TESTE:
+            if os.path.exists(arquivo):
+                os.remove(arquivo)
+
+    def test_extensao_escolhe_armazenamento(self):
+        """A extensão do arquivo deve escolher o armazenamento."""
+        sqlite = criar_armazenamento("test_armazenamento.db")
+        self.assertIsInstance(sqlite, ArmazenamentoSQLite, msg="Falha: .db deveria usar SQLite.")
+        sqlite.fechar()
+        self.assertIsInstance(criar_armazenamento("test_armazenamento.json"), ArmazenamentoJSON, msg="Falha: .json deveria usar JSON.")
+
+    def test_sqlite_salva_e_carrega_operacoes(self):
+        """O SQLite deve persistir livros, usuários, empréstimos e devoluções."""
+        biblioteca = Biblioteca("test_armazenamento.db")
+        biblioteca.adicionar_livro("Livro A", "Autor A", "1234567890123", 2024)
+        biblioteca.adicionar_livro("Livro B", "Autor B", "1234567890", 2020)
+        biblioteca.cadastrar_usuario("Usuário A", "user@example.com", "123")
+        biblioteca.realizar_emprestimo(1, 1)
+        biblioteca.realizar_emprestimo(1, 2)
+        biblioteca.devolver_livro(2)
+        biblioteca._armazenamento.fechar()
+
+        nova_biblioteca = Biblioteca("test_armazenamento.db")
+        nova_biblioteca.carregar_dados()
+        nova_biblioteca._armazenamento.fechar()
+
+        self.assertEqual(len(nova_biblioteca._livros_obj), 2, msg="Falha: livros não carregados do SQLite.")
+        self.assertEqual(len(nova_biblioteca._usuarios_obj), 1, msg="Falha: usuário não carregado do SQLite.")
+        self.assertFalse(nova_biblioteca.buscar_livro_por_id(1).disponivel, msg="Falha: o livro emprestado aparece disponível.")
+        self.assertTrue(nova_biblioteca.buscar_livro_por_id(2).disponivel, msg="Falha: o livro devolvido aparece emprestado.")
+        self.assertTrue(nova_biblioteca._emprestimos_obj[1].devolvido, msg="Falha: a devolução não foi persistida.")
+
+    def test_sqlite_lote_desfeito_nao_grava(self):
+        """Um lote desfeito não deve deixar linhas no SQLite."""
+        biblioteca = Biblioteca("test_armazenamento.db")
+        with self.assertRaises(RuntimeError):
+            with biblioteca.lote():
+                biblioteca.adicionar_livro("Livro A", "Autor A", "1234567890123", 2024)
+                raise RuntimeError("falha simulada")
+        biblioteca.carregar_dados()
+        biblioteca._armazenamento.fechar()
+        self.assertEqual(len(biblioteca._livros_obj), 0, msg="Falha: o lote desfeito foi gravado.")
+
+    def test_metodos_estaticos_aceitam_arquivo(self):
+        """salvarDados/carregarDados devem aceitar o caminho do arquivo."""
+        Biblioteca.salvarDados("test_armazenamento.json")
+        self.assertTrue(os.path.exists("test_armazenamento.json"), msg="Falha: o arquivo informado não foi gravado.")
+        Biblioteca.carregarDados("test_armazenamento.json")
+
+    def test_jsonl_salva_e_carrega_com_progresso(self):
+        """O formato JSON Lines deve ser lido em fluxo e informar o progresso."""
+        biblioteca = Biblioteca("test_armazenamento.jsonl")
+        self.assertIsInstance(biblioteca._armazenamento, ArmazenamentoJSONL, msg="Falha: .jsonl deveria usar JSON Lines.")
+        with biblioteca.lote():
+            biblioteca.adicionar_livro("O Senhor dos Anéis", "J. R. R. Tolkien", "1234567890123", 1954)
+            biblioteca.cadastrar_usuario("Usuário A", "user@example.com", "123")
+            biblioteca.realizar_emprestimo(1, 1)
+
+        with open("test_armazenamento.jsonl", encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 4, msg="Falha: deveria haver uma linha de contadores e uma por registro.")
+
+        chamadas = []
+        nova_biblioteca = Biblioteca("test_armazenamento.jsonl")
+        nova_biblioteca.carregar_dados(progresso=lambda lidos, total: chamadas.append((lidos, total)))
+
+        tamanho = os.path.getsize("test_armazenamento.jsonl")
+        self.assertEqual(chamadas[-1], (tamanho, tamanho), msg="Falha: o progresso final não cobre o arquivo inteiro.")
+        self.assertEqual(nova_biblioteca.buscar_livro_por_id(1).titulo, "O Senhor dos Anéis", msg="Falha: o livro não foi carregado.")
+        self.assertFalse(nova_biblioteca.buscar_livro_por_id(1).disponivel, msg="Falha: o empréstimo não foi refletido no livro.")
+        self.assertTrue(nova_biblioteca.adicionar_livro("Outro", "Autor", "1234567890", 2000), msg="Falha: os contadores não foram restaurados.")
+        self.assertEqual(nova_biblioteca._livros_obj[-1].id, 2, msg="Falha: o próximo ID de livro está incorreto.")
+
+    def test_diario_sobre_jsonl(self):
+        """O diário deve funcionar com um instantâneo JSON Lines."""
+        biblioteca = Biblioteca("test_armazenamento.jsonl", usar_diario=True)
+        self.assertIsInstance(biblioteca._armazenamento, ArmazenamentoDiario, msg="Falha: usar_diario deveria usar o diário.")
+        biblioteca.adicionar_livro("Livro A", "Autor A", "1234567890123", 2024)
+        biblioteca.compactar_diario()
+        biblioteca.adicionar_livro("Livro B", "Autor B", "1234567890", 2024)
+
+        nova_biblioteca = Biblioteca("test_armazenamento.jsonl", usar_diario=True)
+        nova_biblioteca.carregar_dados()
+        self.assertEqual(len(nova_biblioteca._livros_obj), 2, msg="Falha: instantâneo e diário não foram combinados.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,40 @@
 import sys
 import os
 import unittest
+from datetime import datetime
 
 # adiciona a pasta "sistema" ao path para o Python encontrar o módulo biblioteca
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from sistema.armazenamento import ArmazenamentoNulo
 from sistema.biblioteca_poo import Biblioteca, Livro, Usuario, Emprestimo
 #from sistema.biblioteca import Biblioteca, Livro, Usuario, Emprestimo
 
 
+def _estado_dos_indices(biblioteca):
+    """Conteúdo comparável de todos os índices da biblioteca."""
+    ids = lambda objetos: [objeto.id for objeto in objetos]
+    return {
+        'livros': sorted(biblioteca._livros_por_id), 'isbns': sorted(biblioteca._livros_por_isbn),
+        'usuarios': sorted(biblioteca._usuarios_por_id), 'emails': sorted(biblioteca._usuarios_por_email),
+        'emprestimos': sorted(biblioteca._emprestimos_por_id),
+        'ordenados': [list(indice._chaves) for indice in (
+            biblioteca._ids_livros, biblioteca._ids_usuarios, biblioteca._ids_emprestimos,
+            biblioteca._livros_por_ano, biblioteca._livros_por_autor)],
+        'textual': dict(biblioteca._indice_textual._postagens),
+        'por_usuario': {chave: ids(lista) for chave, lista in biblioteca._emprestimos_por_usuario.items()},
+        'por_livro': {chave: ids(lista) for chave, lista in biblioteca._emprestimos_por_livro.items()},
+        'ativos': sorted(biblioteca._emprestimos_ativos),
+        'ativos_por_usuario': {chave: sorted(ativos) for chave, ativos in biblioteca._ativos_por_usuario.items()},
+        'ativo_por_livro': {chave: emprestimo.id for chave, emprestimo in biblioteca._ativo_por_livro.items()},
+        'vencimentos': sorted(biblioteca._indice_vencimentos._heap.entradas),
+        'reservas': sorted(biblioteca._reservas_por_id),
+        'filas': {livro_id: ids(biblioteca.fila_do_livro(livro_id)) for livro_id in biblioteca._fila_por_livro},
+        'reservas_por_usuario': {chave: ids(reservas.values())
+                                 for chave, reservas in biblioteca._reservas_por_usuario.items()},
+    }
+
+
 class TestBiblioteca(unittest.TestCase):
     """Testes para as funcionalidades da biblioteca usando POO."""
 
@@ -28,8 +54,9 @@ class TestBiblioteca(unittest.TestCase):
 
     def tearDown(self):
         """Executa após cada teste para limpar."""
-        if os.path.exists("test_biblioteca.json"):
-            os.remove("test_biblioteca.json")
+        for arquivo in ("test_biblioteca.json", "test_biblioteca.json.diario"):
+            if os.path.exists(arquivo):
+                os.remove(arquivo)
 
     # -------- TESTES DE FUNCIONALIDADES --------
 
@@ -103,6 +130,195 @@ class TestBiblioteca(unittest.TestCase):
         resultado = self.biblioteca.realizar_emprestimo(1, 99)  # Livro 99 não existe
         self.assertFalse(resultado, msg="Falha: empréstimo realizado para livro inexistente.")
 
+    def test_nao_adicionar_livro_com_isbn_duplicado(self):
+        """Não deve permitir dois livros com o mesmo ISBN."""
+        self.biblioteca.adicionar_livro("Livro A", "Autor A", "1234567890123", 2024)
+        resultado = self.biblioteca.adicionar_livro("Livro B", "Autor B", "1234567890123", 2024)
+        self.assertFalse(resultado, msg="Falha: livro com ISBN duplicado foi adicionado.")
+
+    def test_nao_cadastrar_usuario_com_email_duplicado(self):
+        """Não deve permitir dois usuários com o mesmo email."""
+        self.biblioteca.cadastrar_usuario("Usuário A", "user@example.com", "123")
+        resultado = self.biblioteca.cadastrar_usuario("Usuário B", "user@example.com", "456")
+        self.assertFalse(resultado, msg="Falha: usuário com email duplicado foi cadastrado.")
+
+    # -------- TESTES DE ÍNDICES --------
+
+    def test_indices_reconstruidos_ao_carregar(self):
+        """Os índices por ID, ISBN e email devem ser reconstruídos ao carregar os dados."""
+        self.biblioteca.adicionar_livro("Livro X", "Autor X", "1234567890123", 2024)
+        self.biblioteca.cadastrar_usuario("Usuário X", "user@example.com", "123")
+
+        nova_biblioteca = Biblioteca('test_biblioteca.json')
+        nova_biblioteca.carregar_dados()
+
+        self.assertEqual(nova_biblioteca.buscar_livro_por_id(1).titulo, "Livro X", msg="Falha: livro não encontrado pelo ID após carregar.")
+        self.assertEqual(nova_biblioteca.buscar_usuario_por_id(1).email, "user@example.com", msg="Falha: usuário não encontrado pelo ID após carregar.")
+        self.assertFalse(nova_biblioteca.adicionar_livro("Outro", "Autor", "1234567890123", 2024), msg="Falha: índice de ISBN não foi reconstruído.")
+        self.assertFalse(nova_biblioteca.cadastrar_usuario("Outro", "user@example.com", "1"), msg="Falha: índice de email não foi reconstruído.")
+
+    def test_carregar_dados_duas_vezes_nao_duplica(self):
+        """Carregar os dados novamente deve substituir o estado, não duplicá-lo."""
+        self.biblioteca.adicionar_livro("Livro X", "Autor X", "1234567890123", 2024)
+        self.biblioteca.carregar_dados()
+        self.biblioteca.carregar_dados()
+        self.assertEqual(len(self.biblioteca._livros_obj), 1, msg="Falha: os livros foram duplicados ao recarregar.")
+
+    # -------- TESTES DE LOTES --------
+
+    def test_lote_grava_uma_unica_vez(self):
+        """Um lote deve adiar a gravação e salvar os dados uma única vez ao final."""
+        gravacoes = []
+        armazenamento = self.biblioteca._armazenamento
+        salvar_original = armazenamento.salvar
+        armazenamento.salvar = lambda biblioteca: (gravacoes.append(1), salvar_original(biblioteca))
+
+        with self.biblioteca.lote():
+            self.biblioteca.adicionar_livro("Livro A", "Autor A", "1234567890123", 2024)
+            self.biblioteca.adicionar_livro("Livro B", "Autor B", "1234567890", 2024)
+            self.biblioteca.cadastrar_usuario("Usuário A", "user@example.com", "123")
+            self.assertFalse(os.path.exists("test_biblioteca.json"), msg="Falha: o lote gravou antes de terminar.")
+
+        self.assertEqual(len(gravacoes), 1, msg="Falha: o lote não gravou exatamente uma vez.")
+        nova_biblioteca = Biblioteca('test_biblioteca.json')
+        nova_biblioteca.carregar_dados()
+        self.assertEqual(len(nova_biblioteca._livros_obj), 2, msg="Falha: os livros do lote não foram salvos.")
+
+    def test_lote_desfaz_alteracoes_em_caso_de_erro(self):
+        """Um lote que lança exceção deve restaurar o estado anterior sem gravar."""
+        self.biblioteca.adicionar_livro("Livro A", "Autor A", "1234567890123", 2024)
+        self.biblioteca.cadastrar_usuario("Usuário A", "user@example.com", "123")
+
+        with self.assertRaises(RuntimeError):
+            with self.biblioteca.lote():
+                self.biblioteca.realizar_emprestimo(1, 1)
+                self.biblioteca.adicionar_livro("Livro B", "Autor B", "1234567890", 2024)
+                raise RuntimeError("falha simulada")
+
+        self.assertTrue(self.biblioteca._livros_obj[0].disponivel, msg="Falha: a disponibilidade do livro não foi restaurada.")
+        self.assertEqual(len(self.biblioteca._livros_obj), 1, msg="Falha: o livro do lote não foi descartado.")
+        self.assertEqual(len(self.biblioteca._emprestimos_obj), 0, msg="Falha: o empréstimo do lote não foi descartado.")
+        self.assertIsNone(self.biblioteca.buscar_livro_por_id(2), msg="Falha: o índice ainda contém o livro descartado.")
+        self.assertTrue(self.biblioteca.adicionar_livro("Livro B", "Autor B", "1234567890", 2024), msg="Falha: o ISBN descartado continua bloqueado.")
+        self.assertEqual(self.biblioteca._livros_obj[-1].id, 2, msg="Falha: o contador de IDs não foi restaurado.")
+
+    def test_lote_desfeito_refaz_indices_como_reconstrucao(self):
+        """Desfeitos entrada a entrada, os índices devem ficar iguais aos de uma reconstrução completa."""
+        biblioteca = Biblioteca(armazenamento=ArmazenamentoNulo())
+        for i in range(1, 4):
+            biblioteca.adicionar_livro(f"Livro {i}", f"Autor {i}", f"{i:013d}", 2000 + i)
+            biblioteca.cadastrar_usuario(f"Usuário {i}", f"user{i}@example.com", "1")
+        biblioteca.realizar_emprestimo(1, 1)
+        biblioteca.reservar_livro(2, 1)
+        biblioteca.reservar_livro(3, 1)
+        biblioteca.realizar_emprestimo(2, 2)
+        biblioteca.reservar_livro(3, 2)
+        antes = _estado_dos_indices(biblioteca)
+
+        with self.assertRaises(RuntimeError):
+            with biblioteca.lote():
+                biblioteca.adicionar_livro("Livro 4", "Autor Novo", "4444444444444", 2010)
+                biblioteca.cadastrar_usuario("Usuário 4", "user4@example.com", "1")
+                biblioteca.devolver_livro(1)
+                biblioteca.cancelar_reserva(3)
+                biblioteca.reservar_livro(4, 1)
+                biblioteca.realizar_emprestimo(4, 4)
+                biblioteca.devolver_livro(2)
+                raise RuntimeError("falha simulada")
+
+        desfeito = _estado_dos_indices(biblioteca)
+        biblioteca._reconstruir_indices()
+        self.assertEqual(desfeito, _estado_dos_indices(biblioteca), msg="Falha: índices divergem da reconstrução.")
+        self.assertEqual(desfeito, antes, msg="Falha: índices diferentes dos de antes do lote.")
+
+    # -------- TESTES DO DIÁRIO --------
+
+    def test_diario_acrescenta_registro_por_operacao(self):
+        """No modo diário cada operação deve acrescentar um registro, sem regravar o arquivo."""
+        biblioteca = Biblioteca('test_biblioteca.json', usar_diario=True)
+        biblioteca.adicionar_livro("Livro A", "Autor A", "1234567890123", 2024)
+        biblioteca.cadastrar_usuario("Usuário A", "user@example.com", "123")
+        biblioteca.realizar_emprestimo(1, 1)
+        biblioteca.devolver_livro(1)
+
+        self.assertFalse(os.path.exists("test_biblioteca.json"), msg="Falha: o arquivo completo foi regravado.")
+        with open("test_biblioteca.json.diario", encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 4, msg="Falha: o diário não tem um registro por operação.")
+
+        nova_biblioteca = Biblioteca('test_biblioteca.json', usar_diario=True)
+        nova_biblioteca.carregar_dados()
+        self.assertEqual(len(nova_biblioteca._livros_obj), 1, msg="Falha: o livro não foi reaplicado do diário.")
+        self.assertTrue(nova_biblioteca._emprestimos_obj[0].devolvido, msg="Falha: a devolução não foi reaplicada.")
+        self.assertTrue(nova_biblioteca._livros_obj[0].disponivel, msg="Falha: a disponibilidade do livro está incorreta.")
+
+    def test_diario_compactado_ao_atingir_limite(self):
+        """O diário deve ser incorporado ao arquivo de dados ao atingir o limite."""
+        biblioteca = Biblioteca('test_biblioteca.json', usar_diario=True, limite_diario=2)
+        biblioteca.adicionar_livro("Livro A", "Autor A", "1234567890123", 2024)
+        biblioteca.adicionar_livro("Livro B", "Autor B", "1234567890", 2024)
+        biblioteca.cadastrar_usuario("Usuário A", "user@example.com", "123")
+
+        self.assertTrue(os.path.exists("test_biblioteca.json"), msg="Falha: o diário não foi compactado.")
+        nova_biblioteca = Biblioteca('test_biblioteca.json', usar_diario=True)
+        nova_biblioteca.carregar_dados()
+        self.assertEqual(len(nova_biblioteca._livros_obj), 2, msg="Falha: livros perdidos na compactação.")
+        self.assertEqual(len(nova_biblioteca._usuarios_obj), 1, msg="Falha: registro posterior à compactação perdido.")
+
+    # -------- TESTES DAS ENTIDADES COMPACTAS --------
+
+    def test_entidades_sem_dict_por_instancia(self):
+        """As entidades devem usar __slots__ e não ter __dict__ por instância."""
+        for entidade in (Livro("T", "A", "1234567890", 2000), Usuario("N", "n@example.com", "1"), Emprestimo(1, 1)):
+            self.assertFalse(hasattr(entidade, '__dict__'), msg=f"Falha: {type(entidade).__name__} ainda tem __dict__.")
+
+    def test_autores_internados(self):
+        """Livros do mesmo autor devem compartilhar a mesma string."""
+        autor = "Machado de Assis"
+        livro_a = Livro("A", "".join(["Machado ", "de Assis"]), "1234567890", 1899)
+        livro_b = Livro("B", autor[:8] + autor[8:], "1234567891", 1881)
+        self.assertIs(livro_a.autor, livro_b.autor, msg="Falha: os autores não foram internados.")
+
+    def test_datas_do_emprestimo_mantem_formato_iso(self):
+        """As datas do empréstimo devem continuar expostas como strings ISO."""
+        emprestimo = Emprestimo(1, 1)
+        self.assertEqual(datetime.fromisoformat(emprestimo.data_emprestimo).date(), datetime.now().date(), msg="Falha: data do empréstimo incorreta.")
+        self.assertIsNone(emprestimo.data_devolucao, msg="Falha: empréstimo novo não deveria ter devolução.")
+
+        emprestimo.data_emprestimo = "2024-03-05T10:20:30.123456"
+        self.assertEqual(emprestimo.data_emprestimo, "2024-03-05T10:20:30.123456", msg="Falha: a data ISO não foi preservada.")
+        self.assertIsInstance(emprestimo._data_emprestimo, int, msg="Falha: a data não foi guardada como inteiro.")
+
+        emprestimo.realizar_devolucao()
+        self.assertEqual(Emprestimo.from_dict(emprestimo.to_dict()).to_dict(), emprestimo.to_dict(), msg="Falha: o empréstimo não sobrevive a to_dict/from_dict.")
+
+    # -------- TESTES DOS ÍNDICES DE EMPRÉSTIMOS --------
+
+    def test_indices_de_emprestimos(self):
+        """Os empréstimos devem ser consultáveis por usuário, por livro e por situação."""
+        with self.biblioteca.lote():
+            self.biblioteca.adicionar_livro("Livro A", "Autor A", "1234567890123", 2024)
+            self.biblioteca.adicionar_livro("Livro B", "Autor B", "1234567890", 2024)
+            self.biblioteca.cadastrar_usuario("Usuário A", "a@example.com", "1")
+            self.biblioteca.cadastrar_usuario("Usuário B", "b@example.com", "2")
+        self.biblioteca.realizar_emprestimo(1, 1)
+        self.biblioteca.realizar_emprestimo(1, 2)
+        self.biblioteca.devolver_livro(1)
+        self.biblioteca.realizar_emprestimo(2, 1)
+
+        self.assertEqual([e.id for e in self.biblioteca.emprestimos_do_usuario(1)], [1, 2], msg="Falha: histórico do usuário incorreto.")
+        self.assertEqual([e.id for e in self.biblioteca.emprestimos_do_usuario(1, apenas_ativos=True)], [2], msg="Falha: empréstimos em aberto do usuário incorretos.")
+        self.assertEqual([e.id for e in self.biblioteca.emprestimos_do_livro(1)], [1, 3], msg="Falha: histórico do livro incorreto.")
+        self.assertEqual(self.biblioteca.emprestimo_atual_do_livro(1).usuario_id, 2, msg="Falha: empréstimo atual do livro incorreto.")
+        self.assertEqual([e.id for e in self.biblioteca.emprestimos_ativos()], [2, 3], msg="Falha: empréstimos em aberto incorretos.")
+
+        nova_biblioteca = Biblioteca('test_biblioteca.json')
+        nova_biblioteca.carregar_dados()
+        self.assertEqual([e.id for e in nova_biblioteca.emprestimos_ativos()], [2, 3], msg="Falha: índices de empréstimos não reconstruídos ao carregar.")
+
+        self.biblioteca.devolver_livro(3)
+        self.assertIsNone(self.biblioteca.emprestimo_atual_do_livro(1), msg="Falha: o livro devolvido ainda tem empréstimo em aberto.")
+        self.assertEqual(self.biblioteca.emprestimos_do_usuario(2, apenas_ativos=True), [], msg="Falha: o usuário ainda tem empréstimo em aberto.")
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
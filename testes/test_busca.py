@@ -0,0 +1,105 @@
+import sys
+import os
+import random
+import unittest
+from unittest import mock
+
+# adiciona a pasta "sistema" ao path para o Python encontrar o módulo biblioteca
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema.biblioteca_poo import Biblioteca
+from sistema import busca
+from sistema.busca import IndiceInvertido, normalizar
+
+
+class TestBusca(unittest.TestCase):
+    """Testes da busca textual de livros."""
+
+    def setUp(self):
+        """Executa antes de cada teste para preparar o acervo."""
+        self.biblioteca = Biblioteca('test_busca.json')
+        with self.biblioteca.lote():
+            self.biblioteca.adicionar_livro("O Senhor dos Anéis", "J. R. R. Tolkien", "1234567890123", 1954)
+            self.biblioteca.adicionar_livro("O Hobbit", "J. R. R. Tolkien", "1234567890124", 1937)
+            self.biblioteca.adicionar_livro("Memórias Póstumas de Brás Cubas", "Machado de Assis", "1234567890125", 1881)
+            self.biblioteca.adicionar_livro("Dom Casmurro", "Machado de Assis", "1234567890126", 1899)
+
+    def tearDown(self):
+        """Executa após cada teste para limpar."""
+        if os.path.exists("test_busca.json"):
+            os.remove("test_busca.json")
+
+    def test_normalizar_remove_acentos_e_caixa(self):
+        """A normalização deve ignorar acentos e maiúsculas."""
+        self.assertEqual(normalizar("O Senhor dos ANÉIS"), "o senhor dos aneis", msg="Falha: texto normalizado incorreto.")
+
+    def test_buscar_sem_acentos(self):
+        """Deve encontrar títulos acentuados a partir de consultas sem acento."""
+        resultado = self.biblioteca.buscar_livros("senhor aneis")
+        self.assertEqual([livro.id for livro in resultado], [1], msg="Falha: o livro acentuado não foi encontrado.")
+
+    def test_buscar_por_autor_e_ranking(self):
+        """O termo encontrado no título deve pesar mais que no autor."""
+        self.biblioteca.adicionar_livro("Machado, uma biografia", "Outro Autor", "1234567890127", 2000)
+        resultado = self.biblioteca.buscar_livros("machado")
+        self.assertEqual(resultado[0].id, 5, msg="Falha: o título deveria ter mais relevância que o autor.")
+        self.assertEqual({livro.id for livro in resultado}, {3, 4, 5}, msg="Falha: livros do autor não encontrados.")
+
+    def test_busca_exige_todos_os_termos(self):
+        """Devem ser retornados apenas os livros com todos os termos."""
+        self.assertEqual(self.biblioteca.buscar_livros("tolkien hobbit")[0].titulo, "O Hobbit", msg="Falha: busca com dois termos incorreta.")
+        self.assertEqual(self.biblioteca.buscar_livros("tolkien casmurro"), [], msg="Falha: nenhum livro deveria ser encontrado.")
+
+    def test_indice_desfeito_com_o_lote(self):
+        """Livros descartados por um lote desfeito não devem aparecer na busca."""
+        with self.assertRaises(RuntimeError):
+            with self.biblioteca.lote():
+                self.biblioteca.adicionar_livro("Iracema", "José de Alencar", "1234567890", 1865)
+                raise RuntimeError("falha simulada")
+        self.assertEqual(self.biblioteca.buscar_livros("iracema"), [], msg="Falha: o livro descartado continua no índice.")
+
+    def test_indice_remover(self):
+        """Remover um livro deve retirá-lo das postagens."""
+        indice = IndiceInvertido()
+        indice.adicionar(1, "Dom Casmurro", "Machado de Assis")
+        indice.remover(1)
+        self.assertEqual(indice.buscar("casmurro"), [], msg="Falha: o livro removido ainda aparece.")
+        self.assertEqual(len(indice), 0, msg="Falha: o índice deveria estar vazio.")
+
+    def test_poda_por_impacto_igual_a_pontuar_tudo(self):
+        """Os termos comuns, podados por peso, devem dar o mesmo resultado que pontuar todas as postagens."""
+        sorteio = random.Random(7)
+        palavras = ["amor", "guerra", "paz", "mar", "noite", "sol", "casa", "rio"]
+        autores = ["Ana Silva", "João Silva", "Maria Souza", "Pedro Amor"]
+        livros = [(livro_id, " ".join(sorteio.choices(palavras, k=sorteio.randint(1, 4))), sorteio.choice(autores))
+                  for livro_id in sorteio.sample(range(1, 5000), 2000)]
+
+        podado = IndiceInvertido()
+        em_massa = IndiceInvertido()
+        em_massa.adiar_ordenacao()
+        for livro in livros:
+            podado.adicionar(*livro)
+            em_massa.adicionar(*livro)
+        em_massa.ordenar()
+        with mock.patch.object(busca, 'MINIMO_IMPACTOS', 10 ** 9):
+            completo = IndiceInvertido()
+            for livro in livros:
+                completo.adicionar(*livro)
+        self.assertTrue(podado._impactos, msg="Falha: termos comuns não agrupados por peso.")
+
+        consultas = ["amor", "silva", "amor silva", "paz guerra", "souza mar noite", "rio"]
+        for removidos in (0, 800):
+            for livro_id, _, _ in livros[:removidos]:
+                podado.remover(livro_id)
+                em_massa.remover(livro_id)
+                completo.remover(livro_id)
+            for consulta in consultas:
+                for limite in (1, 10, 5000):
+                    with self.subTest(consulta=consulta, limite=limite, removidos=removidos):
+                        esperado = completo.buscar_pontuados(consulta, limite)
+                        self.assertEqual(podado.buscar_pontuados(consulta, limite), esperado)
+                        self.assertEqual(em_massa.buscar_pontuados(consulta, limite), esperado)
+
+
+if __name__ == "__main__":
+    unittest.main()
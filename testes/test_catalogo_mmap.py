@@ -0,0 +1,80 @@
+import sys
+import os
+import unittest
+
+# adiciona a pasta "sistema" ao path para o Python encontrar o módulo biblioteca
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema.biblioteca_poo import Biblioteca
+from sistema.armazenamento import ArmazenamentoNulo
+from sistema.catalogo_mmap import CatalogoSomenteLeitura, ErroCatalogo
+
+
+ARQUIVO_TESTE = "test_catalogo.cat"
+
+
+class TestCatalogoSomenteLeitura(unittest.TestCase):
+    """Testes do catálogo mapeado em memória."""
+
+    def setUp(self):
+        """Executa antes de cada teste para limpar o arquivo."""
+        self.tearDown()
+        self.biblioteca = Biblioteca(armazenamento=ArmazenamentoNulo())
+        with self.biblioteca.lote():
+            for i in range(1, 201):
+                self.biblioteca.adicionar_livro(f"Livro {i}", f"Autor {i % 7}", f"978{i:010d}", 1900 + i)
+            self.biblioteca.cadastrar_usuario("Usuário", "user@example.com", "123")
+            self.biblioteca.realizar_emprestimo(1, 5)
+
+    def tearDown(self):
+        """Executa após cada teste para limpar."""
+        if os.path.exists(ARQUIVO_TESTE):
+            os.remove(ARQUIVO_TESTE)
+
+    def test_busca_por_id_e_isbn(self):
+        """As buscas devem devolver o mesmo livro da biblioteca de origem."""
+        self.assertEqual(self.biblioteca.exportar_catalogo(ARQUIVO_TESTE), 200)
+
+        with CatalogoSomenteLeitura(ARQUIVO_TESTE) as catalogo:
+            self.assertEqual(len(catalogo), 200)
+            for livro_id in (1, 5, 137, 200):
+                self.assertEqual(catalogo.buscar_livro_por_id(livro_id),
+                                 self.biblioteca.buscar_livro_por_id(livro_id).to_dict(),
+                                 msg=f"Falha: livro {livro_id} difere no catálogo.")
+            self.assertFalse(catalogo.buscar_livro_por_id(5)['disponivel'], msg="Falha: o livro emprestado aparece disponível.")
+            self.assertEqual(catalogo.buscar_livro_por_isbn("9780000000042")['id'], 42, msg="Falha: busca por ISBN.")
+
+    def test_livro_inexistente(self):
+        """IDs e ISBNs desconhecidos devem retornar None."""
+        self.biblioteca.exportar_catalogo(ARQUIVO_TESTE)
+        with CatalogoSomenteLeitura(ARQUIVO_TESTE) as catalogo:
+            self.assertIsNone(catalogo.buscar_livro_por_id(0))
+            self.assertIsNone(catalogo.buscar_livro_por_id(999))
+            self.assertIsNone(catalogo.buscar_livro_por_isbn("0000000000"))
+
+    def test_ano_nulo_nao_chega_ao_catalogo(self):
+        """Ano nulo deve ser recusado na entrada, e a exportação seguinte deve funcionar."""
+        self.assertFalse(self.biblioteca.adicionar_livro("Sem Ano", "Autor", "5555555555", None))
+        self.assertEqual(self.biblioteca.exportar_catalogo(ARQUIVO_TESTE), 200, msg="Falha: exportação após ano recusado.")
+
+    def test_listagem_em_ordem_de_id(self):
+        """A listagem deve percorrer todos os livros em ordem de ID."""
+        self.biblioteca.exportar_catalogo(ARQUIVO_TESTE)
+        with CatalogoSomenteLeitura(ARQUIVO_TESTE) as catalogo:
+            self.assertEqual([livro['id'] for livro in catalogo.listar_livros()], list(range(1, 201)))
+
+    def test_catalogo_vazio_e_arquivo_invalido(self):
+        """Um catálogo vazio deve abrir; um arquivo de outro formato não."""
+        Biblioteca(armazenamento=ArmazenamentoNulo()).exportar_catalogo(ARQUIVO_TESTE)
+        with CatalogoSomenteLeitura(ARQUIVO_TESTE) as catalogo:
+            self.assertEqual(len(catalogo), 0)
+            self.assertIsNone(catalogo.buscar_livro_por_id(1))
+
+        with open(ARQUIVO_TESTE, 'wb') as f:
+            f.write(b'{"livros": []}' * 4)
+        with self.assertRaises(ErroCatalogo):
+            CatalogoSomenteLeitura(ARQUIVO_TESTE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import sys
+import os
+import threading
+import unittest
+
+# adiciona a pasta "sistema" ao path para o Python encontrar o módulo biblioteca
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema.biblioteca_poo import Biblioteca
+from sistema.concorrencia import TravaLeituraEscrita
+
+NUM_THREADS = 16
+NUM_LIVROS = 50
+
+
+def executar_em_threads(alvo, quantidade=NUM_THREADS):
+    """Dispara `quantidade` threads ao mesmo tempo e espera todas terminarem."""
+    barreira = threading.Barrier(quantidade)
+
+    def rodar(indice):
+        barreira.wait()
+        alvo(indice)
+
+    threads = [threading.Thread(target=rodar, args=(i,)) for i in range(quantidade)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class TestConcorrencia(unittest.TestCase):
+    """Testes de estresse da Biblioteca no modo concorrente."""
+
+    def setUp(self):
+        """Executa antes de cada teste para limpar os dados."""
+        self.tearDown()
+        self.biblioteca = Biblioteca('test_concorrencia.jsonl', usar_diario=True, concorrente=True)
+
+    def tearDown(self):
+        """Executa após cada teste para limpar."""
+        for arquivo in ("test_concorrencia.jsonl", "test_concorrencia.jsonl.diario"):
+            if os.path.exists(arquivo):
+                os.remove(arquivo)
+
+    def test_cadastros_simultaneos_geram_ids_unicos(self):
+        """Cadastros em várias threads devem gerar IDs únicos e sequenciais."""
+        def cadastrar(indice):
+            for n in range(NUM_LIVROS):
+                self.biblioteca.adicionar_livro(f"Livro {indice}-{n}", "Autor", f"{indice:03d}{n:010d}", 2000)
+
+        executar_em_threads(cadastrar)
+
+        ids = sorted(livro.id for livro in self.biblioteca._livros_obj)
+        self.assertEqual(ids, list(range(1, NUM_THREADS * NUM_LIVROS + 1)), msg="Falha: IDs repetidos ou perdidos.")
+
+    def test_livro_nao_e_emprestado_duas_vezes(self):
+        """Empréstimos simultâneos do mesmo livro devem ter um único vencedor."""
+        with self.biblioteca.lote():
+            for n in range(NUM_LIVROS):
+                self.biblioteca.adicionar_livro(f"Livro {n}", "Autor", f"{n:013d}", 2000)
+            for indice in range(NUM_THREADS):
+                self.biblioteca.cadastrar_usuario(f"Usuário {indice}", f"u{indice}@example.com", "1")
+
+        sucessos = [0] * NUM_THREADS
+
+        def emprestar(indice):
+            for livro_id in range(1, NUM_LIVROS + 1):
+                if self.biblioteca.realizar_emprestimo(indice + 1, livro_id):
+                    sucessos[indice] += 1
+                self.biblioteca.buscar_livros("livro")
+
+        executar_em_threads(emprestar)
+
+        self.assertEqual(sum(sucessos), NUM_LIVROS, msg="Falha: algum livro foi emprestado mais de uma vez.")
+        self.assertEqual(len(self.biblioteca.emprestimos_ativos()), NUM_LIVROS, msg="Falha: número de empréstimos em aberto incorreto.")
+
+    def test_trava_nao_permite_promover_leitura(self):
+        """Pedir escrita enquanto a mesma thread lê deve falhar em vez de travar."""
+        trava = TravaLeituraEscrita()
+        trava.adquirir_leitura()
+        with self.assertRaises(RuntimeError):
+            trava.adquirir_escrita()
+        trava.liberar_leitura()
+        trava.adquirir_escrita()
+        trava.adquirir_leitura()
+        trava.liberar_leitura()
+        trava.liberar_escrita()
+
+
+if __name__ == "__main__":
+    unittest.main()
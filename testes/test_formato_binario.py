@@ -0,0 +1,104 @@
+import sys
+import os
+import unittest
+
+# adiciona a pasta "sistema" ao path para o Python encontrar o módulo biblioteca
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema.biblioteca_poo import Biblioteca, Livro
+from sistema.armazenamento import ArmazenamentoBinario, criar_armazenamento
+from sistema.formato_binario import ErroFormatoBinario, converter, desserializar, serializar
+
+
+ARQUIVOS_TESTE = ("test_formato.bin", "test_formato.json", "test_formato_convertido.json")
+
+
+class TestFormatoBinario(unittest.TestCase):
+    """Testes do instantâneo binário."""
+
+    def setUp(self):
+        """Executa antes de cada teste para limpar os arquivos."""
+        self.tearDown()
+
+    def tearDown(self):
+        """Executa após cada teste para limpar."""
+        for arquivo in ARQUIVOS_TESTE:
+            if os.path.exists(arquivo):
+                os.remove(arquivo)
+
+    def _popular(self, biblioteca):
+        biblioteca.adicionar_livro("O Senhor dos Anéis", "J.R.R. Tolkien", "1234567890123", 1954)
+        biblioteca.adicionar_livro("O Hobbit", "J.R.R. Tolkien", "1234567890", 1937)
+        biblioteca.cadastrar_usuario("José Araújo", "jose@example.com", "123")
+        biblioteca.realizar_emprestimo(1, 1)
+        biblioteca.realizar_emprestimo(1, 2)
+        biblioteca.devolver_livro(2)
+
+    def test_extensao_bin_escolhe_formato_binario(self):
+        """A extensão .bin deve escolher o instantâneo binário; JSON continua o padrão."""
+        self.assertIsInstance(criar_armazenamento("test_formato.bin"), ArmazenamentoBinario, msg="Falha: .bin deveria usar o formato binário.")
+        self.assertNotIsInstance(Biblioteca()._armazenamento, ArmazenamentoBinario, msg="Falha: o padrão deveria continuar JSON.")
+
+    def test_salva_e_carrega(self):
+        """O formato binário deve preservar todas as entidades e os contadores."""
+        biblioteca = Biblioteca("test_formato.bin")
+        self._popular(biblioteca)
+
+        nova_biblioteca = Biblioteca("test_formato.bin")
+        nova_biblioteca.carregar_dados()
+
+        self.assertEqual(nova_biblioteca._exportar_estado(), biblioteca._exportar_estado(), msg="Falha: o estado carregado difere do salvo.")
+        self.assertFalse(nova_biblioteca.buscar_livro_por_id(1).disponivel, msg="Falha: o livro emprestado aparece disponível.")
+        self.assertEqual(nova_biblioteca.buscar_livros("anéis")[0].id, 1, msg="Falha: o índice de busca não foi reconstruído.")
+        self.assertTrue(nova_biblioteca.adicionar_livro("Livro C", "Autor C", "9876543210", 2000))
+        self.assertEqual(nova_biblioteca.buscar_livro_por_id(3).titulo, "Livro C", msg="Falha: o contador de IDs não foi restaurado.")
+
+    def test_autor_repetido_gravado_uma_vez(self):
+        """Autores repetidos devem aparecer uma única vez na tabela de strings."""
+        biblioteca = Biblioteca("test_formato.bin")
+        self._popular(biblioteca)
+        conteudo = serializar(biblioteca._exportar_estado())
+        self.assertEqual(conteudo.count("J.R.R. Tolkien".encode('utf-8')), 1, msg="Falha: autor repetido na tabela de strings.")
+        self.assertEqual(desserializar(conteudo), biblioteca._exportar_estado(), msg="Falha: a conversão de volta difere do original.")
+
+    def test_arquivo_invalido(self):
+        """Bytes que não são um instantâneo devem ser rejeitados."""
+        with self.assertRaises(ErroFormatoBinario):
+            desserializar(b'{"livros": []}')
+        biblioteca = Biblioteca("test_formato.bin")
+        self._popular(biblioteca)
+        conteudo = serializar(biblioteca._exportar_estado())
+        with self.assertRaises(ErroFormatoBinario):
+            desserializar(conteudo[:-1])
+
+    def test_ano_nulo_recusado_antes_de_gravar(self):
+        """Ano nulo deve ser recusado na entrada, sem alterar o estado nem quebrar a gravação seguinte."""
+        biblioteca = Biblioteca("test_formato.bin")
+        self._popular(biblioteca)
+        self.assertFalse(biblioteca.adicionar_livro("Sem Ano", "Autor", "5555555555", None),
+                         msg="Falha: ano nulo deveria ser recusado.")
+        with self.assertRaises(ValueError):
+            Livro("Sem Ano", "Autor", "5555555555", None)
+        self.assertTrue(biblioteca.adicionar_livro("Com Ano", "Autor", "6666666666", 2001))
+
+        nova_biblioteca = Biblioteca("test_formato.bin")
+        nova_biblioteca.carregar_dados()
+        self.assertEqual(nova_biblioteca._exportar_estado(), biblioteca._exportar_estado(),
+                         msg="Falha: a gravação após o ano recusado perdeu dados.")
+        self.assertNotIn("5555555555", nova_biblioteca._livros_por_isbn, msg="Falha: livro sem ano foi gravado.")
+
+    def test_conversor_ida_e_volta(self):
+        """JSON -> binário -> JSON deve preservar os dados."""
+        biblioteca = Biblioteca("test_formato.json")
+        self._popular(biblioteca)
+
+        converter("test_formato.json", "test_formato.bin")
+        converter("test_formato.bin", "test_formato_convertido.json")
+
+        convertida = Biblioteca("test_formato_convertido.json")
+        convertida.carregar_dados()
+        self.assertEqual(convertida._exportar_estado(), biblioteca._exportar_estado(), msg="Falha: dados perdidos na conversão.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+
+# adiciona a pasta "sistema" ao path para o Python encontrar o módulo biblioteca
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema.fragmentos import CatalogoFragmentado
+
+
+class TestFragmentos(unittest.TestCase):
+    """Testes do catálogo dividido entre processos."""
+
+    def setUp(self):
+        """Executa antes de cada teste para criar uma pasta temporária."""
+        self.diretorio = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Executa após cada teste para limpar."""
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_operacoes_roteadas_e_listagens_combinadas(self):
+        """Livros devem ir ao fragmento do ISBN e as listagens devem ser combinadas."""
+        isbns = [f"{n:013d}" for n in range(12)]
+        with CatalogoFragmentado(self.diretorio, num_fragmentos=3) as catalogo:
+            self.assertTrue(catalogo.cadastrar_usuario("Ana", "ana@example.com", "1"), msg="Falha: usuário não cadastrado.")
+            self.assertFalse(catalogo.cadastrar_usuario("Ana 2", "ana@example.com", "2"), msg="Falha: email duplicado aceito.")
+
+            ids = [catalogo.adicionar_livro(f"Livro {n}", "Autor", isbn, 2000) for n, isbn in enumerate(isbns)]
+            self.assertEqual(len(set(ids)), len(isbns), msg="Falha: IDs globais repetidos.")
+            self.assertIsNone(catalogo.adicionar_livro("Repetido", "Autor", isbns[0], 2000), msg="Falha: ISBN duplicado aceito.")
+            self.assertEqual(len({catalogo.fragmento_do_isbn(isbn) for isbn in isbns}), 3, msg="Falha: os livros não foram distribuídos.")
+
+            livros = catalogo.listar_livros()
+            self.assertEqual([livro['id'] for livro in livros], sorted(ids), msg="Falha: listagem não combinada em ordem de ID.")
+            self.assertEqual(catalogo.buscar_livro_por_id(ids[5])['isbn'], isbns[5], msg="Falha: busca por ID global incorreta.")
+
+            emprestimo_id = catalogo.realizar_emprestimo(1, ids[5])
+            self.assertIsNotNone(emprestimo_id, msg="Falha: empréstimo não realizado.")
+            self.assertIsNone(catalogo.realizar_emprestimo(1, ids[5]), msg="Falha: livro emprestado duas vezes.")
+            self.assertFalse(catalogo.buscar_livro_por_id(ids[5])['disponivel'], msg="Falha: livro deveria estar emprestado.")
+            self.assertEqual(catalogo.listar_emprestimos()[0]['livro_id'], ids[5], msg="Falha: empréstimo com livro_id local.")
+            self.assertTrue(catalogo.devolver_livro(emprestimo_id), msg="Falha: devolução não realizada.")
+
+            self.assertEqual(len(catalogo.buscar_livros("livro", limite=20)), len(isbns), msg="Falha: busca distribuída incompleta.")
+
+        with CatalogoFragmentado(self.diretorio, num_fragmentos=3) as catalogo:
+            self.assertEqual(len(catalogo.listar_livros()), len(isbns), msg="Falha: fragmentos não persistiram os livros.")
+            self.assertEqual(len(catalogo.listar_usuarios()), 1, msg="Falha: usuários não persistidos.")
+
+    def test_reabrir_com_outra_quantidade_de_fragmentos(self):
+        """Reabrir o diretório com outra quantidade de fragmentos deve falhar em vez de rotear errado."""
+        with CatalogoFragmentado(self.diretorio, num_fragmentos=2) as catalogo:
+            self.assertIsNotNone(catalogo.adicionar_livro("Livro", "Autor", "1234567890123", 2000))
+        with self.assertRaises(ValueError):
+            CatalogoFragmentado(self.diretorio, num_fragmentos=3)
+        with CatalogoFragmentado(self.diretorio, num_fragmentos=2) as catalogo:
+            self.assertEqual(len(catalogo.listar_livros()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import sys
+import os
+import unittest
+
+# adiciona a pasta "sistema" ao path para o Python encontrar o módulo biblioteca
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema.armazenamento import ArmazenamentoNulo
+from sistema.biblioteca_poo import Biblioteca, ErroBibliotecaFechada
+from sistema.gerenciador import BYTES_POR_REGISTRO, GerenciadorBibliotecas, estimar_memoria
+
+
+ARQUIVOS_TESTE = ("test_gerenciador_centro.json", "test_gerenciador_norte.json", "test_gerenciador_sul.db",
+                  "test_gerenciador_sul.db-wal", "test_gerenciador_sul.db-shm")
+
+
+class RelogioFalso:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+class TestGerenciador(unittest.TestCase):
+    """Testes de várias bibliotecas no mesmo processo."""
+
+    def setUp(self):
+        """Executa antes de cada teste para limpar os arquivos."""
+        self.tearDown()
+        self.relogio = RelogioFalso()
+        self.gerenciador = GerenciadorBibliotecas(relogio=self.relogio)
+        self.gerenciador.registrar("centro", "test_gerenciador_centro.json")
+        self.gerenciador.registrar("norte", "test_gerenciador_norte.json")
+        self.gerenciador.registrar("sul", "test_gerenciador_sul.db")
+
+    def tearDown(self):
+        """Executa após cada teste para limpar."""
+        if hasattr(self, 'gerenciador'):
+            self.gerenciador.fechar()
+        for arquivo in ARQUIVOS_TESTE:
+            if os.path.exists(arquivo):
+                os.remove(arquivo)
+
+    def test_ids_independentes_por_instancia(self):
+        """Duas bibliotecas no mesmo processo não devem interferir nos IDs uma da outra."""
+        a = Biblioteca(armazenamento=ArmazenamentoNulo())
+        a.adicionar_livro("Livro A", "Autor", "1234567890123", 2000)
+        b = Biblioteca(armazenamento=ArmazenamentoNulo())
+        b.adicionar_livro("Livro B", "Autor", "1234567890123", 2000)
+        a.adicionar_livro("Livro C", "Autor", "1234567890", 2000)
+        self.assertEqual([livro.id for livro in a._livros_obj], [1, 2], msg="Falha: IDs da primeira biblioteca alterados.")
+        self.assertEqual([livro.id for livro in b._livros_obj], [1], msg="Falha: IDs da segunda biblioteca incorretos.")
+
+    def test_carga_preguicosa_e_descarga(self):
+        """A biblioteca só é carregada no primeiro acesso e volta do disco depois de descarregada."""
+        self.assertEqual(self.gerenciador.carregadas(), [], msg="Falha: registrar não deveria carregar.")
+        for nome in ("centro", "sul"):
+            with self.gerenciador.usar(nome) as biblioteca:
+                biblioteca.adicionar_livro(f"Livro {nome}", "Autor", "1234567890123", 2000)
+                biblioteca.cadastrar_usuario("Ana", "ana@example.com", "1")
+                biblioteca.realizar_emprestimo(1, 1)
+        self.assertEqual(self.gerenciador.carregadas(), ["centro", "sul"])
+
+        self.assertTrue(self.gerenciador.descarregar("sul"))
+        self.assertFalse(self.gerenciador.descarregar("sul"), msg="Falha: já estava descarregada.")
+        sul = self.gerenciador.obter("sul")
+        self.assertEqual(sul.buscar_livro_por_id(1).titulo, "Livro sul", msg="Falha: dados não recarregados do disco.")
+        self.assertFalse(sul.buscar_livro_por_id(1).disponivel, msg="Falha: empréstimo não recarregado.")
+        self.assertTrue(sul.adicionar_livro("Outro", "Autor", "1234567890", 2000))
+        self.assertEqual(sul._livros_obj[-1].id, 2, msg="Falha: contador não restaurado na recarga.")
+
+        with self.assertRaises(KeyError):
+            self.gerenciador.obter("inexistente")
+        with self.assertRaises(ValueError):
+            self.gerenciador.registrar("sul", "outro.json")
+
+    def test_orcamento_descarrega_a_menos_usada(self):
+        """Passando do orçamento, a biblioteca menos usada recentemente (e livre) deve sair."""
+        for nome in ("centro", "norte", "sul"):
+            with self.gerenciador.usar(nome) as biblioteca:
+                biblioteca.adicionar_livro("Livro", "Autor", "1234567890123", 2000)
+        self.gerenciador.fechar()
+        self.gerenciador.orcamento_bytes = 2 * BYTES_POR_REGISTRO['livro']
+
+        with self.gerenciador.usar("centro"):
+            self.gerenciador.obter("norte")
+            self.gerenciador.obter("sul")
+            self.assertEqual(self.gerenciador.carregadas(), ["centro", "sul"],
+                             msg="Falha: deveria descarregar a menos usada que não está em uso.")
+        self.assertLessEqual(self.gerenciador.memoria_estimada(), self.gerenciador.orcamento_bytes)
+        self.assertEqual(estimar_memoria(self.gerenciador.obter("sul")), BYTES_POR_REGISTRO['livro'])
+
+    def test_instancia_descarregada_recusa_alteracoes(self):
+        """Uma referência antiga, já descarregada, não deve sobrescrever as alterações da instância nova."""
+        antiga = self.gerenciador.obter("centro")
+        antiga.adicionar_livro("L1", "Autor", "1234567890123", 2000)
+        self.assertTrue(self.gerenciador.descarregar("centro"))
+
+        nova = self.gerenciador.obter("centro")
+        self.assertIsNot(nova, antiga)
+        self.assertTrue(nova.adicionar_livro("X", "Autor", "1234567890", 2000))
+        with self.assertRaises(ErroBibliotecaFechada):
+            antiga.adicionar_livro("Y", "Autor", "9876543210", 2000)
+        with self.assertRaises(ErroBibliotecaFechada):
+            with antiga.lote():
+                pass
+        self.assertEqual(antiga.buscar_livro_por_id(1).titulo, "L1", msg="Falha: a instância fechada deveria continuar lendo.")
+
+        self.gerenciador.fechar()
+        relida = self.gerenciador.obter("centro")
+        self.assertEqual([livro.titulo for livro in relida._livros_obj], ["L1", "X"], msg="Falha: alteração perdida.")
+
+    def test_orcamento_aplicado_a_cada_acesso(self):
+        """Uma biblioteca já carregada que cresce deve levar as demais a sair no próximo acesso."""
+        self.gerenciador.obter("centro")
+        self.gerenciador.obter("norte")
+        self.gerenciador.orcamento_bytes = 2 * BYTES_POR_REGISTRO['livro']
+        with self.gerenciador.usar("norte") as norte:
+            norte.adicionar_livro("Livro 1", "Autor", "1234567890123", 2000)
+            norte.adicionar_livro("Livro 2", "Autor", "1234567890", 2000)
+            self.assertEqual(self.gerenciador.carregadas(), ["centro", "norte"])
+        self.assertEqual(self.gerenciador.carregadas(), ["centro", "norte"],
+                         msg="Falha: ainda cabia no orçamento.")
+        self.gerenciador.obter("norte").adicionar_livro("Livro 3", "Autor", "9876543210", 2000)
+        self.gerenciador.obter("norte")
+        self.assertEqual(self.gerenciador.carregadas(), ["norte"], msg="Falha: orçamento ignorado fora da carga.")
+
+    def test_descarrega_ociosas(self):
+        """Bibliotecas sem acesso há mais que a ociosidade devem ser descarregadas."""
+        self.gerenciador.obter("centro")
+        self.relogio.agora = 200.0
+        self.gerenciador.obter("norte")
+        self.relogio.agora = 400.0
+        self.assertEqual(self.gerenciador.descarregar_ociosas(), ["centro"], msg="Falha: ociosa não descarregada.")
+        self.assertEqual(self.gerenciador.carregadas(), ["norte"])
+
+
+if __name__ == '__main__':
+    unittest.main()
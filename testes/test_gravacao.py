@@ -0,0 +1,96 @@
+import sys
+import os
+import threading
+import unittest
+
+# adiciona a pasta "sistema" ao path para o Python encontrar o módulo biblioteca
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema.biblioteca_poo import Biblioteca
+from sistema.gravacao import ConfirmacaoEmGrupo, gravar_atomicamente
+
+NUM_THREADS = 16
+
+
+class TestGravacao(unittest.TestCase):
+    """Testes da gravação atômica e da confirmação em grupo."""
+
+    def setUp(self):
+        """Executa antes de cada teste para limpar os dados."""
+        self.tearDown()
+
+    def tearDown(self):
+        """Executa após cada teste para limpar."""
+        for arquivo in ("test_gravacao.json", "test_gravacao.jsonl", "test_gravacao.jsonl.diario"):
+            if os.path.exists(arquivo):
+                os.remove(arquivo)
+
+    def test_falha_na_escrita_preserva_arquivo_anterior(self):
+        """Uma falha durante a escrita não deve truncar o arquivo existente."""
+        gravar_atomicamente("test_gravacao.json", lambda f: f.write('{"versao": 1}'))
+
+        def escrever_pela_metade(f):
+            f.write('{"versao": ')
+            raise OSError("disco cheio")
+
+        with self.assertRaises(OSError):
+            gravar_atomicamente("test_gravacao.json", escrever_pela_metade)
+
+        with open("test_gravacao.json", encoding="utf-8") as f:
+            self.assertEqual(f.read(), '{"versao": 1}', msg="Falha: o arquivo anterior foi corrompido.")
+        temporarios = [nome for nome in os.listdir('.') if nome.startswith('.test_gravacao.json.')]
+        self.assertEqual(temporarios, [], msg="Falha: o arquivo temporário não foi removido.")
+
+    @unittest.skipUnless(os.name == 'posix', "os.devnull é um dispositivo apenas em POSIX")
+    def test_destino_especial_nao_e_substituido(self):
+        """Gravar em os.devnull deve escrever no dispositivo, não trocá-lo por um arquivo."""
+        gravar_atomicamente(os.devnull, lambda f: f.write('{"versao": 1}'))
+        self.assertFalse(os.path.isfile(os.devnull), msg="Falha: os.devnull foi substituído por um arquivo comum.")
+
+    def test_confirmacao_em_grupo_agrupa_pedidos(self):
+        """Pedidos simultâneos devem compartilhar gravações."""
+        gravacoes = []
+        confirmacao = ConfirmacaoEmGrupo(lambda: gravacoes.append(1), latencia=0.05, tamanho_lote=NUM_THREADS)
+        barreira = threading.Barrier(NUM_THREADS)
+
+        def pedir():
+            barreira.wait()
+            confirmacao.confirmar()
+
+        threads = [threading.Thread(target=pedir) for _ in range(NUM_THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertLess(len(gravacoes), NUM_THREADS, msg="Falha: cada pedido gerou sua própria gravação.")
+
+    def test_biblioteca_com_confirmacao_em_grupo(self):
+        """Cadastros simultâneos devem ser gravados em grupo e sobreviver ao recarregamento."""
+        biblioteca = Biblioteca("test_gravacao.jsonl", usar_diario=True, concorrente=True,
+                                confirmacao_em_grupo=True, latencia_confirmacao=0.02)
+        barreira = threading.Barrier(NUM_THREADS)
+
+        def cadastrar(indice):
+            barreira.wait()
+            biblioteca.adicionar_livro(f"Livro {indice}", "Autor", f"{indice:013d}", 2000)
+
+        threads = [threading.Thread(target=cadastrar, args=(i,)) for i in range(NUM_THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertLess(biblioteca._confirmacao.gravacoes, NUM_THREADS, msg="Falha: as gravações não foram agrupadas.")
+        nova_biblioteca = Biblioteca("test_gravacao.jsonl", usar_diario=True)
+        nova_biblioteca.carregar_dados()
+        self.assertEqual(len(nova_biblioteca._livros_obj), NUM_THREADS, msg="Falha: alguma alteração não foi gravada.")
+
+    def test_confirmacao_em_grupo_exige_modo_concorrente(self):
+        """A confirmação em grupo só faz sentido no modo concorrente."""
+        with self.assertRaises(ValueError):
+            Biblioteca("test_gravacao.json", confirmacao_em_grupo=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import sys
+import os
+import io
+import unittest
+from unittest import mock
+
+# adiciona a pasta "sistema" ao path para o Python encontrar o módulo biblioteca
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema import biblioteca_poo
+from sistema.biblioteca_poo import Biblioteca
+
+
+class TestImportacao(unittest.TestCase):
+    """Testes da importação em massa de livros e usuários."""
+
+    def setUp(self):
+        """Executa antes de cada teste para limpar os dados."""
+        self.biblioteca = Biblioteca('test_importacao.json')
+        self.tearDown()
+
+    def tearDown(self):
+        """Executa após cada teste para limpar."""
+        for arquivo in ("test_importacao.json", "test_importacao.csv", "test_importacao.db",
+                        "test_importacao.db-wal", "test_importacao.db-shm"):
+            if os.path.exists(arquivo):
+                os.remove(arquivo)
+
+    def test_importar_livros_csv_com_relatorio_de_erros(self):
+        """Deve importar as linhas válidas do CSV e relatar as inválidas."""
+        with open("test_importacao.csv", "w", encoding="utf-8") as f:
+            f.write("titulo,autor,isbn,ano\n")
+            f.write("Dom Casmurro,Machado de Assis,1234567890123,1899\n")
+            f.write("Sem ISBN,Autor,,2000\n")
+            f.write("Repetido,Outro Autor,1234567890123,2001\n")
+            f.write("Iracema,José de Alencar,1234567890,1865\n")
+            f.write("Ano Ruim,Autor,9999999999,abc\n")
+
+        relatorio = self.biblioteca.importar_livros("test_importacao.csv")
+
+        self.assertEqual(relatorio['importados'], 2, msg="Falha: quantidade de livros importados incorreta.")
+        self.assertEqual([linha for linha, _ in relatorio['erros']], [3, 4, 6], msg="Falha: linhas com erro relatadas incorretamente.")
+        nova_biblioteca = Biblioteca('test_importacao.json')
+        nova_biblioteca.carregar_dados()
+        self.assertEqual(len(nova_biblioteca._livros_obj), 2, msg="Falha: os livros importados não foram salvos.")
+
+    def test_importar_usuarios_jsonl(self):
+        """Deve importar usuários de JSON Lines e relatar linhas inválidas."""
+        fonte = io.StringIO(
+            '{"nome": "Ana", "email": "ana@example.com", "telefone": "1"}\n'
+            '{"nome": "Bia", "email": "invalido", "telefone": "2"}\n'
+            'isto não é json\n'
+            '{"nome": "Ana 2", "email": "ana@example.com", "telefone": "3"}\n'
+        )
+
+        relatorio = self.biblioteca.importar_usuarios(fonte, formato='jsonl')
+
+        self.assertEqual(relatorio['importados'], 1, msg="Falha: quantidade de usuários importados incorreta.")
+        self.assertEqual([linha for linha, _ in relatorio['erros']], [2, 3, 4], msg="Falha: linhas com erro relatadas incorretamente.")
+
+    def _espionar_gravacoes(self, biblioteca):
+        """Lista com o tamanho de cada conjunto de registros entregue ao armazenamento."""
+        tamanhos = []
+        gravar = biblioteca._armazenamento.gravar
+        def espiao(biblioteca, registros):
+            tamanhos.append(len(registros))
+            gravar(biblioteca, registros)
+        biblioteca._armazenamento.gravar = espiao
+        return tamanhos
+
+    def _fonte_livros(self, quantidade):
+        return io.StringIO(''.join(
+            f'{{"titulo": "Livro {i}", "autor": "Autor", "isbn": "{i:010d}", "ano": 2000}}\n'
+            for i in range(1, quantidade + 1)))
+
+    def test_campos_numericos_no_jsonl(self):
+        """Um título numérico vira texto; um email numérico é um erro da linha, não da importação."""
+        livros = io.StringIO(
+            '{"titulo": 1984, "autor": "George Orwell", "isbn": 1234567890, "ano": 1949}\n'
+            '{"titulo": ["lista"], "autor": "Autor", "isbn": "1234567890123", "ano": 2000}\n'
+        )
+        relatorio = self.biblioteca.importar_livros(livros, formato='jsonl')
+        self.assertEqual(relatorio['importados'], 1, msg="Falha: o título numérico deveria ser importado.")
+        self.assertEqual([linha for linha, _ in relatorio['erros']], [2])
+        self.assertEqual(self.biblioteca._livros_obj[0].titulo, "1984")
+
+        usuarios = io.StringIO(
+            '{"nome": "Ana", "email": 5, "telefone": 1}\n'
+            '{"nome": "Bia", "email": "bia@example.com", "telefone": 2}\n'
+        )
+        relatorio = self.biblioteca.importar_usuarios(usuarios, formato='jsonl')
+        self.assertEqual(relatorio['importados'], 1, msg="Falha: o email numérico abortou a importação.")
+        self.assertEqual([linha for linha, _ in relatorio['erros']], [1])
+
+    def test_importacao_incremental_grava_em_blocos(self):
+        """Com armazenamento incremental, a importação deve gravar em blocos limitados."""
+        biblioteca = Biblioteca('test_importacao.db')
+        tamanhos = self._espionar_gravacoes(biblioteca)
+        with mock.patch.object(biblioteca_poo, 'TAMANHO_BLOCO_IMPORTACAO', 3):
+            relatorio = biblioteca.importar_livros(self._fonte_livros(10), formato='jsonl')
+        self.assertEqual(relatorio['importados'], 10)
+        self.assertEqual(tamanhos, [3, 3, 3, 1], msg="Falha: importação não foi gravada em blocos.")
+        biblioteca._armazenamento.fechar()
+
+        nova_biblioteca = Biblioteca('test_importacao.db')
+        nova_biblioteca.carregar_dados()
+        nova_biblioteca._armazenamento.fechar()
+        self.assertEqual(len(nova_biblioteca._livros_obj), 10, msg="Falha: blocos importados não foram salvos.")
+
+    def test_importacao_com_regravacao_nao_acumula_registros(self):
+        """Com armazenamento que regrava tudo, a importação deve gravar uma vez, sem acumular registros."""
+        tamanhos = self._espionar_gravacoes(self.biblioteca)
+        relatorio = self.biblioteca.importar_livros(self._fonte_livros(50), formato='jsonl')
+        self.assertEqual(relatorio['importados'], 50)
+        self.assertEqual(tamanhos, [1], msg="Falha: registros acumulados para um armazenamento que regrava tudo.")
+
+        nova_biblioteca = Biblioteca('test_importacao.json')
+        nova_biblioteca.carregar_dados()
+        self.assertEqual(len(nova_biblioteca._livros_obj), 50, msg="Falha: os livros importados não foram salvos.")
+
+    def test_formato_desconhecido(self):
+        """Deve rejeitar fontes de formato desconhecido."""
+        with self.assertRaises(ValueError):
+            self.biblioteca.importar_livros("livros.xml")
+
+
+if __name__ == "__main__":
+    unittest.main()
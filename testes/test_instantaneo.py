@@ -0,0 +1,129 @@
+import sys
+import os
+import gc
+import threading
+import unittest
+
+# adiciona a pasta "sistema" ao path para o Python encontrar o módulo biblioteca
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema.armazenamento import ArmazenamentoNulo
+from sistema.biblioteca_poo import Biblioteca
+
+
+class TestInstantaneo(unittest.TestCase):
+    """Testes dos instantâneos somente leitura."""
+
+    def setUp(self):
+        self.biblioteca = Biblioteca(armazenamento=ArmazenamentoNulo())
+        self.biblioteca.adicionar_livro("Livro A", "Autor A", "1234567890123", 2024)
+        self.biblioteca.adicionar_livro("Livro B", "Autor B", "1234567890", 2020)
+        self.biblioteca.cadastrar_usuario("Usuário A", "user@example.com", "123")
+        self.biblioteca.realizar_emprestimo(1, 1)
+
+    def test_nao_ve_escritas_posteriores(self):
+        """Cadastros, empréstimos e devoluções depois do instantâneo não devem aparecer nele."""
+        foto = self.biblioteca.snapshot()
+        self.biblioteca.adicionar_livro("Livro C", "Autor C", "9999999999999", 2000)
+        self.biblioteca.devolver_livro(1)
+        self.biblioteca.realizar_emprestimo(1, 2)
+
+        self.assertEqual(foto.quantidades(), {'livros': 2, 'usuarios': 1, 'emprestimos': 1, 'reservas': 0})
+        self.assertEqual([livro['disponivel'] for livro in foto.livros()], [False, True],
+                         msg="Falha: disponibilidade deveria ser a do momento do instantâneo.")
+        emprestimo = foto.buscar_emprestimo_por_id(1)
+        self.assertEqual((emprestimo['devolvido'], emprestimo['data_devolucao']), (False, None),
+                         msg="Falha: a devolução posterior apareceu no instantâneo.")
+        self.assertEqual(len(foto.emprestimos_ativos()), 1)
+        self.assertIsNone(foto.buscar_livro_por_id(3), msg="Falha: livro posterior apareceu no instantâneo.")
+
+        atual = self.biblioteca.instantaneo()
+        self.assertEqual([livro['disponivel'] for livro in atual.livros()], [True, False, True],
+                         msg="Falha: um novo instantâneo deveria ver o estado atual.")
+
+    def test_lote_desfeito_e_nova_carga(self):
+        """Desfazer um lote ou recarregar não deve alterar um instantâneo já obtido."""
+        with self.assertRaises(RuntimeError):
+            with self.biblioteca.lote():
+                self.biblioteca.adicionar_livro("Livro C", "Autor C", "9999999999999", 2000)
+                self.biblioteca.devolver_livro(1)
+                foto = self.biblioteca.instantaneo()
+                raise RuntimeError("desfazer")
+
+        self.assertEqual(foto.quantidades()['livros'], 3, msg="Falha: o instantâneo perdeu o livro do lote.")
+        self.assertTrue(foto.buscar_livro_por_id(1)['disponivel'], msg="Falha: o desfazer alterou o instantâneo.")
+        self.assertEqual(len(self.biblioteca._livros_obj), 2, msg="Falha: o lote não foi desfeito na biblioteca.")
+        self.assertFalse(self.biblioteca.buscar_livro_por_id(1).disponivel)
+
+        self.biblioteca.carregar_dados()
+        self.assertEqual(len(list(foto.usuarios())), 1, msg="Falha: a nova carga esvaziou o instantâneo.")
+
+    def test_historico_descartado_sem_instantaneos(self):
+        """Sem instantâneos vivos, as escritas não devem guardar histórico."""
+        foto = self.biblioteca.instantaneo()
+        self.biblioteca.devolver_livro(1)
+        self.assertTrue(self.biblioteca._historico, msg="Falha: alteração não versionada.")
+        del foto
+        gc.collect()
+        self.biblioteca.realizar_emprestimo(1, 1)
+        self.assertEqual(self.biblioteca._historico, {}, msg="Falha: histórico não foi descartado.")
+
+    def test_historico_podado_com_instantaneos_sobrepostos(self):
+        """Com instantâneos sempre vivos, mas renovados, o histórico não deve crescer sem limite."""
+        anterior = self.biblioteca.instantaneo()
+        for _ in range(2000):
+            atual = self.biblioteca.instantaneo()
+            del anterior
+            anterior = atual
+            emprestimo = self.biblioteca.emprestimo_atual_do_livro(1)
+            self.biblioteca.devolver_livro(emprestimo.id)
+            self.biblioteca.realizar_emprestimo(1, 1)
+        self.assertLessEqual(self.biblioteca._entradas_historico, self.biblioteca._limite_historico)
+        self.assertLess(self.biblioteca._entradas_historico, 2500, msg="Falha: histórico não foi podado.")
+
+        # O instantâneo vivo continua vendo o estado do seu momento
+        ultimo_emprestimo = self.biblioteca.emprestimo_atual_do_livro(1).id
+        self.biblioteca.devolver_livro(ultimo_emprestimo)
+        emprestimos = {e['id']: e['devolvido'] for e in anterior.emprestimos()}
+        self.assertEqual(emprestimos[ultimo_emprestimo - 1], False, msg="Falha: poda apagou uma versão ainda visível.")
+        self.assertEqual([livro['disponivel'] for livro in anterior.livros()], [False, True])
+
+    def test_exportar_estado(self):
+        """O estado exportado do instantâneo deve ser carregável."""
+        foto = self.biblioteca.instantaneo()
+        self.biblioteca.devolver_livro(1)
+        copia = Biblioteca(armazenamento=ArmazenamentoNulo())
+        copia._carregar_estado(foto.exportar_estado())
+        self.assertFalse(copia.buscar_livro_por_id(1).disponivel, msg="Falha: cópia não reflete o instantâneo.")
+        self.assertTrue(copia.adicionar_livro("Livro C", "Autor C", "9999999999999", 2000))
+        self.assertEqual(copia._livros_obj[-1].id, 3, msg="Falha: contadores não exportados.")
+
+    def test_consistente_durante_escritas_concorrentes(self):
+        """Lido enquanto outra thread empresta e devolve, o instantâneo deve ser coerente."""
+        biblioteca = Biblioteca(armazenamento=ArmazenamentoNulo(), concorrente=True)
+        with biblioteca.lote():
+            for i in range(1, 201):
+                biblioteca.adicionar_livro(f"Livro {i}", "Autor", f"{i:013d}", 2000)
+                biblioteca.cadastrar_usuario(f"Usuário {i}", f"user{i}@example.com", "1")
+
+        def escrever():
+            emprestimo_id = 0
+            for _ in range(5):
+                for i in range(1, 201):
+                    biblioteca.realizar_emprestimo(i, i)
+                    emprestimo_id += 1
+                    biblioteca.devolver_livro(emprestimo_id)
+
+        escritor = threading.Thread(target=escrever)
+        escritor.start()
+        leituras = 0
+        while escritor.is_alive() or not leituras:
+            foto = biblioteca.instantaneo()
+            indisponiveis = sum(not livro['disponivel'] for livro in foto.livros())
+            ativos = len(foto.emprestimos_ativos())
+            self.assertEqual(indisponiveis, ativos, msg="Falha: livros e empréstimos do instantâneo divergem.")
+            leituras += 1
+        escritor.join()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import sys
+import os
+import unittest
+
+# adiciona a pasta "sistema" ao path para o Python encontrar o módulo biblioteca
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema.biblioteca_poo import Biblioteca
+from sistema.metricas import Histograma
+
+
+ARQUIVO_TESTE = "test_metricas.json"
+
+
+class TestMetricas(unittest.TestCase):
+    """Testes do registro de métricas por operação."""
+
+    def setUp(self):
+        """Executa antes de cada teste para limpar o arquivo."""
+        self.tearDown()
+
+    def tearDown(self):
+        """Executa após cada teste para limpar."""
+        if os.path.exists(ARQUIVO_TESTE):
+            os.remove(ARQUIVO_TESTE)
+
+    def test_conta_chamadas_e_erros(self):
+        """Retornos False devem contar como erro; buscas sem resultado não."""
+        biblioteca = Biblioteca(ARQUIVO_TESTE, metricas=True)
+        biblioteca.adicionar_livro("Livro A", "Autor A", "1234567890123", 2024)
+        biblioteca.adicionar_livro("Livro B", "Autor B", "1234567890123", 2024)  # ISBN repetido
+        biblioteca.adicionar_livro("", "Autor C", "1234567890", 2024)           # título vazio
+        biblioteca.buscar_livro_por_id(99)
+
+        metricas = biblioteca.metricas()
+        self.assertEqual(metricas['adicionar_livro']['chamadas'], 3)
+        self.assertEqual(metricas['adicionar_livro']['erros'], 2, msg="Falha: recusas não contadas como erro.")
+        self.assertEqual(metricas['buscar_livro_por_id']['erros'], 0, msg="Falha: busca sem resultado contada como erro.")
+        self.assertEqual(metricas['_persistir']['chamadas'], 1, msg="Falha: gravação não medida.")
+        self.assertEqual(metricas['adicionar_livro']['latencia']['baldes'][-1][1], 3, msg="Falha: latências não registradas.")
+
+    def test_excecao_conta_como_erro(self):
+        """Uma exceção deve contar como erro e continuar propagando."""
+        biblioteca = Biblioteca(ARQUIVO_TESTE, metricas=True)
+        with self.assertRaises(ValueError):
+            biblioteca.importar_livros("livros.xyz")
+        self.assertEqual(biblioteca.metricas()['importar_livros']['erros'], 1)
+
+    def test_exposicao_em_texto(self):
+        """A exposição deve seguir o formato de texto do Prometheus."""
+        biblioteca = Biblioteca(ARQUIVO_TESTE, metricas=True)
+        biblioteca.cadastrar_usuario("Usuário A", "user@example.com", "123")
+        texto = biblioteca.exposicao_metricas()
+        self.assertIn('biblioteca_chamadas_total{operacao="cadastrar_usuario"} 1', texto)
+        self.assertIn('biblioteca_latencia_segundos_bucket{operacao="cadastrar_usuario",le="+Inf"} 1', texto)
+        self.assertIn('biblioteca_latencia_segundos_count{operacao="cadastrar_usuario"} 1', texto)
+
+    def test_desligadas_por_padrao(self):
+        """Sem metricas=True, nada deve ser registrado."""
+        biblioteca = Biblioteca(ARQUIVO_TESTE)
+        biblioteca.adicionar_livro("Livro A", "Autor A", "1234567890123", 2024)
+        self.assertEqual(biblioteca.metricas(), {})
+        self.assertEqual(biblioteca.exposicao_metricas(), '')
+
+    def test_histograma_percentil(self):
+        """O percentil deve cair no limite do balde correspondente."""
+        histograma = Histograma((0.001, 0.01, 0.1))
+        for valor in (0.0005,) * 9 + (0.05,):
+            histograma.observar(valor)
+        self.assertEqual(histograma.percentil(0.5), 0.001)
+        self.assertEqual(histograma.percentil(0.99), 0.1)
+        self.assertEqual(histograma.acumulados()[-1], (float('inf'), 10))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,209 @@
+import sys
+import os
+import io
+import contextlib
+import tempfile
+import unittest
+
+# adiciona a pasta "sistema" ao path para o Python encontrar o módulo biblioteca
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema import biblioteca_poo
+from sistema.armazenamento import ArmazenamentoNulo
+from sistema.biblioteca_poo import Biblioteca
+from sistema.indice_ordenado import IndiceOrdenado
+
+
+class TestIndiceOrdenado(unittest.TestCase):
+    """Testes do índice de chaves ordenadas."""
+
+    def test_insercao_fora_de_ordem_e_paginas(self):
+        """Chaves fora de ordem devem ficar ordenadas e sem repetição."""
+        indice = IndiceOrdenado()
+        for chave in (5, 1, 9, 3, 5, 7):
+            indice.inserir(chave)
+        self.assertEqual(len(indice), 5, msg="Falha: chave repetida não foi ignorada.")
+        self.assertEqual(indice.pagina(None, 10), [1, 3, 5, 7, 9], msg="Falha: ordem crescente incorreta.")
+        self.assertEqual(indice.pagina(3, 2), [5, 7], msg="Falha: página após o cursor incorreta.")
+        self.assertEqual(indice.pagina(4, 2), [5, 7], msg="Falha: cursor ausente do índice deveria funcionar.")
+        self.assertEqual(indice.pagina(None, 2, decrescente=True), [9, 7], msg="Falha: ordem decrescente incorreta.")
+        self.assertEqual(indice.pagina(7, 10, decrescente=True), [5, 3, 1], msg="Falha: cursor decrescente incorreto.")
+
+        self.assertEqual(indice.intervalo(3, 9), [3, 5, 7], msg="Falha: intervalo incorreto.")
+        self.assertEqual(indice.intervalo(0, 100, limite=2), [1, 3], msg="Falha: limite do intervalo ignorado.")
+
+        indice.remover(5)
+        indice.remover(42)
+        self.assertEqual(indice.pagina(None, 10), [1, 3, 7, 9], msg="Falha: remoção incorreta.")
+
+    def test_ordenacao_adiada(self):
+        """Com a ordenação adiada, as chaves só devem ser ordenadas (e sem repetição) em ordenar()."""
+        indice = IndiceOrdenado()
+        indice.inserir(4)
+        indice.adiar_ordenacao()
+        for chave in (8, 2, 6, 2, 4):
+            indice.inserir(chave)
+        indice.ordenar()
+        self.assertEqual(indice.pagina(None, 10), [2, 4, 6, 8], msg="Falha: ordenação em massa incorreta.")
+        indice.inserir(5)
+        self.assertEqual(indice.pagina(None, 10), [2, 4, 5, 6, 8], msg="Falha: inserção após ordenar() incorreta.")
+
+
+class TestPaginacao(unittest.TestCase):
+    """Testes da paginação por cursor da biblioteca."""
+
+    def setUp(self):
+        self.biblioteca = Biblioteca(armazenamento=ArmazenamentoNulo())
+        for i in range(1, 13):
+            self.biblioteca.adicionar_livro(f"Livro {i}", "Autor", f"{i:013d}", 2000)
+            self.biblioteca.cadastrar_usuario(f"Usuário {i}", f"user{i}@example.com", "123")
+        for i in range(1, 6):
+            self.biblioteca.realizar_emprestimo(i, i)
+
+    def test_paginas_por_cursor(self):
+        """Cada página deve começar depois do último ID da anterior."""
+        paginas = []
+        cursor = None
+        while True:
+            pagina = [livro.id for livro in self.biblioteca.iterar_livros(apos_id=cursor, limite=5)]
+            if not pagina:
+                break
+            paginas.append(pagina)
+            cursor = pagina[-1]
+        self.assertEqual(paginas, [[1, 2, 3, 4, 5], [6, 7, 8, 9, 10], [11, 12]], msg="Falha: páginas incorretas.")
+
+    def test_ordem_decrescente_e_demais_colecoes(self):
+        """Usuários e empréstimos devem paginar da mesma forma, nas duas ordens."""
+        self.assertEqual([u.id for u in self.biblioteca.iterar_usuarios(apos_id=10, ordem='decrescente', limite=3)],
+                         [9, 8, 7], msg="Falha: usuários em ordem decrescente incorretos.")
+        self.assertEqual([e.id for e in self.biblioteca.iterar_emprestimos(apos_id=2)], [3, 4, 5],
+                         msg="Falha: empréstimos após o cursor incorretos.")
+        self.assertEqual(list(self.biblioteca.iterar_livros(limite=0)), [], msg="Falha: limite zero deveria ser vazio.")
+        with self.assertRaises(ValueError):
+            self.biblioteca.iterar_livros(ordem='aleatoria')
+
+    def test_percorre_varias_paginas_internas(self):
+        """Sem limite, deve percorrer tudo mesmo além de uma página interna."""
+        tamanho_original = biblioteca_poo.TAMANHO_PAGINA
+        biblioteca_poo.TAMANHO_PAGINA = 4
+        try:
+            ids = [livro.id for livro in self.biblioteca.iterar_livros()]
+            ids_limitados = [livro.id for livro in self.biblioteca.iterar_livros(apos_id=1, limite=9)]
+        finally:
+            biblioteca_poo.TAMANHO_PAGINA = tamanho_original
+        self.assertEqual(ids, list(range(1, 13)), msg="Falha: iteração completa incorreta.")
+        self.assertEqual(ids_limitados, list(range(2, 11)), msg="Falha: limite maior que a página interna incorreto.")
+
+    def test_lote_desfeito_some_da_paginacao(self):
+        """Livros de um lote desfeito não devem aparecer nas páginas."""
+        with self.assertRaises(RuntimeError):
+            with self.biblioteca.lote():
+                self.biblioteca.adicionar_livro("Temporário", "Autor", "9999999999999", 2000)
+                raise RuntimeError("desfazer")
+        self.assertEqual([livro.id for livro in self.biblioteca.iterar_livros(apos_id=10)], [11, 12],
+                         msg="Falha: livro desfeito continua no índice ordenado.")
+
+    def test_listagem_usa_a_iteracao(self):
+        """listar_livros deve imprimir todos os livros em ordem."""
+        saida = io.StringIO()
+        with contextlib.redirect_stdout(saida):
+            self.biblioteca.listar_livros()
+            Biblioteca(armazenamento=ArmazenamentoNulo()).listar_emprestimos()
+        texto = saida.getvalue()
+        self.assertIn("=== LIVROS CADASTRADOS ===", texto)
+        self.assertLess(texto.index("Livro 2 "), texto.index("Livro 12"), msg="Falha: listagem fora de ordem.")
+        self.assertIn("Nenhum empréstimo registrado.", texto)
+
+
+
+class TestIndicesSecundarios(unittest.TestCase):
+    """Testes das consultas por intervalo de ano e prefixo de autor."""
+
+    def setUp(self):
+        self.biblioteca = Biblioteca(armazenamento=ArmazenamentoNulo())
+        livros = [
+            ("Dom Casmurro", "Machado de Assis", 1899),
+            ("Memórias Póstumas", "Machado de Assis", 1881),
+            ("Macunaíma", "Mário de Andrade", 1928),
+            ("Vidas Secas", "Graciliano Ramos", 1938),
+            ("Grande Sertão: Veredas", "Guimarães Rosa", 1956),
+            ("A Hora da Estrela", "Clarice Lispector", 1977),
+        ]
+        for i, (titulo, autor, ano) in enumerate(livros, start=1):
+            self.biblioteca.adicionar_livro(titulo, autor, f"{i:013d}", ano)
+
+    def test_livros_por_ano(self):
+        """Deve retornar os livros do intervalo (inclusive), ordenados por ano."""
+        anos = [livro.ano for livro in self.biblioteca.livros_por_ano(1890, 1950)]
+        self.assertEqual(anos, [1899, 1928, 1938], msg="Falha: intervalo de anos incorreto.")
+        self.assertEqual([livro.ano for livro in self.biblioteca.livros_por_ano(1881, 1881)], [1881],
+                         msg="Falha: limites do intervalo deveriam ser inclusivos.")
+        self.assertEqual(len(self.biblioteca.livros_por_ano(1800, 2100, limite=2)), 2,
+                         msg="Falha: limite ignorado.")
+        self.assertEqual(self.biblioteca.livros_por_ano(2000, 1900), [], msg="Falha: intervalo invertido deveria ser vazio.")
+
+    def test_livros_por_autor(self):
+        """Prefixo do autor deve ignorar acentos e caixa."""
+        autores = [livro.autor for livro in self.biblioteca.livros_por_autor("mach")]
+        self.assertEqual(autores, ["Machado de Assis", "Machado de Assis"], msg="Falha: prefixo de autor incorreto.")
+        self.assertEqual([livro.autor for livro in self.biblioteca.livros_por_autor("MARIO")], ["Mário de Andrade"],
+                         msg="Falha: prefixo deveria ignorar acentos e caixa.")
+        self.assertEqual([livro.autor for livro in self.biblioteca.livros_por_autor("g")],
+                         ["Graciliano Ramos", "Guimarães Rosa"], msg="Falha: ordem por autor incorreta.")
+        self.assertEqual(len(self.biblioteca.livros_por_autor("")), 6, msg="Falha: prefixo vazio deveria retornar todos.")
+
+    def test_ano_convertido_ou_recusado(self):
+        """Ano em texto deve virar inteiro; ano inválido deve ser recusado sem alterar nada."""
+        self.assertTrue(self.biblioteca.adicionar_livro("Texto", "Autor X", "1111111111", "1999"))
+        self.assertEqual(self.biblioteca._livros_obj[-1].ano, 1999, msg="Falha: ano em texto não convertido.")
+        for ano in (None, "abc", True):
+            self.assertFalse(self.biblioteca.adicionar_livro("Inválido", "Autor X", "2222222222", ano),
+                             msg=f"Falha: ano {ano!r} deveria ser recusado.")
+        self.assertNotIn("2222222222", self.biblioteca._livros_por_isbn, msg="Falha: livro recusado foi registrado.")
+        self.assertTrue(self.biblioteca.adicionar_livro("Depois", "Autor X", "3333333333", 2000))
+        self.assertEqual(self.biblioteca._livros_obj[-1].id, 8, msg="Falha: ano recusado consumiu um ID.")
+        self.assertEqual([livro.ano for livro in self.biblioteca.livros_por_ano(1999, 2000)], [1999, 2000],
+                         msg="Falha: índice por ano quebrado após anos em texto.")
+
+        relatorio = self.biblioteca.importar_livros(['{"titulo": "Imp", "autor": "Autor", "isbn": "4444444444", "ano": "x"}'],
+                                                    formato='jsonl')
+        self.assertEqual(relatorio['importados'], 0, msg="Falha: importação aceitou ano inválido.")
+        self.assertEqual(len(self.biblioteca._livros_obj), 8)
+
+        carregada = Biblioteca(armazenamento=ArmazenamentoNulo())
+        carregada._carregar_estado({'livros': [
+            {'id': 1, 'titulo': 'A', 'autor': 'B', 'isbn': '1234567890', 'ano': '1950'},
+            {'id': 2, 'titulo': 'C', 'autor': 'D', 'isbn': '1234567891', 'ano': 1960},
+        ]})
+        self.assertEqual([livro.id for livro in carregada.livros_por_ano(1900, 2000)], [1, 2],
+                         msg="Falha: ano em texto de um arquivo antigo quebrou o índice.")
+
+    def test_carga_monta_indices_ordenados(self):
+        """Após salvar e recarregar, os índices devem sair ordenados mesmo com chaves fora de ordem."""
+        with tempfile.TemporaryDirectory() as diretorio:
+            arquivo = os.path.join(diretorio, 'dados.json')
+            origem = Biblioteca(arquivo_dados=arquivo)
+            for i, (ano, autor) in enumerate([(1990, "Zé"), (1950, "Ana"), (1970, "Bia")], start=1):
+                origem.adicionar_livro(f"Livro {i}", autor, f"{i:010d}", ano)
+            carregada = Biblioteca(arquivo_dados=arquivo)
+            carregada.carregar_dados()
+            self.assertEqual([livro.ano for livro in carregada.livros_por_ano(1900, 2000)], [1950, 1970, 1990],
+                             msg="Falha: índice por ano desordenado após a carga.")
+            self.assertEqual([livro.autor for livro in carregada.livros_por_autor("")], ["Ana", "Bia", "Zé"],
+                             msg="Falha: índice por autor desordenado após a carga.")
+            carregada.adicionar_livro("Novo", "Caio", "0000000099", 1960)
+            self.assertEqual([livro.ano for livro in carregada.livros_por_ano(1900, 2000)], [1950, 1960, 1970, 1990],
+                             msg="Falha: inserção após a carga fora de ordem.")
+
+    def test_indices_acompanham_lote_desfeito(self):
+        """Livros de um lote desfeito não devem aparecer nas consultas."""
+        with self.assertRaises(RuntimeError):
+            with self.biblioteca.lote():
+                self.biblioteca.adicionar_livro("Temporário", "Machado Falso", "9999999999999", 1900)
+                raise RuntimeError("desfazer")
+        self.assertEqual(len(self.biblioteca.livros_por_autor("machado")), 2, msg="Falha: índice de autor não foi desfeito.")
+        self.assertEqual(len(self.biblioteca.livros_por_ano(1900, 1900)), 0, msg="Falha: índice de ano não foi desfeito.")
+
+
+if __name__ == '__main__':
+    unittest.main()
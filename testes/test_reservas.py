@@ -0,0 +1,119 @@
+import sys
+import os
+import unittest
+
+# adiciona a pasta "sistema" ao path para o Python encontrar o módulo biblioteca
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema.biblioteca_poo import Biblioteca, Reserva
+
+
+ARQUIVOS_TESTE = ("test_reservas.json", "test_reservas.jsonl", "test_reservas.jsonl.diario",
+                  "test_reservas.bin", "test_reservas.db", "test_reservas.db-wal", "test_reservas.db-shm")
+
+
+class TestReservas(unittest.TestCase):
+    """Testes das filas de reserva."""
+
+    def setUp(self):
+        """Executa antes de cada teste para limpar os arquivos."""
+        self.tearDown()
+
+    def tearDown(self):
+        """Executa após cada teste para limpar."""
+        for arquivo in ARQUIVOS_TESTE:
+            if os.path.exists(arquivo):
+                os.remove(arquivo)
+
+    def _popular(self, biblioteca):
+        """Livro 1 emprestado ao usuário 1; usuários 2, 3 e 4 na fila."""
+        biblioteca.adicionar_livro("Livro A", "Autor A", "1234567890123", 2024)
+        biblioteca.adicionar_livro("Livro B", "Autor B", "1234567890", 2020)
+        for i in range(1, 5):
+            biblioteca.cadastrar_usuario(f"Usuário {i}", f"user{i}@example.com", "123")
+        biblioteca.realizar_emprestimo(1, 1)
+        for usuario_id in (2, 3, 4):
+            self.assertTrue(biblioteca.reservar_livro(usuario_id, 1))
+
+    def test_reserva_recusada(self):
+        """Livro disponível, quem já está com o livro e reserva repetida devem ser recusados."""
+        biblioteca = Biblioteca("test_reservas.json")
+        self._popular(biblioteca)
+        self.assertFalse(biblioteca.reservar_livro(2, 2), msg="Falha: reservou livro disponível.")
+        self.assertFalse(biblioteca.reservar_livro(1, 1), msg="Falha: reservou o livro que já está com o usuário.")
+        self.assertFalse(biblioteca.reservar_livro(2, 1), msg="Falha: reserva repetida aceita.")
+        self.assertFalse(biblioteca.reservar_livro(99, 1), msg="Falha: usuário inexistente aceito.")
+
+    def test_devolucao_entrega_ao_proximo_da_fila(self):
+        """A devolução deve emprestar o livro ao primeiro da fila, em ordem FIFO."""
+        biblioteca = Biblioteca("test_reservas.json")
+        self._popular(biblioteca)
+
+        self.assertTrue(biblioteca.devolver_livro(1))
+        atual = biblioteca.emprestimo_atual_do_livro(1)
+        self.assertEqual(atual.usuario_id, 2, msg="Falha: o livro não foi para o primeiro da fila.")
+        self.assertFalse(biblioteca.buscar_livro_por_id(1).disponivel)
+        self.assertEqual(biblioteca._reservas_por_id[1].situacao, Reserva.ATENDIDA)
+        self.assertEqual([r.usuario_id for r in biblioteca.fila_do_livro(1)], [3, 4])
+        self.assertEqual(biblioteca.reservas_do_usuario(2), [])
+
+    def test_cancelamento_pula_reserva(self):
+        """Uma reserva cancelada deve ser pulada na fila."""
+        biblioteca = Biblioteca("test_reservas.json")
+        self._popular(biblioteca)
+
+        self.assertTrue(biblioteca.cancelar_reserva(1))
+        self.assertFalse(biblioteca.cancelar_reserva(1), msg="Falha: cancelou duas vezes.")
+        biblioteca.devolver_livro(1)
+        self.assertEqual(biblioteca.emprestimo_atual_do_livro(1).usuario_id, 3)
+
+        biblioteca.cancelar_reserva(3)
+        biblioteca.devolver_livro(2)
+        self.assertTrue(biblioteca.buscar_livro_por_id(1).disponivel, msg="Falha: fila vazia deveria liberar o livro.")
+
+    def test_minhas_reservas(self):
+        """reservas_do_usuario deve listar as reservas em espera do usuário."""
+        biblioteca = Biblioteca("test_reservas.json")
+        self._popular(biblioteca)
+        biblioteca.realizar_emprestimo(1, 2)
+        biblioteca.reservar_livro(3, 2)
+        self.assertEqual([r.livro_id for r in biblioteca.reservas_do_usuario(3)], [1, 2])
+
+    def test_lote_desfeito_restaura_fila(self):
+        """Um lote desfeito deve devolver a fila ao estado anterior."""
+        biblioteca = Biblioteca("test_reservas.json")
+        self._popular(biblioteca)
+        with self.assertRaises(RuntimeError):
+            with biblioteca.lote():
+                biblioteca.devolver_livro(1)
+                biblioteca.reservar_livro(1, 1)
+                raise RuntimeError("falha no meio do lote")
+
+        self.assertEqual(biblioteca.emprestimo_atual_do_livro(1).usuario_id, 1)
+        self.assertEqual([r.usuario_id for r in biblioteca.fila_do_livro(1)], [2, 3, 4])
+        self.assertEqual([r.livro_id for r in biblioteca.reservas_do_usuario(2)], [1])
+
+    def test_filas_persistidas_em_todos_os_formatos(self):
+        """As filas devem sobreviver a salvar e carregar em todos os formatos."""
+        for arquivo, diario in (("test_reservas.json", False), ("test_reservas.jsonl", True),
+                                ("test_reservas.bin", False), ("test_reservas.db", False)):
+            with self.subTest(arquivo=arquivo):
+                biblioteca = Biblioteca(arquivo, usar_diario=diario)
+                self._popular(biblioteca)
+                biblioteca.cancelar_reserva(2)
+                biblioteca.devolver_livro(1)
+                biblioteca._armazenamento.fechar()
+
+                nova = Biblioteca(arquivo, usar_diario=diario)
+                nova.carregar_dados()
+                self.assertEqual(nova.emprestimo_atual_do_livro(1).usuario_id, 2)
+                self.assertEqual([r.usuario_id for r in nova.fila_do_livro(1)], [4])
+                self.assertEqual(nova._reservas_por_id[2].situacao, Reserva.CANCELADA)
+                self.assertTrue(nova.reservar_livro(3, 1), msg="Falha: contador de reservas não restaurado.")
+                self.assertEqual(nova.reservas_do_usuario(3)[0].id, 4)
+                nova._armazenamento.fechar()
+                self.tearDown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,197 @@
+import sys
+import os
+import asyncio
+import json
+import unittest
+
+# adiciona a pasta "sistema" ao path para o Python encontrar o módulo biblioteca
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema.biblioteca_poo import Biblioteca
+from sistema.servidor import ServidorBiblioteca
+
+
+async def requisitar(porta, metodo, caminho, dados=None):
+    """Faz uma requisição HTTP ao servidor local e retorna (status, json)."""
+    leitor, escritor = await asyncio.open_connection('127.0.0.1', porta)
+    corpo = json.dumps(dados).encode('utf-8') if dados is not None else b''
+    escritor.write(
+        f"{metodo} {caminho} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+        f"Content-Length: {len(corpo)}\r\n\r\n".encode('latin-1') + corpo
+    )
+    resposta = await leitor.read()
+    escritor.close()
+    cabecalho, conteudo = resposta.split(b'\r\n\r\n', 1)
+    return int(cabecalho.split(b' ')[1]), json.loads(conteudo)
+
+
+async def enviar_bruto(porta, dados):
+    """Envia bytes crus ao servidor e retorna tudo o que ele responder até fechar a conexão."""
+    leitor, escritor = await asyncio.open_connection('127.0.0.1', porta)
+    escritor.write(dados)
+    resposta = await asyncio.wait_for(leitor.read(), timeout=5)
+    escritor.close()
+    return resposta
+
+
+class TestServidor(unittest.TestCase):
+    """Testes do serviço HTTP/JSON da biblioteca."""
+
+    def setUp(self):
+        """Executa antes de cada teste para limpar os dados."""
+        self.tearDown()
+
+    def tearDown(self):
+        """Executa após cada teste para limpar."""
+        if os.path.exists("test_servidor.json"):
+            os.remove("test_servidor.json")
+
+    def test_fluxo_completo_por_http(self):
+        """Deve cadastrar, emprestar e devolver pela API HTTP."""
+        async def cenario():
+            servidor = ServidorBiblioteca(Biblioteca('test_servidor.json', concorrente=True), porta=0)
+            await servidor.iniciar()
+            porta = servidor.porta
+            try:
+                status, livro = await requisitar(porta, 'POST', '/livros', {
+                    'titulo': 'Dom Casmurro', 'autor': 'Machado de Assis', 'isbn': '1234567890123', 'ano': 1899})
+                self.assertEqual((status, livro['id']), (201, 1), msg="Falha: livro não criado.")
+
+                status, _ = await requisitar(porta, 'POST', '/livros', {
+                    'titulo': 'Outro', 'autor': 'Autor', 'isbn': '1234567890123', 'ano': 2000})
+                self.assertEqual(status, 409, msg="Falha: ISBN duplicado deveria ser recusado.")
+
+                status, usuario = await requisitar(porta, 'POST', '/usuarios', {
+                    'nome': 'Ana', 'email': 'ana@example.com', 'telefone': '1'})
+                self.assertEqual(status, 201, msg="Falha: usuário não criado.")
+
+                status, emprestimo = await requisitar(porta, 'POST', '/emprestimos', {'usuario_id': usuario['id'], 'livro_id': 1})
+                self.assertEqual(status, 201, msg="Falha: empréstimo não realizado.")
+
+                status, livro = await requisitar(porta, 'GET', '/livros/1')
+                self.assertFalse(livro['disponivel'], msg="Falha: o livro deveria estar emprestado.")
+
+                status, emprestimo = await requisitar(porta, 'POST', f"/emprestimos/{emprestimo['id']}/devolucao")
+                self.assertEqual((status, emprestimo['devolvido']), (200, True), msg="Falha: devolução não realizada.")
+
+                status, resultado = await requisitar(porta, 'GET', '/livros/busca?q=casmurro')
+                self.assertEqual([l['id'] for l in resultado], [1], msg="Falha: busca pela API incorreta.")
+
+                self.assertEqual((await requisitar(porta, 'GET', '/livros/99'))[0], 404, msg="Falha: livro inexistente deveria dar 404.")
+                self.assertEqual((await requisitar(porta, 'DELETE', '/livros'))[0], 405, msg="Falha: método não permitido deveria dar 405.")
+            finally:
+                await servidor.encerrar()
+
+        asyncio.run(cenario())
+
+    def test_reservas_por_http(self):
+        """Deve reservar, listar e cancelar reservas pela API HTTP."""
+        async def cenario():
+            biblioteca = Biblioteca('test_servidor.json', concorrente=True)
+            biblioteca.adicionar_livro('Dom Casmurro', 'Machado de Assis', '1234567890123', 1899)
+            biblioteca.cadastrar_usuario('Ana', 'ana@example.com', '1')
+            biblioteca.cadastrar_usuario('Bia', 'bia@example.com', '2')
+            biblioteca.realizar_emprestimo(1, 1)
+            servidor = ServidorBiblioteca(biblioteca, porta=0)
+            await servidor.iniciar()
+            porta = servidor.porta
+            try:
+                status, reserva = await requisitar(porta, 'POST', '/reservas', {'usuario_id': 2, 'livro_id': 1})
+                self.assertEqual((status, reserva['situacao']), (201, 'aguardando'), msg="Falha: reserva não criada.")
+                self.assertEqual((await requisitar(porta, 'POST', '/reservas', {'usuario_id': 2, 'livro_id': 1}))[0], 409,
+                                 msg="Falha: reserva repetida deveria ser recusada.")
+
+                status, reservas = await requisitar(porta, 'GET', '/usuarios/2/reservas')
+                self.assertEqual([r['id'] for r in reservas], [reserva['id']], msg="Falha: reservas do usuário incorretas.")
+
+                status, cancelada = await requisitar(porta, 'POST', f"/reservas/{reserva['id']}/cancelamento")
+                self.assertEqual((status, cancelada['situacao']), (200, 'cancelada'), msg="Falha: cancelamento não realizado.")
+            finally:
+                await servidor.encerrar()
+
+        asyncio.run(cenario())
+
+    def test_listagem_paginada_por_http(self):
+        """Deve paginar as listagens com ?apos= e ?limite=."""
+        async def cenario():
+            biblioteca = Biblioteca('test_servidor.json', concorrente=True)
+            for i in range(1, 6):
+                biblioteca.cadastrar_usuario(f'Usuário {i}', f'user{i}@example.com', '1')
+            servidor = ServidorBiblioteca(biblioteca, porta=0)
+            await servidor.iniciar()
+            porta = servidor.porta
+            try:
+                status, pagina = await requisitar(porta, 'GET', '/usuarios?apos=2&limite=2')
+                self.assertEqual((status, [u['id'] for u in pagina]), (200, [3, 4]), msg="Falha: página incorreta.")
+                status, pagina = await requisitar(porta, 'GET', '/usuarios?ordem=decrescente&limite=1')
+                self.assertEqual([u['id'] for u in pagina], [5], msg="Falha: página decrescente incorreta.")
+                self.assertEqual((await requisitar(porta, 'GET', '/usuarios?limite=abc'))[0], 400,
+                                 msg="Falha: paginação inválida deveria dar 400.")
+            finally:
+                await servidor.encerrar()
+
+        asyncio.run(cenario())
+
+    def test_entradas_invalidas_dao_400(self):
+        """Ano, textos e limite inválidos devem dar 400 sem alterar a biblioteca."""
+        async def cenario():
+            biblioteca = Biblioteca('test_servidor.json', concorrente=True)
+            servidor = ServidorBiblioteca(biblioteca, porta=0)
+            await servidor.iniciar()
+            porta = servidor.porta
+            try:
+                for ano in (None, 'abc', True):
+                    status, _ = await requisitar(porta, 'POST', '/livros', {
+                        'titulo': 'Sem Ano', 'autor': 'Autor', 'isbn': '1234567890', 'ano': ano})
+                    self.assertEqual(status, 400, msg=f"Falha: ano {ano!r} deveria dar 400.")
+                status, _ = await requisitar(porta, 'POST', '/livros', {
+                    'titulo': 'Livro', 'autor': 'Autor', 'isbn': 1234567890, 'ano': 2000})
+                self.assertEqual(status, 400, msg="Falha: ISBN numérico deveria dar 400.")
+                self.assertEqual(len(biblioteca._livros_obj), 0, msg="Falha: entrada inválida alterou a biblioteca.")
+
+                status, livro = await requisitar(porta, 'POST', '/livros', {
+                    'titulo': 'Livro', 'autor': 'Autor', 'isbn': '1234567890', 'ano': '1999'})
+                self.assertEqual((status, livro['ano']), (201, 1999), msg="Falha: ano em texto deveria ser aceito.")
+                status, _ = await requisitar(porta, 'POST', '/livros', {
+                    'titulo': 'Outro', 'autor': 'Autor', 'isbn': '1234567891', 'ano': 2000})
+                self.assertEqual(status, 201, msg="Falha: índice por ano quebrado após o ano em texto.")
+
+                for limite in ('abc', '-1'):
+                    self.assertEqual((await requisitar(porta, 'GET', f'/livros/busca?q=livro&limite={limite}'))[0], 400,
+                                     msg=f"Falha: limite {limite!r} deveria dar 400.")
+            finally:
+                await servidor.encerrar()
+
+        asyncio.run(cenario())
+
+    def test_content_length_invalido_fecha_a_conexao(self):
+        """Um corpo recusado sem ser lido deve fechar a conexão, e não virar a próxima requisição."""
+        async def cenario():
+            servidor = ServidorBiblioteca(Biblioteca('test_servidor.json', concorrente=True), porta=0)
+            await servidor.iniciar()
+            try:
+                embutida = b"GET /livros/busca?q=x HTTP/1.1\r\nHost: localhost\r\n\r\n"
+                resposta = await enviar_bruto(servidor.porta, (
+                    f"POST /livros HTTP/1.1\r\nHost: localhost\r\n"
+                    f"Content-Length: {10 ** 9}\r\n\r\n").encode('latin-1') + embutida)
+                self.assertTrue(resposta.startswith(b"HTTP/1.1 413"), msg="Falha: corpo grande deveria dar 413.")
+                self.assertEqual(resposta.count(b"HTTP/1.1 "), 1, msg="Falha: o corpo não lido foi atendido como requisição.")
+                self.assertIn(b"Connection: close", resposta)
+
+                resposta = await enviar_bruto(servidor.porta, (
+                    b"POST /livros HTTP/1.1\r\nHost: localhost\r\nContent-Length: -5\r\n\r\n" + embutida))
+                self.assertTrue(resposta.startswith(b"HTTP/1.1 400"), msg="Falha: Content-Length negativo deveria dar 400.")
+                self.assertEqual(resposta.count(b"HTTP/1.1 "), 1)
+            finally:
+                await servidor.encerrar()
+
+        asyncio.run(cenario())
+
+    def test_exige_modo_concorrente(self):
+        """O servidor deve exigir uma biblioteca no modo concorrente."""
+        with self.assertRaises(ValueError):
+            ServidorBiblioteca(Biblioteca('test_servidor.json'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import sys
+import os
+import unittest
+from datetime import datetime, timedelta
+
+# adiciona a pasta "sistema" ao path para o Python encontrar o módulo biblioteca
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema.biblioteca_poo import Biblioteca, PRAZO_EMPRESTIMO
+from sistema.vencimentos import IndiceVencimentos
+
+
+ARQUIVO_TESTE = "test_vencimentos.json"
+
+
+class TestVencimentos(unittest.TestCase):
+    """Testes do índice de vencimentos e dos avisos de atraso."""
+
+    def setUp(self):
+        """Executa antes de cada teste para criar uma biblioteca com três empréstimos."""
+        self.tearDown()
+        self.biblioteca = Biblioteca(ARQUIVO_TESTE)
+        for i in range(1, 4):
+            self.biblioteca.adicionar_livro(f"Livro {i}", "Autor", f"123456789{i}", 2000)
+        self.biblioteca.cadastrar_usuario("Usuário A", "user@example.com", "123")
+        for livro_id in (1, 2, 3):
+            self.biblioteca.realizar_emprestimo(1, livro_id)
+        # Empréstimos feitos há 20, 10 e 16 dias
+        agora = datetime.now()
+        for emprestimo_id, dias in ((1, 20), (2, 10), (3, 16)):
+            emprestimo = self.biblioteca._emprestimos_por_id[emprestimo_id]
+            emprestimo.data_emprestimo = (agora - timedelta(days=dias)).isoformat()
+        self.biblioteca._reconstruir_indices()
+        self.agora = agora
+
+    def tearDown(self):
+        """Executa após cada teste para limpar."""
+        if os.path.exists(ARQUIVO_TESTE):
+            os.remove(ARQUIVO_TESTE)
+
+    def test_emprestimos_atrasados_em_ordem_de_vencimento(self):
+        """Só os empréstimos vencidos devem voltar, do mais antigo ao mais recente."""
+        atrasados = self.biblioteca.emprestimos_atrasados()
+        self.assertEqual([e.id for e in atrasados], [1, 3], msg="Falha: atrasados incorretos.")
+        self.assertTrue(atrasados[0].esta_atrasado())
+        self.assertFalse(self.biblioteca._emprestimos_por_id[2].esta_atrasado())
+
+        daqui_a_cinco_dias = self.agora + timedelta(days=5)
+        self.assertEqual([e.id for e in self.biblioteca.emprestimos_atrasados(ate=daqui_a_cinco_dias)], [1, 3, 2])
+        self.assertEqual(self.biblioteca.emprestimos_atrasados(ate=(self.agora - timedelta(days=30)).isoformat()), [])
+
+    def test_devolucao_sai_do_indice(self):
+        """Um empréstimo devolvido não deve mais aparecer como atrasado."""
+        self.biblioteca.devolver_livro(1)
+        self.assertEqual([e.id for e in self.biblioteca.emprestimos_atrasados()], [3])
+
+    def test_vencimento_e_prazo(self):
+        """O vencimento deve ser a data do empréstimo mais o prazo."""
+        emprestimo = self.biblioteca._emprestimos_por_id[2]
+        esperado = datetime.fromisoformat(emprestimo.data_emprestimo) + PRAZO_EMPRESTIMO
+        self.assertEqual(emprestimo.data_vencimento, esperado.isoformat())
+
+    def test_avisa_cada_atraso_uma_vez(self):
+        """verificar_atrasos deve chamar os callbacks uma única vez por empréstimo."""
+        avisados = []
+        self.biblioteca.ao_atrasar(lambda emprestimo: avisados.append(emprestimo.id))
+
+        self.biblioteca.verificar_atrasos()
+        self.assertEqual(avisados, [1, 3])
+        self.biblioteca.verificar_atrasos()
+        self.assertEqual(avisados, [1, 3], msg="Falha: atraso avisado duas vezes.")
+
+        self.biblioteca.devolver_livro(2)
+        self.biblioteca.verificar_atrasos(self.agora + timedelta(days=5))
+        self.assertEqual(avisados, [1, 3], msg="Falha: empréstimo devolvido foi avisado.")
+
+    def test_indice_descarta_entradas_removidas(self):
+        """Empréstimos removidos devem sair do heap na hora, sem deixar entradas mortas."""
+        indice = IndiceVencimentos()
+        for emprestimo_id in range(1000):
+            indice.adicionar(emprestimo_id, emprestimo_id)
+        for emprestimo_id in range(0, 1000, 2):
+            indice.remover(emprestimo_id)
+        self.assertEqual(len(indice), 500)
+        self.assertEqual(len(indice._heap), 500, msg="Falha: entrada removida ficou no heap.")
+        for emprestimo_id in range(1, 900, 2):
+            indice.remover(emprestimo_id)
+        self.assertEqual(len(indice._heap), 50, msg="Falha: entrada removida ficou no heap.")
+        self.assertEqual(indice.atrasados(10 ** 6), list(range(901, 1000, 2)))
+
+    def test_remocoes_fora_de_ordem_mantem_o_heap(self):
+        """Remoções em posições quaisquer devem manter a ordem dos vencimentos."""
+        indice = IndiceVencimentos()
+        vencimentos = {emprestimo_id: (emprestimo_id * 7919) % 1000 for emprestimo_id in range(500)}
+        for emprestimo_id, vencimento in vencimentos.items():
+            indice.adicionar(emprestimo_id, vencimento)
+        for emprestimo_id in range(0, 500, 3):
+            indice.remover(emprestimo_id)
+            del vencimentos[emprestimo_id]
+        esperado = [emprestimo_id for vencimento, emprestimo_id in sorted((v, i) for i, v in vencimentos.items())
+                    if vencimento < 300]
+        self.assertEqual(indice.atrasados(300), esperado, msg="Falha: heap desordenado após remoções.")
+        self.assertEqual(indice.vencidos(300), esperado, msg="Falha: avisos desordenados após remoções.")
+
+    def test_reconstrucao_nao_repete_avisos(self):
+        """Desfazer um lote ou recarregar os dados não deve avisar de novo um atraso já avisado."""
+        avisados = []
+        self.biblioteca.ao_atrasar(lambda emprestimo: avisados.append(emprestimo.id))
+        self.biblioteca.verificar_atrasos()
+        self.assertEqual(avisados, [1, 3])
+
+        with self.assertRaises(RuntimeError):
+            with self.biblioteca.lote():
+                self.biblioteca.adicionar_livro("Outro", "Autor", "9876543210", 2000)
+                raise RuntimeError("desfazer")
+        self.biblioteca.verificar_atrasos()
+        self.assertEqual(avisados, [1, 3], msg="Falha: lote desfeito repetiu avisos.")
+
+        self.biblioteca._reconstruir_indices()
+        self.biblioteca.verificar_atrasos(self.agora + timedelta(days=5))
+        self.assertEqual(avisados, [1, 3, 2], msg="Falha: reconstrução repetiu avisos ou perdeu o novo.")
+
+    def test_registro_de_avisos_nao_cresce(self):
+        """Os avisos de empréstimos devolvidos devem ser esquecidos, mas não dentro de um lote desfeito."""
+        avisados = []
+        self.biblioteca.ao_atrasar(lambda emprestimo: avisados.append(emprestimo.id))
+        self.biblioteca.verificar_atrasos()
+        indice = self.biblioteca._indice_vencimentos
+        self.assertEqual(sorted(indice._avisados), [1, 3])
+
+        with self.assertRaises(RuntimeError):
+            with self.biblioteca.lote():
+                self.biblioteca.devolver_livro(1)
+                raise RuntimeError("desfazer")
+        self.biblioteca.verificar_atrasos()
+        self.assertEqual(avisados, [1, 3], msg="Falha: devolução desfeita repetiu o aviso.")
+
+        self.biblioteca.devolver_livro(1)
+        self.biblioteca.devolver_livro(3)
+        self.biblioteca.verificar_atrasos()
+        self.assertEqual((indice._avisados, indice._avisados_soltos), ({}, {}),
+                         msg="Falha: avisos de empréstimos devolvidos continuam registrados.")
+
+
+if __name__ == "__main__":
+    unittest.main()